@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_default_cache():
+    """
+    Throttle histories and cached auth snapshots live in the default cache
+    and are keyed by user id, which SQLite hands out again after every
+    test's rollback. Start each test without the previous tests' entries.
+    """
+    caches["default"].clear()
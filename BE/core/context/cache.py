@@ -0,0 +1,93 @@
+"""
+context/cache.py
+
+Tenant id → (slug, status) lookups for the per-request tenant checks in
+core.middleware.TenantMiddleware and the SSE endpoint (core_api/sse.py).
+
+Entries live for TENANT_CACHE_SECONDS in a process-local dict or, with
+TENANT_CACHE set to a cache alias, in that shared Django cache instead.
+Saving or deleting a Tenant drops its entry once the transaction commits
+(SIGNAL 7 in core_api/signals.py). The process-local cache only sees
+invalidations made in its own process: other workers notice a suspension
+when their entry expires. Use a shared backend if that window is too long.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from context.models import Tenant
+
+TenantState = namedtuple("TenantState", ["id", "slug", "status"])
+
+_local = {}
+_lock = threading.Lock()
+
+
+def _seconds():
+    return int(getattr(settings, "TENANT_CACHE_SECONDS", 0))
+
+
+def _shared_cache():
+    alias = getattr(settings, "TENANT_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _cache_key(tenant_id):
+    return f"tenants:state:{tenant_id}"
+
+
+def _load(tenant_id):
+    try:
+        row = Tenant.objects.filter(pk=tenant_id).values_list("id", "slug", "status").first()
+    except (ValueError, ValidationError):
+        return None  # not a UUID
+    return TenantState(*row) if row else None
+
+
+def tenant_state(tenant_id):
+    """TenantState for `tenant_id` (UUID or str), or None if there is no such tenant."""
+    if not tenant_id:
+        return None
+    key = str(tenant_id)
+    seconds = _seconds()
+    if seconds <= 0:
+        return _load(key)
+
+    shared = _shared_cache()
+    if shared is not None:
+        state = shared.get(_cache_key(key))
+        if state is None:
+            state = _load(key)
+            if state is not None:
+                shared.set(_cache_key(key), state, seconds)
+        return state
+
+    now = time.monotonic()
+    entry = _local.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    state = _load(key)
+    if state is not None:
+        with _lock:
+            _local[key] = (now + seconds, state)
+    return state
+
+
+def _forget(key):
+    with _lock:
+        _local.pop(key, None)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_cache_key(key))
+
+
+def invalidate_tenant(tenant_id):
+    """Drops the cached state of a tenant after the current transaction."""
+    key = str(tenant_id)
+    transaction.on_commit(lambda: _forget(key), robust=True)
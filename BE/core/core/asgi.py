@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after setup: /api/events/ (SSE) is served outside the Django
+# handler so idle streams do not each hold a thread. See core_api/sse.py.
+from core_api.sse import mount_event_stream  # noqa: E402
+
+application = mount_event_stream(django_application)
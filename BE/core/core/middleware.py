@@ -1,29 +1,62 @@
 from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject
+
+from context.cache import tenant_state
 from context.models import Tenant
+from users.roles import RoleContext
+
+
+def activate_tenant(request, tenant_id):
+    """
+    Sets request.tenant_id and a lazy request.tenant when `tenant_id` is an
+    active tenant; otherwise returns why the request must be refused.
+    """
+    state = tenant_state(tenant_id)
+    if state is None:
+        return "User has no tenant"
+    if state.status != "active":
+        return "Tenant suspended"
+    request.tenant_id = state.id
+    request.tenant = SimpleLazyObject(lambda: Tenant.objects.get(pk=state.id))
+    return None
 
 
 class TenantMiddleware:
+    """
+    Rejects session requests whose user's tenant is missing or suspended,
+    and sets request.tenant_id and a lazy request.tenant for the others.
+
+    API requests are only authenticated by DRF, after middleware has run;
+    CachedJWTAuthentication (users/authentication.py) runs the same check
+    on the user it authenticates, so the token is verified once. The
+    tenant's status is read through context.cache, so neither runs a
+    tenant query on the hot path.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-
-        # Skip unauthenticated requests
+        # Skip unauthenticated (and not yet authenticated API) requests
         if not request.user.is_authenticated:
             return self.get_response(request)
 
-        user = request.user
+        error = activate_tenant(request, getattr(request.user, "tenant_id", None))
+        if error:
+            return JsonResponse({"error": error}, status=403)
 
-        if not hasattr(user, "tenant") or not user.tenant:
-            return JsonResponse({"error": "User has no tenant"}, status=403)
+        return self.get_response(request)
 
-        tenant = user.tenant
 
-        if tenant.status != "active":
-            return JsonResponse({"error": "Tenant suspended"}, status=403)
+class RoleContextMiddleware:
+    """
+    Attaches request.role_context (see users.roles.RoleContext).
+    Roles are resolved lazily, after DRF has authenticated the request.
+    """
 
-        request.tenant = tenant
-        request.tenant_id = tenant.id
+    def __init__(self, get_response):
+        self.get_response = get_response
 
+    def __call__(self, request):
+        request.role_context = RoleContext(request)
         return self.get_response(request)
@@ -88,7 +88,7 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -123,6 +123,13 @@ SIMPLE_JWT = {
     "SIGNING_KEY": os.getenv("JWT_SIGNING_KEY", SECRET_KEY),
 }
 
+# Seconds CachedJWTAuthentication keeps a user's snapshot (fields + roles)
+# in the USER_AUTH_CACHE alias (0 = load the user every request). Only
+# enable with a cache shared by all workers, so User/UserRole changes
+# (deactivations, removed roles) reach them all.
+USER_AUTH_CACHE = os.getenv("USER_AUTH_CACHE", "default")
+USER_AUTH_CACHE_SECONDS = int(os.getenv("USER_AUTH_CACHE_SECONDS", "0"))
+
 
 # --------------------------------------------------
 # MIDDLEWARE
@@ -136,6 +143,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "core.middleware.TenantMiddleware",
+    "core.middleware.RoleContextMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -149,6 +157,9 @@ ROOT_URLCONF = "core.urls"
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+# Serve this one (uvicorn/daphne); it also carries the /api/events/ SSE streams.
+ASGI_APPLICATION = "core.asgi.application"
+
 
 # --------------------------------------------------
 # TEMPLATES
@@ -190,6 +201,25 @@ DATABASES = {
 }
 
 
+# --------------------------------------------------
+# CACHES
+# --------------------------------------------------
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Dashboard widget payloads. Must be shared by every worker process:
+    # django.core.cache.backends.filebased.FileBasedCache with a directory
+    # as the location, or django.core.cache.backends.db.DatabaseCache with
+    # a table name (create it with `manage.py createcachetable`).
+    "widgets": {
+        "BACKEND": os.getenv("WIDGET_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("WIDGET_CACHE_LOCATION", "dashboard-widgets"),
+    },
+}
+
+
 # --------------------------------------------------
 # PASSWORD VALIDATION
 # --------------------------------------------------
@@ -244,8 +274,12 @@ CORS_ALLOWED_ORIGINS = _get_csv(
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
     "x-active-role",
+    "if-none-match",
 ]
 
+# Lets the frontend read ETags and revalidate with If-None-Match.
+CORS_EXPOSE_HEADERS = ["etag"]
+
 CORS_ALLOW_CREDENTIALS = _get_bool("CORS_ALLOW_CREDENTIALS", True)
 
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
@@ -259,5 +293,80 @@ SECURE_CONTENT_TYPE_NOSNIFF = _get_bool("SECURE_CONTENT_TYPE_NOSNIFF", True)
 X_FRAME_OPTIONS = os.getenv("X_FRAME_OPTIONS", "DENY")
 
 
+# --------------------------------------------------
+# TENANTS
+# --------------------------------------------------
+
+# Seconds TenantMiddleware caches a tenant's slug and status (0 = query
+# every request). Process-local unless TENANT_CACHE names a shared cache
+# alias; other workers then see a suspension within this window.
+TENANT_CACHE_SECONDS = int(os.getenv("TENANT_CACHE_SECONDS", "30"))
+TENANT_CACHE = os.getenv("TENANT_CACHE") or None
+
+
+# --------------------------------------------------
+# TASKS
+# --------------------------------------------------
+
+# Ref numbers (TAS-123) each process reserves per tenant at a time.
+TASK_REF_LEASE_SIZE = int(os.getenv("TASK_REF_LEASE_SIZE", "100"))
+
+# Keep per-status task counts in TaskStatusRollup and serve dashboard KPIs
+# from them. Run `manage.py rebuild_task_status_rollup` after turning it on.
+TASK_STATUS_ROLLUP = _get_bool("TASK_STATUS_ROLLUP", False)
+
+# Minutes before due_date at which send_due_reminders notifies assignees.
+TASK_DUE_REMINDER_WINDOWS = [
+    int(minutes) for minutes in _get_csv("TASK_DUE_REMINDER_WINDOWS", "1440,60")
+]
+
+
+# --------------------------------------------------
+# DASHBOARD
+# --------------------------------------------------
+
+# Cache alias and lifetime of shared dashboard widget payloads, keyed by
+# the tenant's data version (0 = compute on every request).
+DASHBOARD_WIDGET_CACHE = os.getenv("DASHBOARD_WIDGET_CACHE", "widgets")
+DASHBOARD_WIDGET_CACHE_SECONDS = int(os.getenv("DASHBOARD_WIDGET_CACHE_SECONDS", "0"))
+
+
+# --------------------------------------------------
+# NOTIFICATIONS
+# --------------------------------------------------
+
+# Insert task notifications after the request's transaction commits
+# instead of inside it.
+NOTIFICATIONS_DEFER_TO_COMMIT = _get_bool("NOTIFICATIONS_DEFER_TO_COMMIT", True)
+
+# Seconds to cache unread counts in the default cache (0 = read the counter
+# row every time). Only enable with a cache shared by all workers.
+NOTIFICATION_UNREAD_CACHE_SECONDS = int(os.getenv("NOTIFICATION_UNREAD_CACHE_SECONDS", "0"))
+
+# Merge a task notification into an unread one for the same user, task and
+# kind from the last N seconds (0 = always insert a new row).
+NOTIFICATION_COALESCE_SECONDS = int(os.getenv("NOTIFICATION_COALESCE_SECONDS", "300"))
+
+# Read notifications kept per plan by `manage.py prune_notifications`:
+# removed after `days`, and beyond each user's newest `keep_per_user` rows.
+# None disables a rule. OrganizationProfile can override both per tenant.
+NOTIFICATION_RETENTION = {
+    "free": {"days": 30, "keep_per_user": 200},
+    "starter": {"days": 90, "keep_per_user": 500},
+    "growth": {"days": 180, "keep_per_user": 1000},
+    "enterprise": {"days": 365, "keep_per_user": 2000},
+}
+
+
+# --------------------------------------------------
+# EVENTS (SSE)
+# --------------------------------------------------
+
+# Broker that fans task/notification events out to /api/events/ streams.
+# The in-process default only reaches streams served by the same process.
+EVENT_BROKER = os.getenv("EVENT_BROKER", "core_api.events.InProcessBroker")
+EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "20"))
+
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
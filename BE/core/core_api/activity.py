@@ -0,0 +1,80 @@
+"""
+core_api/activity.py
+
+The tenant activity feed behind GET /api/activity/ and the "recent
+activity" blocks of AdminDashboardView and DashboardWidgetsView.
+
+Rows are read straight off TaskHistory.tenant, newest first on
+(-timestamp, -id), which task_history_feed_idx serves without a sort,
+and are paged with ActivityCursorPagination (core_api/pagination.py).
+Messages are built from the snapshot columns stored on each row (action,
+title at the time of the change), so no Task row is loaded per item.
+
+Filters:
+    division / board    the task's current division / board
+    user                who performed the action
+Non-admin roles only see history of tasks visible to them
+(core_api/visibility.py).
+"""
+
+from rest_framework.exceptions import ValidationError
+
+from core_api.models import Task, TaskHistory
+from core_api.pagination import ACTIVITY_KEYSET_ORDERING
+from core_api.visibility import ROLE_SCOPES, scope_tasks_for_role
+
+ACTIVITY_FIELDS = ("id", "task_id", "action", "title", "status_name", "performed_by_id", "timestamp")
+
+ACTIVITY_FILTERS = {
+    "division": "task__division_id",
+    "board": "task__board_id",
+    "user": "performed_by_id",
+}
+
+
+def activity_message(action, title):
+    return f"{action} on '{title}'"
+
+
+def serialize_activity(row):
+    return {
+        "id": row["id"],
+        "task_id": row["task_id"],
+        "action": row["action"],
+        "message": activity_message(row["action"], row["title"]),
+        "title": row["title"],
+        "status_name": row["status_name"],
+        "performed_by": row["performed_by_id"],
+        "timestamp": row["timestamp"],
+    }
+
+
+def parse_activity_filters(params):
+    """{lookup: id} from ?division= / ?board= / ?user= query params."""
+    filters = {}
+    for param, lookup in ACTIVITY_FILTERS.items():
+        value = params.get(param)
+        if value in (None, ""):
+            continue
+        try:
+            filters[lookup] = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({param: "Must be an integer id."})
+    return filters
+
+
+def activity_queryset(tenant, *, filters=None, user=None, active_role=None):
+    """
+    History rows of `tenant` as ACTIVITY_FIELDS dicts, unordered.
+    With `user` and a scoped `active_role`, limited to tasks that role may see.
+    """
+    queryset = TaskHistory.objects.filter(tenant=tenant, **(filters or {}))
+    if user is not None and active_role in ROLE_SCOPES:
+        visible = scope_tasks_for_role(Task.objects.filter(tenant=tenant), user, active_role)
+        queryset = queryset.filter(task_id__in=visible.values("id"))
+    return queryset.values(*ACTIVITY_FIELDS)
+
+
+def recent_activity(tenant, limit=10):
+    rows = activity_queryset(tenant).order_by(*ACTIVITY_KEYSET_ORDERING)[:limit]
+    return [serialize_activity(row) for row in rows]
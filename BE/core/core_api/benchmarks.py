@@ -0,0 +1,214 @@
+"""
+core_api/benchmarks.py
+
+Plumbing shared by the benchmark_* management commands.
+
+Each benchmark seeds a throwaway tenant with bulk_create() inside
+scratch_tenant(), measures, and rolls the whole transaction back, so no
+rows are left behind even if it is interrupted. Run them against a
+scratch copy of the database all the same: seeding holds its locks until
+the rollback. Numbers are only comparable within one run.
+"""
+
+import statistics
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from rest_framework.throttling import SimpleRateThrottle
+
+from context.models import Tenant
+from core_api.models import Board, BoardStatus, Division, Notification, Task, TaskAssignee
+from users.models import Role, User, UserRole
+
+SEED_BATCH_SIZE = 5000
+
+FIRST_NAMES = (
+    "Ada", "Björn", "Chloé", "Dmitri", "Elif", "Farah", "Gustavo", "Hana", "Ivan", "Jürgen",
+    "Kofi", "Léa", "Mateo", "Nadia", "Oskar", "Priya", "Quentin", "Rosa", "Søren", "Tariq",
+)
+LAST_NAMES = (
+    "Andersen", "Brown", "Castillo", "Dubois", "Eriksen", "Fischer", "García", "Horvat",
+    "Ibrahim", "Johnson", "Kowalski", "López", "Müller", "Novak", "O'Brien", "Petrov",
+)
+
+
+@contextmanager
+def scratch_tenant(slug_prefix="bench"):
+    """A new tenant whose rows are all rolled back on exit."""
+    with transaction.atomic():
+        tenant = Tenant.objects.create(
+            name="Benchmark", slug=f"{slug_prefix}-{uuid.uuid4().hex[:8]}"
+        )
+        try:
+            yield tenant
+        finally:
+            transaction.set_rollback(True)
+
+
+@contextmanager
+def benchmark_environment():
+    """
+    Django's test environment (test client host allowed, in-memory email)
+    with DRF throttling off, so request loops are not cut off at the
+    per-user rate.
+    """
+    setup_test_environment()
+    try:
+        with mock.patch.object(SimpleRateThrottle, "allow_request", lambda self, request, view: True):
+            yield
+    finally:
+        teardown_test_environment()
+
+
+# =============================================================================
+# SEEDING
+# =============================================================================
+
+def seed_users(tenant, count, role_name=None, prefix="user"):
+    """`count` active users with varied accented names; no usable password."""
+    users = []
+    for start in range(0, count, SEED_BATCH_SIZE):
+        users.extend(User.objects.bulk_create([
+            User(
+                tenant=tenant,
+                username=f"{prefix}-{tenant.slug}-{index}",
+                email=f"{prefix}{index}@{tenant.slug}.test",
+                first_name=FIRST_NAMES[index % len(FIRST_NAMES)],
+                last_name=f"{LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]}{index}",
+                password="!",
+            )
+            for index in range(start, min(count, start + SEED_BATCH_SIZE))
+        ]))
+    if role_name:
+        role, _ = Role.objects.get_or_create(name=role_name)
+        UserRole.objects.bulk_create(
+            [UserRole(user=user, tenant=tenant, role=role) for user in users],
+            batch_size=SEED_BATCH_SIZE,
+        )
+    return users
+
+
+def seed_board(tenant):
+    """A board in its own division, with the default statuses (SIGNAL 2)."""
+    division = Division.objects.create(tenant=tenant, name="Benchmark", slug="benchmark")
+    return Board.objects.create(tenant=tenant, division=division, name="Benchmark", slug="benchmark")
+
+
+def seed_tasks(tenant, board, count, users, due_spread=None, **fields):
+    """
+    `count` more tasks on `board`, round-robin over its statuses, each with
+    one assignee from `users`. With `due_spread` (a timedelta), due dates
+    are spread evenly from now to now + due_spread.
+    """
+    statuses = list(BoardStatus.objects.filter(board=board).order_by("order"))
+    now = timezone.now()
+    first = Task.objects.filter(tenant=tenant).count()
+    created = 0
+    for start in range(first, first + count, SEED_BATCH_SIZE):
+        tasks = Task.objects.bulk_create([
+            Task(
+                tenant=tenant,
+                ref_id=f"BENCH-{index + 1}",
+                board=board,
+                division_id=board.division_id,
+                status=statuses[index % len(statuses)],
+                title=f"Benchmark task {index}",
+                description="Seeded by a benchmark command. " * 4,
+                created_by=users[index % len(users)],
+                due_date=now + due_spread * (index - first) / count if due_spread else None,
+                **fields,
+            )
+            for index in range(start, min(first + count, start + SEED_BATCH_SIZE))
+        ])
+        TaskAssignee.objects.bulk_create([
+            TaskAssignee(task=task, user=users[(start + offset) % len(users)])
+            for offset, task in enumerate(tasks)
+        ])
+        created += len(tasks)
+    return created
+
+
+def seed_notifications(tenant, users, per_user, newest, spacing=None, read_ratio=0.9):
+    """
+    `per_user` notifications for each user, the newest stamped `newest` and
+    each older one `spacing` (default one minute) before the previous.
+    created_at is auto_now_add, so it is set by UPDATEs after the insert.
+    The oldest `read_ratio` of each user's rows are read.
+    """
+    spacing = spacing or timedelta(minutes=1)
+    unread_count = per_user - int(per_user * read_ratio)
+    users_per_batch = max(1, SEED_BATCH_SIZE // max(1, per_user))
+    by_age = [[] for _ in range(per_user)]
+    for start in range(0, len(users), users_per_batch):
+        rows = Notification.objects.bulk_create([
+            Notification(
+                tenant=tenant,
+                user=user,
+                kind=Notification.Kind.TASK_STATUS_CHANGED,
+                title=f"Benchmark notification {age}",
+                is_read=age >= unread_count,
+                read_at=newest if age >= unread_count else None,
+            )
+            for user in users[start:start + users_per_batch]
+            for age in range(per_user)
+        ])
+        for index, row in enumerate(rows):
+            by_age[index % per_user].append(row.id)
+    for age, ids in enumerate(by_age):
+        for start in range(0, len(ids), SEED_BATCH_SIZE):
+            Notification.objects.filter(id__in=ids[start:start + SEED_BATCH_SIZE]).update(
+                created_at=newest - spacing * age
+            )
+    return per_user * len(users)
+
+
+# =============================================================================
+# MEASURING
+# =============================================================================
+
+def measure(fn, memory=False):
+    """
+    Runs fn() once; returns (result, {"seconds", "queries"[, "peak_mb"]}).
+    tracemalloc slows Python down, so time and memory come from separate
+    calls when both matter.
+    """
+    if memory:
+        tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            result = fn()
+            seconds = time.perf_counter() - started
+        stats = {"seconds": seconds, "queries": len(queries.captured_queries)}
+        if memory:
+            stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return result, stats
+
+
+def latency_ms(fn, repeat):
+    """{"p50", "p95", "mean"} milliseconds over `repeat` calls of fn()."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "mean": statistics.fmean(samples),
+    }
@@ -0,0 +1,492 @@
+"""
+core_api/bulk.py
+
+Bulk task mutations behind POST /api/tasks/bulk/.
+
+Request body:
+    {"items": [{"id": 12, "version": 3, "changes": {...}}, ...]}
+
+Supported changes (same meaning as PATCH /api/tasks/{id}/):
+    status_id, stage_id, blocked_reason   — any role
+    priority, board, assignee_ids         — TASK_CREATOR (own tasks) / ADMIN
+    delete: true                          — soft delete, must be the only change
+
+Every item is validated on its own and reported in `results` with an
+HTTP-style status (200, 400, 403, 404, 409). A failing item never aborts
+the rest of the batch. An item whose changes match the current values is
+reported as 200 but writes nothing (no version bump, history or event).
+Accepted items are written set-based: one UPDATE per
+distinct change-set, one bulk_create each for TaskHistory, TaskAssignee and
+Notification rows, then one visibility/search sync for the touched tasks.
+"""
+
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+
+from core_api.events import publish_task_event
+from core_api.models import Board, BoardStatus, Task, TaskAssignee, TaskHistory
+from core_api.notifications import (
+    build_status_changed,
+    build_task_assigned,
+    build_task_completed,
+    save_notifications,
+    task_recipients,
+)
+from core_api.rollups import adjust_status_rollup, task_status_delta
+from core_api.search import remove_tasks
+from core_api.serializers import validate_status_change
+from core_api.visibility import deferred_visibility_sync, scope_tasks_for_role, sync_task_visibility
+from core_api.widget_cache import bump_data_version
+from users.models import User
+from workflows.models import WorkflowStage
+from workflows.utils import validate_stage_transition
+
+BULK_MAX_ITEMS = 500
+BULK_CHANGE_FIELDS = {
+    "status_id",
+    "stage_id",
+    "blocked_reason",
+    "priority",
+    "board",
+    "assignee_ids",
+    "delete",
+}
+RECEIVER_CHANGE_FIELDS = {"status_id", "stage_id", "blocked_reason"}
+
+
+class BulkItemError(Exception):
+
+    def __init__(self, status_code, detail, **extra):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.extra = extra
+
+    def as_result(self, task_id):
+        result = {"id": task_id, "status": self.status_code}
+        if isinstance(self.detail, dict):
+            result["errors"] = self.detail
+        else:
+            result["detail"] = str(self.detail)
+        result.update(self.extra)
+        return result
+
+
+def _as_int(value, field):
+    if isinstance(value, bool):
+        raise BulkItemError(400, {field: f"{field} must be a valid integer."})
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BulkItemError(400, {field: f"{field} must be a valid integer."})
+
+
+def _parse_item(raw, active_role):
+    if not isinstance(raw, dict):
+        raise BulkItemError(400, "Each item must be an object with id, version and changes.")
+
+    task_id = _as_int(raw.get("id"), "id")
+    if raw.get("version") is None:
+        raise BulkItemError(400, {"version": "Version is required."})
+    version = _as_int(raw.get("version"), "version")
+
+    changes = raw.get("changes")
+    if not isinstance(changes, dict) or not changes:
+        raise BulkItemError(400, {"changes": "changes must be a non-empty object."})
+
+    unknown = set(changes) - BULK_CHANGE_FIELDS
+    if unknown:
+        raise BulkItemError(400, {"changes": f"Unsupported fields: {', '.join(sorted(unknown))}."})
+
+    if "delete" in changes:
+        if changes["delete"] is not True or len(changes) > 1:
+            raise BulkItemError(400, {"delete": "delete must be true and cannot be combined with other changes."})
+        if active_role == "TASK_RECEIVER":
+            raise BulkItemError(403, "Task receivers cannot delete tasks.")
+    elif active_role == "TASK_RECEIVER" and set(changes) - RECEIVER_CHANGE_FIELDS:
+        raise BulkItemError(403, "Task receivers can only update status fields.")
+
+    if "status_id" in changes and changes["status_id"] is not None:
+        changes["status_id"] = _as_int(changes["status_id"], "status_id")
+    if "stage_id" in changes and changes["stage_id"] is not None:
+        changes["stage_id"] = _as_int(changes["stage_id"], "stage_id")
+    if "board" in changes:
+        changes["board"] = _as_int(changes["board"], "board")
+    if "assignee_ids" in changes:
+        if not isinstance(changes["assignee_ids"], list):
+            raise BulkItemError(400, {"assignee_ids": "assignee_ids must be a list."})
+        changes["assignee_ids"] = sorted({_as_int(v, "assignee_ids") for v in changes["assignee_ids"]})
+
+    return task_id, version, changes
+
+
+class _Plan:
+    """Validated outcome for one item; applied later together with the rest of the batch."""
+
+    def __init__(self, task):
+        self.task = task
+        self.fields = {}
+        self.delete = False
+        self.assignees = None
+        self.old_status_name = task.status.name if task.status else ""
+        self.old_assignees = list(task.assignees.all())
+
+    @property
+    def is_noop(self):
+        return not self.delete and not self.fields and self.assignees is None
+
+
+class BulkTaskMutation:
+
+    def __init__(self, *, user, active_role):
+        self.user = user
+        self.active_role = active_role
+        self.now = timezone.now()
+
+    # -------------------------
+    # ENTRY POINT
+    # -------------------------
+
+    def run(self, items):
+        results = [None] * len(items)
+        parsed = {}
+        seen_ids = set()
+        for index, raw in enumerate(items):
+            raw_id = raw.get("id") if isinstance(raw, dict) else None
+            try:
+                task_id, version, changes = _parse_item(raw, self.active_role)
+                if task_id in seen_ids:
+                    raise BulkItemError(400, "Task appears more than once in this request.")
+            except BulkItemError as exc:
+                results[index] = exc.as_result(raw_id)
+                continue
+            seen_ids.add(task_id)
+            parsed[index] = (task_id, version, changes)
+
+        with transaction.atomic(), deferred_visibility_sync():
+            tasks = self._load_tasks([task_id for task_id, _, _ in parsed.values()])
+            self._preload(parsed.values())
+
+            plans = []
+            for index, (task_id, version, changes) in parsed.items():
+                task = tasks.get(task_id)
+                try:
+                    if task is None:
+                        raise BulkItemError(404, "Task not found.")
+                    plan = self._plan(task, version, changes)
+                except BulkItemError as exc:
+                    results[index] = exc.as_result(task_id)
+                    continue
+                results[index] = {"id": task_id, "status": 200}
+                if not plan.is_noop:
+                    plans.append(plan)
+
+            self._apply(plans)
+
+        versions = {task.id: task.version for task in tasks.values()}
+        for result in results:
+            if result["status"] == 200:
+                result["version"] = versions[result["id"]]
+        return results
+
+    # -------------------------
+    # LOADING
+    # -------------------------
+
+    def _load_tasks(self, task_ids):
+        queryset = (
+            Task.objects.filter(tenant_id=self.user.tenant_id, id__in=task_ids, is_deleted=False)
+            .select_related("status", "board", "workflow", "stage", "created_by")
+            .prefetch_related(Prefetch("assignees", queryset=User.objects.order_by("id")))
+            .select_for_update(of=("self",))
+            .order_by("id")
+        )
+        queryset = scope_tasks_for_role(queryset, self.user, self.active_role)
+        return {task.id: task for task in queryset}
+
+    def _preload(self, parsed):
+        status_ids, stage_ids, board_ids, user_ids = set(), set(), set(), set()
+        for _, _, changes in parsed:
+            if changes.get("status_id") is not None:
+                status_ids.add(changes["status_id"])
+            if changes.get("stage_id") is not None:
+                stage_ids.add(changes["stage_id"])
+            if "board" in changes:
+                board_ids.add(changes["board"])
+            user_ids.update(changes.get("assignee_ids", []))
+
+        tenant_id = self.user.tenant_id
+        self.boards = {
+            board.id: board
+            for board in Board.objects.filter(tenant_id=tenant_id, id__in=board_ids, is_deleted=False)
+            .select_related("section")
+        }
+        # Statuses of target boards, so a board move can remap the current status by name.
+        self.statuses = {
+            board_status.id: board_status
+            for board_status in BoardStatus.objects.filter(
+                Q(id__in=status_ids) | Q(board_id__in=self.boards),
+                board__tenant_id=tenant_id,
+            ).order_by("order")
+        }
+        self.stages = {
+            stage.id: stage
+            for stage in WorkflowStage.objects.filter(id__in=stage_ids, workflow__tenant_id=tenant_id)
+        }
+        self.users = {
+            user.id: user
+            for user in User.objects.filter(tenant_id=tenant_id, id__in=user_ids)
+        }
+
+    # -------------------------
+    # VALIDATION
+    # -------------------------
+
+    def _plan(self, task, version, changes):
+        if version != task.version:
+            raise BulkItemError(
+                409,
+                "Conflict detected. Task was modified by another user.",
+                version=task.version,
+            )
+        if self.active_role == "TASK_CREATOR" and task.created_by_id != self.user.id:
+            raise BulkItemError(403, "You can only modify tasks you created.")
+
+        plan = _Plan(task)
+        if changes.get("delete"):
+            plan.delete = True
+            return plan
+
+        board = task.board
+        if "board" in changes and changes["board"] != task.board_id:
+            board = self.boards.get(changes["board"])
+            if board is None:
+                raise BulkItemError(400, {"board": "Board must belong to your organisation."})
+            division_id = board.division_id or (board.section.division_id if board.section_id else None)
+            if division_id is None:
+                raise BulkItemError(400, {"board": "Board must belong to a division."})
+            plan.fields["board"] = board
+            plan.fields["division_id"] = division_id
+
+        current_status = task.status
+        new_status = current_status
+        if "status_id" in changes:
+            new_status = self.statuses.get(changes["status_id"]) if changes["status_id"] is not None else None
+            if changes["status_id"] is not None and new_status is None:
+                raise BulkItemError(400, {"status_id": "Invalid status_id."})
+        elif "board" in plan.fields and current_status and current_status.board_id != board.id:
+            new_status = self._status_on_board(board, current_status.name)
+
+        if new_status and board and new_status.board_id != board.id:
+            raise BulkItemError(400, {"status": "Status does not belong to this task's board."})
+
+        blocked_reason = changes.get("blocked_reason", task.blocked_reason)
+        if "status_id" in changes and new_status and new_status.name != "Blocked":
+            blocked_reason = None
+
+        # A board move re-maps the status onto the new board; only an explicit
+        # status_id counts as a workflow transition.
+        transition_from = current_status if "status_id" in changes else new_status
+        try:
+            validate_status_change(transition_from, new_status, self.active_role, blocked_reason)
+        except serializers.ValidationError as exc:
+            raise BulkItemError(400, exc.detail)
+
+        if new_status != current_status:
+            plan.fields["status"] = new_status
+        if blocked_reason != task.blocked_reason:
+            plan.fields["blocked_reason"] = blocked_reason
+
+        if "stage_id" in changes and changes["stage_id"] != task.stage_id:
+            plan.fields["stage"] = self._validate_stage(task, changes["stage_id"])
+
+        if "priority" in changes and changes["priority"] != task.priority:
+            if changes["priority"] not in Task.Priority.values:
+                raise BulkItemError(400, {"priority": f"\"{changes['priority']}\" is not a valid choice."})
+            plan.fields["priority"] = changes["priority"]
+
+        if "assignee_ids" in changes:
+            missing = [user_id for user_id in changes["assignee_ids"] if user_id not in self.users]
+            if missing:
+                raise BulkItemError(400, {"assignee_ids": "Assignees must belong to your organisation."})
+            if set(changes["assignee_ids"]) != {user.id for user in plan.old_assignees}:
+                plan.assignees = [self.users[user_id] for user_id in changes["assignee_ids"]]
+
+        return plan
+
+    def _status_on_board(self, board, name):
+        candidates = [s for s in self.statuses.values() if s.board_id == board.id]
+        for board_status in candidates:
+            if board_status.name == name:
+                return board_status
+        for board_status in candidates:
+            if board_status.is_default:
+                return board_status
+        return None
+
+    def _validate_stage(self, task, stage_id):
+        if stage_id is None:
+            return None
+        stage = self.stages.get(stage_id)
+        if stage is None or stage.workflow_id != task.workflow_id:
+            raise BulkItemError(400, {"stage_id": "Stage does not belong to this workflow."})
+        if task.stage_id:
+            try:
+                validate_stage_transition(task, stage, self.active_role)
+            except PermissionDenied as exc:
+                raise BulkItemError(403, exc.detail)
+        return stage
+
+    # -------------------------
+    # WRITES
+    # -------------------------
+
+    def _apply(self, plans):
+        if not plans:
+            return
+
+        deleted = [plan for plan in plans if plan.delete]
+        updated = [plan for plan in plans if not plan.delete]
+
+        if deleted:
+            Task.objects.filter(id__in=[plan.task.id for plan in deleted]).update(
+                is_deleted=True,
+                deleted_at=self.now,
+                deleted_by=self.user,
+                updated_at=self.now,
+            )
+
+        # One UPDATE per distinct change-set; triage batches mostly share one.
+        groups = {}
+        for plan in updated:
+            key = tuple(sorted(
+                (name, value.pk if hasattr(value, "pk") else value)
+                for name, value in plan.fields.items()
+            ))
+            groups.setdefault(key, []).append(plan)
+        for key, group in groups.items():
+            Task.objects.filter(id__in=[plan.task.id for plan in group]).update(
+                **{
+                    (f"{name}_id" if name in {"board", "status", "stage"} else name): value
+                    for name, value in key
+                },
+                version=F("version") + 1,
+                updated_by=self.user,
+                updated_at=self.now,
+            )
+
+        rollup_deltas = {}
+        for plan in deleted:
+            task_status_delta(rollup_deltas, plan.task.status_id, False, -1)
+        for plan in updated:
+            if "status" in plan.fields:
+                task_status_delta(rollup_deltas, plan.task.status_id, False, -1)
+                task_status_delta(rollup_deltas, getattr(plan.fields["status"], "id", None), False, +1)
+        adjust_status_rollup(self.user.tenant_id, rollup_deltas)
+
+        for plan in updated:
+            for name, value in plan.fields.items():
+                setattr(plan.task, name, value)
+            plan.task.version += 1
+        for plan in deleted:
+            plan.task.is_deleted = True
+
+        self._write_assignees([plan for plan in updated if plan.assignees is not None])
+
+        TaskHistory.objects.bulk_create([self._history(plan) for plan in plans])
+        save_notifications(
+            [notification for plan in updated for notification in self._notifications(plan)]
+        )
+
+        # update() and bulk_create() bypass the Task/TaskAssignee signals.
+        sync_task_visibility(
+            [plan.task.id for plan in deleted]
+            + [plan.task.id for plan in updated if plan.assignees is not None]
+        )
+        remove_tasks([plan.task.id for plan in deleted])
+        bump_data_version(self.user.tenant_id)
+
+        for plan in plans:
+            plan.task.updated_at = self.now
+            old_ids = {user.id for user in plan.old_assignees}
+            new_ids = old_ids if plan.assignees is None else {user.id for user in plan.assignees}
+            publish_task_event(
+                plan.task,
+                "deleted" if plan.delete else "updated",
+                assignee_ids=new_ids,
+                extra_user_ids=old_ids - new_ids,
+            )
+
+    def _write_assignees(self, plans):
+        removed = Q()
+        created = []
+        for plan in plans:
+            old_ids = {user.id for user in plan.old_assignees}
+            new_ids = {user.id for user in plan.assignees}
+            if old_ids - new_ids:
+                removed |= Q(task_id=plan.task.id, user_id__in=old_ids - new_ids)
+            created.extend(
+                TaskAssignee(task=plan.task, user_id=user_id, assigned_by=self.user)
+                for user_id in sorted(new_ids - old_ids)
+            )
+        if removed:
+            TaskAssignee.objects.filter(removed).delete()
+        TaskAssignee.objects.bulk_create(created)
+
+    def _history(self, plan):
+        task = plan.task
+        new_status_name = task.status.name if task.status else ""
+        changes = {}
+        if plan.delete:
+            action = TaskHistory.Action.SOFT_DELETED
+        else:
+            action = TaskHistory.action_for_status_change(plan.old_status_name, new_status_name)
+            if plan.old_status_name != new_status_name:
+                changes["status"] = {"from": plan.old_status_name, "to": new_status_name}
+        return TaskHistory(
+            tenant_id=task.tenant_id,
+            task=task,
+            action=action,
+            performed_by=self.user,
+            title=task.title,
+            description=task.description,
+            status_name=new_status_name,
+            priority=task.priority,
+            due_date=task.due_date,
+            changes=changes,
+        )
+
+    def _notifications(self, plan):
+        task = plan.task
+        assignees = plan.assignees if plan.assignees is not None else plan.old_assignees
+        new_status_name = task.status.name if task.status else ""
+        notifications = []
+
+        if plan.old_status_name != new_status_name:
+            notifications.extend(build_status_changed(
+                task=task,
+                actor=self.user,
+                from_status=plan.old_status_name,
+                to_status=new_status_name,
+                recipients=task_recipients(task, assignees),
+            ))
+            if task.status and task.status.is_terminal and not task.status.is_cancelled:
+                notifications.extend(build_task_completed(
+                    task=task,
+                    actor=self.user,
+                    recipients=assignees,
+                ))
+
+        if plan.assignees is not None:
+            old_ids = {user.id for user in plan.old_assignees}
+            added = [user for user in plan.assignees if user.id not in old_ids]
+            if added:
+                notifications.extend(build_task_assigned(
+                    task=task,
+                    actor=self.user,
+                    recipients=added,
+                ))
+        return notifications
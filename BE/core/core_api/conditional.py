@@ -0,0 +1,137 @@
+"""
+core_api/conditional.py
+
+Conditional GET (ETag / If-None-Match → 304) for polled read endpoints.
+
+An ETag is a hash of the change markers the payload is built from plus
+everything else that shapes the response for this caller (path and query
+string, user, active role). Markers come from one aggregate query over the
+same queryset the view would serialize, e.g.
+
+    COUNT(*), SUM(id), MAX(updated_at)
+
+so adding, removing or editing any row changes the tag. When the client's
+If-None-Match matches, the view answers 304 before loading related rows
+or running the serializer. A detail 304 still requires the object to exist
+and pass the view's object permissions. If-None-Match: * is not honoured;
+only a tag the client was actually served can match.
+
+Rows a payload embeds but that live in other tables bump their parent's
+marker instead (see SIGNAL 4 in core_api/signals.py):
+    TaskAssignee / TaskAttachment / subtasks → Task.updated_at
+    BoardStatus                              → Board.updated_at
+User display names are not tracked; edits show up with the next change
+to the task itself.
+"""
+
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from users.roles import get_role_context
+
+DEFAULT_ETAG_AGGREGATES = {
+    "count": Count("pk"),
+    "ids": Sum("pk"),
+    "updated": Max("updated_at"),
+}
+
+
+def compute_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return quote_etag(digest)
+
+
+def request_etag_parts(request):
+    """What besides the data itself shapes the response for this caller."""
+    role_context = get_role_context(request)
+    active_role = role_context.active_role if role_context.has_valid_active_role else None
+    return (request.get_full_path(), request.user.pk, active_role)
+
+
+def queryset_fingerprint(queryset, aggregates=None):
+    values = queryset.order_by().aggregate(**(aggregates or DEFAULT_ETAG_AGGREGATES))
+    return tuple(sorted(values.items()))
+
+
+def etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = {tag.removeprefix("W/") for tag in parse_etags(header)}
+    return etag in candidates
+
+
+def not_modified(etag):
+    return set_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def set_etag(response, etag):
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response["ETag"] = etag
+        # Cacheable per user, but always revalidated.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization", "X-Active-Role"))
+    return response
+
+
+def touch(model, ids):
+    """Bumps updated_at without a save() so no signals fire."""
+    ids = [pk for pk in ids if pk is not None]
+    if ids:
+        model.objects.filter(pk__in=ids).update(updated_at=timezone.now())
+
+
+class ConditionalGetMixin:
+    """
+    ETag support for ModelViewSet list/retrieve. The tag is built from
+    `etag_aggregates` over get_etag_queryset() (narrowed to the object on
+    retrieve), so a list hit costs one aggregate query. A retrieve hit
+    also loads the bare object for the object permission check.
+    """
+
+    etag_aggregates = DEFAULT_ETAG_AGGREGATES
+
+    def get_etag_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_etag(self, request):
+        queryset = self.get_etag_queryset()
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                obj = queryset.first()
+            except (TypeError, ValueError, ValidationError):
+                return None  # malformed pk; the handler answers 404
+            if obj is None:
+                return None  # the handler answers 404
+            # A 304 must not skip the checks get_object() would run.
+            self.check_object_permissions(request, obj)
+        return compute_etag(
+            type(self).__name__,
+            self.action,
+            *request_etag_parts(request),
+            queryset_fingerprint(queryset, self.etag_aggregates),
+        )
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return set_etag(handler(request, *args, **kwargs), etag)
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
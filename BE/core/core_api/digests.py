@@ -0,0 +1,79 @@
+"""
+core_api/digests.py
+
+Periodic notification digests, sent by `manage.py send_notification_digests`
+(run it from cron at the digest interval, e.g. hourly).
+
+For each active user with User.notification_digest on, the unread
+notifications created since their last digest are folded into one DIGEST
+notification ("14 updates on 3 tasks") and marked read, so the unread
+badge shows one entry instead of one per event. Earlier unread digests
+are folded into the new one. Users with fewer than DIGEST_MIN_ITEMS
+unread rows are left alone.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from core_api.models import Notification
+from core_api.notification_counters import decrement_unread
+from core_api.notifications import save_notifications
+from users.models import User
+
+DIGEST_MIN_ITEMS = 2
+DIGEST_LISTED_TASKS = 3
+
+
+def digest_users(tenant_id=None):
+    users = User.objects.filter(is_active=True, notification_digest=True).order_by("id")
+    if tenant_id is not None:
+        users = users.filter(tenant_id=tenant_id)
+    return users
+
+
+def build_digest_text(notifications):
+    events = sum(n.event_count for n in notifications)
+    refs = list(dict.fromkeys(n.task.ref_id for n in notifications if n.task_id))
+    title = f"{events} update{'s' if events != 1 else ''}"
+    if refs:
+        title += f" on {len(refs)} task{'s' if len(refs) != 1 else ''}"
+    listed = ", ".join(refs[:DIGEST_LISTED_TASKS])
+    if len(refs) > DIGEST_LISTED_TASKS:
+        listed += f" and {len(refs) - DIGEST_LISTED_TASKS} more"
+    return title, (f"Activity on {listed}." if listed else "")
+
+
+def send_digest(user, now=None):
+    """Folds the user's unread notifications into a DIGEST. Returns it, or None."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        pending = list(
+            Notification.objects.filter(
+                tenant_id=user.tenant_id,
+                user=user,
+                is_read=False,
+                created_at__lte=now,
+            )
+            .select_related("task")
+            .order_by("-created_at", "-id")
+        )
+        if len(pending) < DIGEST_MIN_ITEMS:
+            return None
+
+        flipped = Notification.objects.filter(
+            id__in=[n.id for n in pending],
+            is_read=False,
+        ).update(is_read=True, read_at=now)
+        decrement_unread(user.id, flipped)
+
+        title, body = build_digest_text(pending)
+        digest = Notification(
+            tenant_id=user.tenant_id,
+            user=user,
+            kind=Notification.Kind.DIGEST,
+            title=title[:160],
+            body=body[:255],
+            event_count=sum(n.event_count for n in pending),
+        )
+        save_notifications([digest])
+    return digest
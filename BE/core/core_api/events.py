@@ -0,0 +1,177 @@
+"""
+core_api/events.py
+
+Real-time task and notification events for the SSE stream (core_api/sse.py).
+
+Write paths call publish_task_event() / publish_notifications(). Events are
+handed to the broker once the surrounding transaction commits, and the
+broker fans them out to the open streams of the event's tenant. Each
+stream only receives the events addressed to its user:
+
+    task.*                 creator + assignees (+ admins); tasks with
+                           neither reach admins only
+    notification.created   the recipient
+    notification.updated   the recipient (an event merged into an unread row)
+
+Payloads are small. Clients refetch the task (or call /tasks/changes/)
+rather than relying on the event for the full state.
+
+The default InProcessBroker keeps subscribers in memory, which is enough
+for one ASGI process serving both the API and the streams. To fan out
+across processes, subclass it and override publish() to send events over
+a shared transport (e.g. Redis pub/sub), calling dispatch() from the
+listener. Point settings.EVENT_BROKER at the subclass.
+"""
+
+import asyncio
+import itertools
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+EVENT_QUEUE_SIZE = 256
+
+
+class Event:
+
+    def __init__(self, name, tenant_id, data, user_ids=None):
+        self.id = None
+        self.name = name
+        self.tenant_id = tenant_id
+        self.data = data
+        # None addresses every stream of the tenant.
+        self.user_ids = frozenset(user_ids) if user_ids is not None else None
+
+
+class Subscription:
+    """One open stream. Lives on the event loop that serves it."""
+
+    def __init__(self, tenant_id, user_id, is_admin=False, queue_size=EVENT_QUEUE_SIZE):
+        self.tenant_id = tenant_id
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        # Set when events had to be dropped; the stream tells the client
+        # to resync instead of silently skipping them.
+        self.overflowed = False
+
+    def wants(self, event):
+        if event.user_ids is None or self.user_id in event.user_ids:
+            return True
+        return self.is_admin and event.name.startswith("task.")
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, event):
+        # publish() runs in request threads; hop onto the stream's loop.
+        self.loop.call_soon_threadsafe(self._put, event)
+
+
+class InProcessBroker:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # tenant_id -> set of Subscription
+        self._ids = itertools.count(1)
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscribers.setdefault(subscription.tenant_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.tenant_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.tenant_id]
+
+    def publish(self, event):
+        self.dispatch(event)
+
+    def dispatch(self, event):
+        if event.id is None:
+            event.id = next(self._ids)
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.tenant_id, ()))
+        for subscription in subscribers:
+            if subscription.wants(event):
+                subscription.deliver(event)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "EVENT_BROKER", "core_api.events.InProcessBroker")
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish(event):
+    """Publishes once the current transaction commits (immediately outside one)."""
+    transaction.on_commit(lambda: get_broker().publish(event))
+
+
+# =============================================================================
+# PUBLISHERS
+# =============================================================================
+
+def task_event_data(task):
+    return {
+        "id": task.id,
+        "ref_id": task.ref_id,
+        "version": task.version,
+        "board": task.board_id,
+        "status": task.status_id,
+        "is_deleted": task.is_deleted,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+    }
+
+
+def publish_task_event(task, action, assignee_ids=None, extra_user_ids=()):
+    """
+    action — "created", "updated", "deleted", ...
+    assignee_ids — current assignees if the caller already has them
+    extra_user_ids — users who should hear about it although they no
+                     longer see the task (e.g. a removed assignee)
+    """
+    from core_api.models import TaskAssignee
+
+    if assignee_ids is None:
+        assignee_ids = TaskAssignee.objects.filter(task_id=task.id).values_list("user_id", flat=True)
+    user_ids = set(assignee_ids) | set(extra_user_ids)
+    if task.created_by_id:
+        user_ids.add(task.created_by_id)
+    # Never None: an empty audience still reaches admins (Subscription.wants),
+    # but a task event is never broadcast to the whole tenant.
+    publish(Event(f"task.{action}", task.tenant_id, task_event_data(task), user_ids=user_ids))
+
+
+def publish_notifications(notifications, action="created"):
+    from core_api.serializers import NotificationSerializer
+
+    for notification in notifications:
+        publish(Event(
+            f"notification.{action}",
+            notification.tenant_id,
+            NotificationSerializer(notification).data,
+            user_ids=[notification.user_id],
+        ))
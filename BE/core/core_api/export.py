@@ -0,0 +1,193 @@
+"""
+core_api/export.py
+
+Streaming task export for GET /api/tasks/export/?output=csv|ndjson.
+
+Rows are read with values_list().iterator(chunk_size=...) so only one
+chunk of tasks is in memory at a time. Names for status, stage, board,
+division and users are resolved per chunk with one query per table, and
+cached by id across chunks (these tables are small compared to tasks).
+Assignees are fetched per chunk from TaskAssignee.
+"""
+
+import csv
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core_api.models import Board, BoardStatus, Division, TaskAssignee
+from users.models import User
+from workflows.models import WorkflowStage
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_OUTPUTS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+TASK_EXPORT_VALUES = (
+    "id",
+    "ref_id",
+    "title",
+    "description",
+    "division_id",
+    "board_id",
+    "parent_id",
+    "status_id",
+    "stage_id",
+    "priority",
+    "blocked_reason",
+    "due_date",
+    "start_date",
+    "estimated_hours",
+    "created_by_id",
+    "version",
+    "created_at",
+    "updated_at",
+)
+
+EXPORT_COLUMNS = [
+    "id",
+    "ref_id",
+    "title",
+    "description",
+    "division",
+    "board",
+    "parent_id",
+    "status",
+    "stage",
+    "priority",
+    "blocked_reason",
+    "due_date",
+    "start_date",
+    "estimated_hours",
+    "assignees",
+    "created_by",
+    "version",
+    "created_at",
+    "updated_at",
+]
+
+
+class _Echo:
+    """csv.writer target that hands back each written line."""
+
+    def write(self, value):
+        return value
+
+
+class _NameCache:
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.names = {}
+
+    def load(self, ids):
+        missing = {pk for pk in ids if pk is not None and pk not in self.names}
+        if missing:
+            self.names.update(self.queryset.filter(id__in=missing).values_list("id", self.field))
+
+    def get(self, pk):
+        if pk is None:
+            return ""
+        return self.names.get(pk, "")
+
+
+class TaskExporter:
+
+    def __init__(self, queryset, tenant_id, chunk_size=EXPORT_CHUNK_SIZE):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+        self.statuses = _NameCache(BoardStatus.objects.filter(board__tenant_id=tenant_id), "name")
+        self.stages = _NameCache(WorkflowStage.objects.filter(workflow__tenant_id=tenant_id), "name")
+        self.boards = _NameCache(Board.objects.filter(tenant_id=tenant_id), "name")
+        self.divisions = _NameCache(Division.objects.filter(tenant_id=tenant_id), "name")
+        self.users = _NameCache(User.objects.filter(tenant_id=tenant_id), "email")
+
+    def chunks(self):
+        rows = self.queryset.values_list(*TASK_EXPORT_VALUES).iterator(chunk_size=self.chunk_size)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield self._resolve(chunk)
+
+    def _resolve(self, chunk):
+        chunk = [dict(zip(TASK_EXPORT_VALUES, row)) for row in chunk]
+
+        assignees = {}
+        for task_id, user_id in (
+            TaskAssignee.objects.filter(task_id__in=[row["id"] for row in chunk])
+            .order_by("assigned_at", "id")
+            .values_list("task_id", "user_id")
+        ):
+            assignees.setdefault(task_id, []).append(user_id)
+
+        self.statuses.load(row["status_id"] for row in chunk)
+        self.stages.load(row["stage_id"] for row in chunk)
+        self.boards.load(row["board_id"] for row in chunk)
+        self.divisions.load(row["division_id"] for row in chunk)
+        self.users.load(
+            [row["created_by_id"] for row in chunk]
+            + [user_id for user_ids in assignees.values() for user_id in user_ids]
+        )
+
+        records = []
+        for row in chunk:
+            records.append({
+                "id": row["id"],
+                "ref_id": row["ref_id"],
+                "title": row["title"],
+                "description": row["description"],
+                "division": self.divisions.get(row["division_id"]),
+                "board": self.boards.get(row["board_id"]),
+                "parent_id": row["parent_id"],
+                "status": self.statuses.get(row["status_id"]),
+                "stage": self.stages.get(row["stage_id"]),
+                "priority": row["priority"],
+                "blocked_reason": row["blocked_reason"] or "",
+                "due_date": row["due_date"],
+                "start_date": row["start_date"],
+                "estimated_hours": row["estimated_hours"],
+                "assignees": [self.users.get(user_id) for user_id in assignees.get(row["id"], [])],
+                "created_by": self.users.get(row["created_by_id"]),
+                "version": row["version"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+            })
+        return records
+
+    # -------------------------
+    # OUTPUT FORMATS
+    # -------------------------
+
+    def stream(self, output):
+        if output == "ndjson":
+            return self.stream_ndjson()
+        return self.stream_csv()
+
+    def stream_csv(self):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_COLUMNS)
+        for records in self.chunks():
+            yield "".join(
+                writer.writerow([_csv_value(record[column]) for column in EXPORT_COLUMNS])
+                for record in records
+            )
+
+    def stream_ndjson(self):
+        encoder = DjangoJSONEncoder()
+        for records in self.chunks():
+            yield "".join(encoder.encode(record) + "\n" for record in records)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
@@ -0,0 +1,366 @@
+"""
+core_api/importer.py
+
+Bulk task import from CSV, JSON or NDJSON.
+
+Used by POST /api/tasks/import/ and `manage.py import_tasks`.
+
+Columns (the same names /api/tasks/export/ writes; only `title` is required):
+    title, description, board (id or name), status (name on that board),
+    priority (P1-P4 or Critical/High/Normal/Low), blocked_reason,
+    due_date, start_date (ISO date or datetime), estimated_hours,
+    assignees (emails or usernames separated by ";"), workflow (name),
+    order
+
+Boards, statuses, users and workflows are loaded once into lookup dicts.
+Rows are validated and written in chunks. Each chunk gets, in one
+transaction:
+    - ref_ids pre-allocated in one go from core_api.refs (a chunk that
+      rolls back gives its freshly leased numbers back)
+    - one bulk_create each for Task, TaskAssignee and TaskHistory rows
+    - one TaskVisibility / search index sync
+Invalid rows are skipped and reported with their row number. Nothing is
+written in dry-run mode. Imports do not send notifications.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core_api.models import Board, BoardStatus, Task, TaskAssignee, TaskHistory
+from core_api.refs import allocate_task_refs
+from core_api.rollups import adjust_status_rollup, task_status_delta
+from core_api.search import index_tasks
+from core_api.visibility import sync_task_visibility
+from core_api.widget_cache import bump_data_version
+from users.models import User
+from workflows.models import Workflow
+from workflows.utils import get_default_workflow_for_tenant
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
+IMPORT_INPUTS = ("csv", "json", "ndjson")
+
+PRIORITY_ALIASES = {
+    **{value.lower(): value for value in Task.Priority.values},
+    **{label.lower(): value for value, label in Task.Priority.choices},
+}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def read_rows(stream, input_format):
+    """
+    Yields dict rows from a text stream. JSON input must be a list of
+    objects (it is parsed whole); CSV and NDJSON are read line by line.
+    """
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+    elif input_format == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise ImportFormatError(f"Line {line_number} is not valid JSON.")
+    elif input_format == "json":
+        try:
+            data = json.load(stream)
+        except ValueError:
+            raise ImportFormatError("File is not valid JSON.")
+        if not isinstance(data, list):
+            raise ImportFormatError("JSON input must be a list of task objects.")
+        yield from data
+    else:
+        raise ImportFormatError(f"Unsupported input format '{input_format}'.")
+
+
+def detect_input_format(filename, default="csv"):
+    extension = str(filename or "").rsplit(".", 1)[-1].lower()
+    return extension if extension in IMPORT_INPUTS else default
+
+
+def text_stream(binary_file):
+    return io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+
+
+class TaskImporter:
+
+    def __init__(self, *, tenant, user, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE):
+        self.tenant = tenant
+        self.user = user
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size
+        self.total = 0
+        self.valid = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self._build_lookups()
+
+    # -------------------------
+    # LOOKUPS (built once)
+    # -------------------------
+
+    def _build_lookups(self):
+        boards = list(
+            Board.objects.filter(tenant=self.tenant, is_deleted=False)
+            .select_related("section")
+            .order_by("order", "name")
+        )
+        self.boards_by_id = {board.id: board for board in boards}
+        self.boards_by_name = {}
+        for board in boards:
+            self.boards_by_name.setdefault(board.name.strip().lower(), board)
+        self.default_board = boards[0] if boards else None
+
+        self.statuses = {}
+        self.default_statuses = {}
+        for board_status in BoardStatus.objects.filter(board__in=boards).order_by("order"):
+            self.statuses.setdefault((board_status.board_id, board_status.name.strip().lower()), board_status)
+            if board_status.is_default:
+                self.default_statuses.setdefault(board_status.board_id, board_status)
+
+        self.users = {}
+        for user in User.objects.filter(tenant=self.tenant, is_active=True):
+            if user.email:
+                self.users.setdefault(user.email.strip().lower(), user)
+            self.users.setdefault(user.username.strip().lower(), user)
+
+        self.workflows = {}
+        self.first_stages = {}
+        for workflow in Workflow.objects.filter(tenant=self.tenant).prefetch_related("stages"):
+            self.workflows.setdefault(workflow.name.strip().lower(), workflow)
+            stages = sorted(workflow.stages.all(), key=lambda stage: stage.order)
+            self.first_stages[workflow.id] = stages[0] if stages else None
+        self.default_workflow = get_default_workflow_for_tenant(self.tenant)
+
+    # -------------------------
+    # ROW VALIDATION
+    # -------------------------
+
+    def _value(self, row, key):
+        value = row.get(key)
+        if value is None:
+            return ""
+        if isinstance(value, (list, int, float)):
+            return value
+        return str(value).strip()
+
+    def _parse_datetime(self, value):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            parsed_date = parse_date(value)
+            if parsed_date is None:
+                raise ValueError
+            parsed = datetime.combine(parsed_date, time.min)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def validate_row(self, row):
+        """Returns (task kwargs, assignee users) or raises ValueError with a field → message dict."""
+        if not isinstance(row, dict):
+            raise ValueError({"row": "Row must be an object."})
+
+        errors = {}
+        data = {}
+
+        title = str(self._value(row, "title"))
+        if not title:
+            errors["title"] = "Title cannot be empty."
+        elif len(title) > 255:
+            errors["title"] = "Title cannot exceed 255 characters."
+        data["title"] = title
+        data["description"] = str(self._value(row, "description"))
+
+        board_value = self._value(row, "board")
+        board = None
+        if board_value in ("", None):
+            board = self.default_board
+            if board is None:
+                errors["board"] = "Board is required. Create a board first."
+        elif str(board_value).isdigit():
+            board = self.boards_by_id.get(int(board_value))
+        else:
+            board = self.boards_by_name.get(str(board_value).lower())
+        if board is None and "board" not in errors:
+            errors["board"] = f"Unknown board '{board_value}'."
+        if board is not None:
+            division_id = board.division_id or (board.section.division_id if board.section_id else None)
+            if division_id is None:
+                errors["board"] = "Board must belong to a division."
+            data["board"] = board
+            data["division_id"] = division_id
+
+            status_name = str(self._value(row, "status")).lower()
+            if status_name:
+                status = self.statuses.get((board.id, status_name))
+                if status is None:
+                    errors["status"] = f"Status '{row.get('status')}' is not available on this board."
+            else:
+                status = self.default_statuses.get(board.id)
+            data["status"] = status
+
+        priority = str(self._value(row, "priority"))
+        if priority:
+            if priority.lower() not in PRIORITY_ALIASES:
+                errors["priority"] = f"\"{priority}\" is not a valid choice."
+            else:
+                data["priority"] = PRIORITY_ALIASES[priority.lower()]
+
+        blocked_reason = str(self._value(row, "blocked_reason"))
+        data["blocked_reason"] = blocked_reason or None
+        if data.get("status") is not None and data["status"].name == "Blocked" and not blocked_reason:
+            errors["blocked_reason"] = "A reason is required when blocking a task."
+
+        for field in ("due_date", "start_date"):
+            value = str(self._value(row, field))
+            if value:
+                try:
+                    data[field] = self._parse_datetime(value)
+                except ValueError:
+                    errors[field] = "Enter a valid ISO date or datetime."
+
+        estimated_hours = str(self._value(row, "estimated_hours"))
+        if estimated_hours:
+            try:
+                data["estimated_hours"] = Decimal(estimated_hours)
+                if data["estimated_hours"] < 0 or data["estimated_hours"] >= 10000:
+                    raise InvalidOperation
+            except InvalidOperation:
+                errors["estimated_hours"] = "Enter a number between 0 and 9999.99."
+
+        order = str(self._value(row, "order"))
+        if order:
+            if not order.isdigit():
+                errors["order"] = "order must be a non-negative integer."
+            else:
+                data["order"] = int(order)
+
+        workflow_name = str(self._value(row, "workflow")).lower()
+        workflow = self.workflows.get(workflow_name) if workflow_name else self.default_workflow
+        if workflow_name and workflow is None:
+            errors["workflow"] = f"Unknown workflow '{row.get('workflow')}'."
+        data["workflow"] = workflow
+        data["stage"] = self.first_stages.get(workflow.id) if workflow else None
+
+        assignee_values = self._value(row, "assignees")
+        if isinstance(assignee_values, str):
+            assignee_values = [value for value in assignee_values.split(";")]
+        assignees = []
+        unknown = []
+        for value in assignee_values or []:
+            key = str(value).strip().lower()
+            if not key:
+                continue
+            user = self.users.get(key)
+            if user is None:
+                unknown.append(str(value).strip())
+            elif user not in assignees:
+                assignees.append(user)
+        if unknown:
+            errors["assignees"] = f"Unknown users: {', '.join(unknown)}."
+
+        if errors:
+            raise ValueError(errors)
+        return data, assignees
+
+    # -------------------------
+    # IMPORT
+    # -------------------------
+
+    def run(self, rows):
+        rows = iter(enumerate(rows, start=1))
+        while True:
+            try:
+                chunk = list(islice(rows, self.chunk_size))
+            except (ImportFormatError, csv.Error) as exc:
+                # Unreadable input stops the import; chunks already written stay.
+                self._record_error(None, {"file": str(exc)})
+                break
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+        return self.report()
+
+    def _record_error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def _import_chunk(self, chunk):
+        valid = []
+        for row_number, row in chunk:
+            self.total += 1
+            try:
+                valid.append(self.validate_row(row))
+            except ValueError as exc:
+                self._record_error(row_number, exc.args[0])
+
+        self.valid += len(valid)
+        if self.dry_run or not valid:
+            return
+
+        with transaction.atomic():
+            refs = allocate_task_refs(self.tenant.id, len(valid))
+            tasks = Task.objects.bulk_create([
+                Task(
+                    tenant=self.tenant,
+                    ref_id=ref_id,
+                    created_by=self.user,
+                    updated_by=self.user,
+                    **data,
+                )
+                for ref_id, (data, _) in zip(refs, valid)
+            ])
+            TaskAssignee.objects.bulk_create([
+                TaskAssignee(task=task, user=user, assigned_by=self.user)
+                for task, (_, assignees) in zip(tasks, valid)
+                for user in assignees
+            ])
+            TaskHistory.objects.bulk_create([
+                TaskHistory(
+                    tenant=self.tenant,
+                    task=task,
+                    action=TaskHistory.Action.CREATED,
+                    performed_by=self.user,
+                    title=task.title,
+                    description=task.description,
+                    status_name=task.status.name if task.status else "",
+                    priority=task.priority,
+                    due_date=task.due_date,
+                )
+                for task in tasks
+            ])
+            # bulk_create() bypasses the Task/TaskAssignee signals.
+            task_ids = [task.id for task in tasks]
+            sync_task_visibility(task_ids)
+            index_tasks(task_ids)
+            rollup_deltas = {}
+            for task in tasks:
+                task_status_delta(rollup_deltas, task.status_id, False, +1)
+            adjust_status_rollup(self.tenant.id, rollup_deltas)
+            bump_data_version(self.tenant.id)
+        self.imported += len(tasks)
+
+    def report(self):
+        return {
+            "dry_run": self.dry_run,
+            "total": self.total,
+            "valid": self.valid,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
@@ -0,0 +1,140 @@
+"""
+core_api/kanban.py
+
+Column data for GET /api/boards/{id}/kanban/.
+
+A board renders as one column per BoardStatus (ordered by BoardStatus.order),
+each with its total task count and the first `limit` tasks in
+(order, -created_at, id) order. Regardless of the number of columns the
+response costs a fixed number of queries:
+
+    1. per-status counts        GROUP BY status_id
+    2. first N tasks per column ROW_NUMBER() OVER (PARTITION BY status_id ...)
+    3. serializer prefetches    (see TaskSerializer.setup_eager_loading)
+
+Each column carries its own `next` link. Following it
+(?status=<id>&cursor=<cursor>) returns just that column's next page,
+fetched with the same keyset filter as TaskCursorPagination.
+"""
+
+from django.db.models import Count, F
+from django.db.models.functions import RowNumber
+from django.db.models.expressions import Window
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+from core_api.pagination import (
+    TASK_KEYSET_ORDERING,
+    decode_cursor,
+    encode_cursor,
+    task_keyset_filter,
+    task_position,
+)
+from core_api.serializers import BoardStatusSerializer, TaskSerializer
+
+KANBAN_DEFAULT_LIMIT = 20
+KANBAN_MAX_LIMIT = 100
+
+
+def kanban_limit(request):
+    try:
+        limit = int(request.query_params.get("limit", KANBAN_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        return KANBAN_DEFAULT_LIMIT
+    if limit <= 0:
+        return KANBAN_DEFAULT_LIMIT
+    return min(limit, KANBAN_MAX_LIMIT)
+
+
+def _keyset_order_by():
+    return [
+        F(name[1:]).desc() if name.startswith("-") else F(name).asc()
+        for name in TASK_KEYSET_ORDERING
+    ]
+
+
+class KanbanBoard:
+
+    def __init__(self, board, tasks, request):
+        """
+        board   — Board with statuses prefetched
+        tasks   — role-scoped Task queryset already limited to the board
+        """
+        self.board = board
+        self.tasks = tasks
+        self.request = request
+        self.limit = kanban_limit(request)
+        self.base_url = request.build_absolute_uri()
+
+    def columns(self):
+        statuses = sorted(self.board.statuses.all(), key=lambda s: (s.order, s.id))
+        counts = dict(
+            self.tasks.order_by()
+            .values("status_id")
+            .annotate(total=Count("id"))
+            .values_list("status_id", "total")
+        )
+
+        ranked = self.tasks.annotate(
+            column_rank=Window(
+                expression=RowNumber(),
+                partition_by=[F("status_id")],
+                order_by=_keyset_order_by(),
+            )
+        ).filter(column_rank__lte=self.limit + 1)
+        ranked = TaskSerializer.setup_eager_loading(ranked).order_by(
+            "status_id", *TASK_KEYSET_ORDERING
+        )
+
+        by_status = {}
+        for task in ranked:
+            by_status.setdefault(task.status_id, []).append(task)
+
+        return [
+            self._column(board_status, counts.get(board_status.id, 0), by_status.get(board_status.id, []))
+            for board_status in statuses
+        ]
+
+    def column_page(self, status_id, encoded_cursor):
+        board_status = next(
+            (s for s in self.board.statuses.all() if s.id == status_id),
+            None,
+        )
+        if board_status is None:
+            raise NotFound("Status not found on this board.")
+
+        tasks = self.tasks.filter(status_id=status_id)
+        if encoded_cursor:
+            # Same 400 as the task list's cursor pagination.
+            invalid = ValidationError({"cursor": ["Invalid cursor"]})
+            position = decode_cursor(encoded_cursor)
+            if position is None:
+                raise invalid
+            try:
+                tasks = tasks.filter(task_keyset_filter(position))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                raise invalid
+
+        page = list(
+            TaskSerializer.setup_eager_loading(tasks)
+            .order_by(*TASK_KEYSET_ORDERING)[: self.limit + 1]
+        )
+        count = self.tasks.filter(status_id=status_id).count()
+        return [self._column(board_status, count, page)]
+
+    def _column(self, board_status, count, tasks):
+        has_more = len(tasks) > self.limit
+        tasks = tasks[: self.limit]
+        next_link = None
+        if has_more:
+            next_link = replace_query_param(
+                replace_query_param(self.base_url, "status", board_status.id),
+                "cursor",
+                encode_cursor(task_position(tasks[-1])),
+            )
+        return {
+            "status": BoardStatusSerializer(board_status).data,
+            "count": count,
+            "next": next_link,
+            "tasks": TaskSerializer(tasks, many=True, context={"request": self.request}).data,
+        }
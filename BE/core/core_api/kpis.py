@@ -0,0 +1,73 @@
+"""
+core_api/kpis.py
+
+Task KPIs for AdminDashboardView and DashboardWidgetsView.
+
+Everything comes from one per-status breakdown: either a single
+GROUP BY status query over the tenant's live tasks, or, with
+settings.TASK_STATUS_ROLLUP on, the tenant's TaskStatusRollup rows
+(O(statuses), see core_api/rollups.py). Totals, "In Progress",
+"Blocked", done and the per-name status overview are summed from it in
+Python. Statuses are per board, so names repeat and are merged.
+"""
+
+from django.db.models import Count
+
+from core_api.models import Task, TaskStatusRollup
+from core_api.rollups import rebuild_status_rollup, status_rollup_enabled
+
+BREAKDOWN_FIELDS = ("status_id", "status__name", "status__is_terminal", "status__is_cancelled")
+
+
+def _row(status_id, name, is_terminal, is_cancelled, count):
+    return {
+        "status_id": status_id,
+        "name": name,
+        "is_terminal": bool(is_terminal),
+        "is_cancelled": bool(is_cancelled),
+        "count": count,
+    }
+
+
+def status_breakdown(tenant_id):
+    """[{status_id, name, is_terminal, is_cancelled, count}] for live tasks."""
+    if status_rollup_enabled():
+        rollups = TaskStatusRollup.objects.filter(tenant_id=tenant_id)
+        rows = list(rollups.values_list(*BREAKDOWN_FIELDS, "task_count"))
+        if not rows:
+            # Never built. The rebuild leaves at least its status NULL row,
+            # so a tenant without tasks does not land here again.
+            rebuild_status_rollup(tenant_id)
+            rows = list(rollups.values_list(*BREAKDOWN_FIELDS, "task_count"))
+    else:
+        rows = list(
+            Task.objects.filter(tenant_id=tenant_id, is_deleted=False)
+            .order_by()
+            .values_list(*BREAKDOWN_FIELDS)
+            .annotate(count=Count("id"))
+        )
+    return [_row(*row) for row in rows if row[-1]]
+
+
+def summarize(breakdown):
+    total = active = blocked = done = 0
+    by_name = {}
+    for row in breakdown:
+        count = row["count"]
+        name = row["name"]
+        total += count
+        if name and name.lower() == "in progress":
+            active += count
+        if name and name.lower() == "blocked":
+            blocked += count
+        if row["is_terminal"] and not row["is_cancelled"]:
+            done += count
+        by_name[name] = by_name.get(name, 0) + count
+    return {
+        "total": total,
+        "active": active,
+        "blocked": blocked,
+        "done": done,
+        "completion_rate": round((done / total) * 100, 1) if total else 0,
+        "by_name": by_name,
+    }
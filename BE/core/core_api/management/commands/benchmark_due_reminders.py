@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from core_api.benchmarks import (
+    benchmark_environment,
+    measure,
+    scratch_tenant,
+    seed_board,
+    seed_tasks,
+    seed_users,
+)
+from core_api.models import Notification, Task, TaskReminder
+from core_api.reminders import REMINDER_BATCH_SIZE, DueReminderScan
+
+
+class Command(BaseCommand):
+    help = (
+        "Time send_due_reminders scans of a seeded scratch tenant (rolled back "
+        "afterwards) whose due dates spread over +/- --days: a first run that "
+        "sends, then an idempotent re-run. Reports time and queries per size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            nargs="+",
+            default=[10000, 100000],
+            help="Tenant sizes to measure, ascending (e.g. --tasks 100000 1000000).",
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=REMINDER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        sizes = options["tasks"]
+        if sizes != sorted(sizes) or sizes[0] <= 0:
+            raise CommandError("--tasks must be positive and ascending.")
+        spread = timedelta(days=max(1, options["days"]))
+
+        with benchmark_environment(), scratch_tenant() as tenant:
+            users = seed_users(tenant, max(1, options["users"]))
+            board = seed_board(tenant)
+            tasks = Task.objects.filter(tenant=tenant)
+
+            self.stdout.write(
+                "   tasks  due soon  first run ms  queries  reminders  re-run ms  queries  reminders"
+            )
+            seeded = 0
+            for size in sizes:
+                last_id = tasks.order_by("-id").values_list("id", flat=True).first() or 0
+                seeded += seed_tasks(tenant, board, size - seeded, users, due_spread=spread * 2)
+                # seed_tasks spreads due dates forward from now; centre the
+                # new ones on now instead.
+                tasks.filter(id__gt=last_id).update(due_date=F("due_date") - spread)
+                # Each size starts with nothing sent.
+                TaskReminder.objects.filter(tenant=tenant).delete()
+                Notification.objects.filter(tenant=tenant).delete()
+
+                first, first_stats = measure(lambda: self._scan(tenant, options["batch_size"]))
+                again, again_stats = measure(lambda: self._scan(tenant, options["batch_size"]))
+                self.stdout.write(
+                    f"{size:>8}  {first['tasks']:>8}  {first_stats['seconds'] * 1000:12.1f}  "
+                    f"{first_stats['queries']:>7}  {first['reminders']:>9}  "
+                    f"{again_stats['seconds'] * 1000:9.1f}  {again_stats['queries']:>7}  {again['reminders']:>9}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done; scratch tenant rolled back."))
+
+    def _scan(self, tenant, batch_size):
+        return DueReminderScan(batch_size=max(1, batch_size)).run([tenant.id])
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+from django.utils import timezone
+
+from core_api.benchmarks import (
+    benchmark_environment,
+    latency_ms,
+    measure,
+    scratch_tenant,
+    seed_notifications,
+    seed_users,
+)
+from core_api.models import Notification, OrganizationProfile
+from core_api.retention import NotificationPruner, users_over_cap
+from core_api.tests.helpers import api_client
+
+SAMPLE_USERS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Age a seeded scratch tenant's notifications round by round (rolled back "
+        "afterwards) and report GET /api/notifications/ latency before and after "
+        "each prune_notifications pass, with prune throughput. The seeded rows are "
+        "never vacuumed, so the walk's index-only probes still visit the heap; "
+        "expect it to run faster on a live table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument(
+            "--per-round",
+            type=int,
+            default=300,
+            help="Notifications added per user each round.",
+        )
+        parser.add_argument("--rounds", type=int, default=4)
+        parser.add_argument("--days-per-round", type=int, default=30)
+        parser.add_argument("--retention-days", type=int, default=60)
+        parser.add_argument("--keep-per-user", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=200, help="List requests per measurement.")
+
+    def handle(self, *args, **options):
+        with benchmark_environment(), scratch_tenant() as tenant:
+            OrganizationProfile.objects.filter(tenant=tenant).update(
+                notification_retention_days=options["retention_days"],
+                notification_keep_per_user=options["keep_per_user"],
+            )
+            users = seed_users(tenant, max(1, options["users"]))
+            clients = [api_client(user) for user in users[:SAMPLE_USERS]]
+            notifications = Notification.objects.filter(tenant=tenant)
+
+            self.stdout.write(
+                "round  rows before  list p50/p95 ms  over-cap scan ms (GROUP BY / walk)  "
+                "pruned  rows/s  rows after  list p50/p95 ms"
+            )
+            for round_number in range(1, options["rounds"] + 1):
+                # Everything already there gets a round older.
+                notifications.update(
+                    created_at=F("created_at") - timedelta(days=options["days_per_round"])
+                )
+                seed_notifications(tenant, users, options["per_round"], timezone.now())
+
+                rows_before = notifications.count()
+                before = self._list_latency(clients, options["repeat"])
+                _, group_by = measure(lambda: self._over_cap_group_by(tenant, options["keep_per_user"]))
+                _, walk = measure(lambda: list(users_over_cap(tenant, options["keep_per_user"])))
+
+                report, _ = measure(lambda: NotificationPruner().prune_tenant(tenant))
+                after = self._list_latency(clients, options["repeat"])
+                self.stdout.write(
+                    f"{round_number:>5}  {rows_before:>11}  {before['p50']:7.2f}/{before['p95']:<7.2f}  "
+                    f"{group_by['seconds'] * 1000:16.1f} / {walk['seconds'] * 1000:<16.1f}  "
+                    f"{report['expired'] + report['over_cap']:>6}  {report['rows_per_second']:6.0f}  "
+                    f"{notifications.count():>10}  {after['p50']:7.2f}/{after['p95']:.2f}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done; scratch tenant rolled back."))
+
+    def _list_latency(self, clients, repeat):
+        requests = iter(range(repeat))
+        return latency_ms(
+            lambda: clients[next(requests) % len(clients)].get("/api/notifications/", {"limit": 20}),
+            repeat,
+        )
+
+    def _over_cap_group_by(self, tenant, keep_per_user):
+        # How NotificationPruner found users over the cap before: an
+        # aggregate over every notification of the tenant.
+        return list(
+            Notification.objects.filter(tenant=tenant)
+            .order_by()
+            .values("user_id")
+            .annotate(n=Count("id"))
+            .filter(n__gt=keep_per_user)
+            .values_list("user_id", flat=True)
+        )
@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core_api.benchmarks import (
+    benchmark_environment,
+    measure,
+    scratch_tenant,
+    seed_board,
+    seed_tasks,
+    seed_users,
+)
+from core_api.tests.helpers import api_client
+from users.models import Role
+
+PAGE_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare GET /api/tasks/export/ with paging GET /api/tasks/?page_size=100 "
+        "on a seeded scratch tenant (rolled back afterwards): time, queries, peak memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            nargs="+",
+            default=[10000, 50000],
+            help="Tenant sizes to measure, ascending (e.g. --tasks 10000 100000 500000).",
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--output", choices=["csv", "ndjson"], default="csv")
+        parser.add_argument(
+            "--skip-paging",
+            type=int,
+            default=10000,
+            help="Do not page through /api/tasks/ above this many tasks (it is slow).",
+        )
+
+    def handle(self, *args, **options):
+        sizes = options["tasks"]
+        if sizes != sorted(sizes) or sizes[0] <= 0:
+            raise CommandError("--tasks must be positive and ascending.")
+
+        with benchmark_environment(), scratch_tenant() as tenant:
+            users = seed_users(tenant, max(1, options["users"]))
+            admin = seed_users(tenant, 1, role_name=Role.ADMIN, prefix="admin")[0]
+            board = seed_board(tenant)
+            client = api_client(admin, Role.ADMIN)
+
+            seeded = 0
+            for size in sizes:
+                self.stdout.write(f"Seeding {size - seeded} task(s)...")
+                seeded += seed_tasks(tenant, board, size - seeded, users)
+
+                export = lambda: self._export(client, options["output"])
+                _, timing = measure(export)
+                exported, memory = measure(export, memory=True)
+                self._report(size, "export", timing, memory, f"{exported / (1024 * 1024):.1f} MB streamed")
+
+                if size > options["skip_paging"]:
+                    continue
+                _, timing = measure(lambda: self._page(client))
+                pages, memory = measure(lambda: self._page(client), memory=True)
+                self._report(size, "paging", timing, memory, f"{pages} page(s)")
+
+        self.stdout.write(self.style.SUCCESS("Done; scratch tenant rolled back."))
+
+    def _export(self, client, output):
+        response = client.get("/api/tasks/export/", {"output": output, "include_terminal": "true"})
+        if response.status_code != 200:
+            raise CommandError(f"Export failed with {response.status_code}.")
+        return sum(len(part) for part in response.streaming_content)
+
+    def _page(self, client):
+        page = 1
+        while True:
+            response = client.get(
+                "/api/tasks/", {"page_size": PAGE_SIZE, "page": page, "include_terminal": "true"}
+            )
+            if response.status_code != 200:
+                raise CommandError(f"Task list failed with {response.status_code}.")
+            if not response.json().get("next"):
+                return page
+            page += 1
+
+    def _report(self, size, path, timing, memory, detail):
+        self.stdout.write(
+            f"{size:>8} tasks  {path:<7} {timing['seconds']:8.2f}s  "
+            f"{timing['queries']:>6} queries  peak {memory['peak_mb']:7.1f} MB  ({detail})"
+        )
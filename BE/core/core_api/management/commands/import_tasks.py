@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from context.models import Tenant
+from core_api.importer import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_INPUTS,
+    TaskImporter,
+    detect_input_format,
+    read_rows,
+)
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Import tasks for a tenant from a CSV, JSON or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument("--tenant", required=True, help="Tenant slug.")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username or email recorded as creator of the imported tasks.",
+        )
+        parser.add_argument(
+            "--input",
+            choices=IMPORT_INPUTS,
+            help="Input format. Defaults to the file extension, then csv.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate every row and report errors without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(slug=options["tenant"]).first()
+        if tenant is None:
+            raise CommandError(f"Tenant '{options['tenant']}' not found.")
+
+        user = (
+            User.objects.filter(tenant=tenant, username=options["user"]).first()
+            or User.objects.filter(tenant=tenant, email__iexact=options["user"]).first()
+        )
+        if user is None:
+            raise CommandError(f"User '{options['user']}' not found in tenant '{tenant.slug}'.")
+
+        input_format = options["input"] or detect_input_format(options["path"])
+        importer = TaskImporter(
+            tenant=tenant,
+            user=user,
+            dry_run=options["dry_run"],
+            chunk_size=max(1, options["chunk_size"]),
+        )
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as handle:
+                report = importer.run(read_rows(handle, input_format))
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if report["errors_truncated"]:
+            self.stderr.write(f"... {report['failed'] - len(report['errors'])} more error(s) not shown.")
+
+        verb = "Validated" if report["dry_run"] else "Imported"
+        count = report["valid"] if report["dry_run"] else report["imported"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {count} of {report['total']} row(s); {report['failed']} failed."
+            )
+        )
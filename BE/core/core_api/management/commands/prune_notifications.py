@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from context.models import Tenant
+from core_api.retention import PRUNE_BATCH_SIZE, NotificationPruner
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete (and optionally archive) read notifications past their tenant's "
+        "retention policy. Safe to interrupt; the next run continues."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to prune. Defaults to every tenant.",
+        )
+        parser.add_argument("--batch-size", type=int, default=PRUNE_BATCH_SIZE)
+        parser.add_argument(
+            "--archive-dir",
+            help="Append deleted rows to gzipped NDJSON files in this directory first.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument(
+            "--max-seconds",
+            type=float,
+            help="Stop after this long; a later run picks up the rest.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count what would be removed without deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all().order_by("id")
+        if options["tenant"]:
+            tenants = tenants.filter(slug=options["tenant"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+
+        pruner = NotificationPruner(
+            batch_size=max(1, options["batch_size"]),
+            archive_dir=options["archive_dir"],
+            dry_run=options["dry_run"],
+            pause=max(0.0, options["pause"]),
+            deadline=(
+                time.monotonic() + options["max_seconds"]
+                if options["max_seconds"] is not None
+                else None
+            ),
+        )
+
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        total = 0
+        started = time.monotonic()
+        for tenant in tenants:
+            if pruner.out_of_time():
+                break
+            report = pruner.prune_tenant(tenant)
+            removed = report["expired"] + report["over_cap"]
+            total += removed
+            if removed:
+                self.stdout.write(
+                    f"{report['tenant']}: {verb.lower()} {removed} "
+                    f"({report['expired']} expired, {report['over_cap']} over cap) "
+                    f"in {report['seconds']:.1f}s, {report['rows_per_second']:.0f} rows/s"
+                )
+
+        seconds = time.monotonic() - started
+        rate = total / seconds if seconds > 0 else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {total} notification(s) in {seconds:.1f}s ({rate:.0f} rows/s)."
+            )
+        )
+        if pruner.stopped_early:
+            self.stdout.write(self.style.WARNING("Stopped at --max-seconds; run again to continue."))
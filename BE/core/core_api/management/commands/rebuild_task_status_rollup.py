@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from context.models import Tenant
+from core_api.rollups import rebuild_status_rollup
+
+
+class Command(BaseCommand):
+    help = "Recount the TaskStatusRollup rows behind the dashboard KPIs (settings.TASK_STATUS_ROLLUP)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to rebuild. Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all().order_by("id")
+        if options["tenant"]:
+            tenants = tenants.filter(slug=options["tenant"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+
+        counted_tasks = 0
+        for tenant in tenants:
+            counted_tasks += rebuild_status_rollup(tenant.id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task status rollups for {counted_tasks} task(s).")
+        )
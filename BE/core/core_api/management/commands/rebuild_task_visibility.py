@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from context.models import Tenant
+from core_api.visibility import rebuild_tenant_visibility
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized TaskVisibility rows used for role-scoped task lists."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to rebuild. Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all().order_by("id")
+        if options["tenant"]:
+            tenants = tenants.filter(slug=options["tenant"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+
+        processed_tasks = 0
+        for tenant in tenants:
+            processed_tasks += rebuild_tenant_visibility(tenant.id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task visibility for {processed_tasks} task(s).")
+        )
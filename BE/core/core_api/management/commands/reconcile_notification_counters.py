@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from context.models import Tenant
+from core_api.notification_counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recount unread notifications and repair NotificationCounter rows that drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to reconcile. Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = None
+        if options["tenant"]:
+            tenant = Tenant.objects.filter(slug=options["tenant"]).first()
+            if tenant is None:
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+            tenant_id = tenant.id
+
+        repaired = reconcile_counters(tenant_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired {repaired} notification counter(s).")
+        )
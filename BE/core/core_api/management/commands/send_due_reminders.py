@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from context.models import Tenant
+from core_api.reminders import REMINDER_BATCH_SIZE, DueReminderScan, reminder_windows, window_label
+
+
+class Command(BaseCommand):
+    help = (
+        "Send TASK_DUE_SOON notifications for tasks entering a reminder window "
+        "(settings.TASK_DUE_REMINDER_WINDOWS). Safe to re-run; each reminder is sent once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to scan. Defaults to every active tenant.",
+        )
+        parser.add_argument("--batch-size", type=int, default=REMINDER_BATCH_SIZE)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, scanning every --interval seconds.",
+        )
+        parser.add_argument("--interval", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.filter(status="active").order_by("id")
+        if options["tenant"]:
+            tenants = Tenant.objects.filter(slug=options["tenant"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+
+        windows = reminder_windows()
+        if not windows:
+            raise CommandError("TASK_DUE_REMINDER_WINDOWS is empty.")
+        self.stdout.write(f"Reminder windows: {', '.join(window_label(m) for m in windows)}.")
+
+        while True:
+            report = DueReminderScan(batch_size=max(1, options["batch_size"])).run(
+                list(tenants.values_list("id", flat=True))
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Scanned {report['tasks']} task(s) due soon, sent {report['reminders']} "
+                    f"reminder(s) in {report['seconds']:.2f}s."
+                )
+            )
+            if not options["loop"]:
+                return
+            close_old_connections()
+            try:
+                time.sleep(max(1.0, options["interval"]))
+            except KeyboardInterrupt:
+                return
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from context.models import Tenant
+from core_api.digests import digest_users, send_digest
+
+
+class Command(BaseCommand):
+    help = "Fold unread notifications into one DIGEST per user who opted into digests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to process. Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = None
+        if options["tenant"]:
+            tenant = Tenant.objects.filter(slug=options["tenant"]).first()
+            if tenant is None:
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+            tenant_id = tenant.id
+
+        now = timezone.now()
+        sent = folded = 0
+        for user in digest_users(tenant_id).iterator():
+            digest = send_digest(user, now=now)
+            if digest is not None:
+                sent += 1
+                folded += digest.event_count
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Sent {sent} digest(s) covering {folded} event(s).")
+        )
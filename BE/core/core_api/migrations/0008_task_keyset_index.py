@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+        ('core_api', '0007_notification'),
+        ('workflows', '0003_workflowstage_workflowstatus_color'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['tenant', 'order', '-created_at', 'id'], name='core_api_ta_tenant__242aba_idx'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_task_visibility(apps, schema_editor):
+    """Mirrors core_api.visibility.build_visibility_rows using historical models."""
+    Task = apps.get_model("core_api", "Task")
+    TaskAssignee = apps.get_model("core_api", "TaskAssignee")
+    TaskVisibility = apps.get_model("core_api", "TaskVisibility")
+
+    batch_size = 500
+    last_id = 0
+    while True:
+        tasks = list(
+            Task.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "tenant_id", "created_by_id", "is_deleted")[:batch_size]
+        )
+        if not tasks:
+            break
+        task_ids = [task[0] for task in tasks]
+        assignees_by_task = {}
+        for task_id, user_id in TaskAssignee.objects.filter(task_id__in=task_ids).values_list("task_id", "user_id"):
+            assignees_by_task.setdefault(task_id, set()).add(user_id)
+
+        rows = []
+        for task_id, tenant_id, created_by_id, is_deleted in tasks:
+            assignee_ids = assignees_by_task.get(task_id, set())
+            for user_id in sorted(assignee_ids):
+                rows.append(TaskVisibility(
+                    tenant_id=tenant_id, task_id=task_id, user_id=user_id,
+                    scope="RECEIVER", is_deleted=is_deleted,
+                ))
+            if not assignee_ids and created_by_id is None:
+                rows.append(TaskVisibility(
+                    tenant_id=tenant_id, task_id=task_id, user_id=None,
+                    scope="RECEIVER", is_deleted=is_deleted,
+                ))
+            rows.append(TaskVisibility(
+                tenant_id=tenant_id, task_id=task_id, user_id=created_by_id,
+                scope="CREATOR", is_deleted=is_deleted,
+            ))
+        TaskVisibility.objects.bulk_create(rows, batch_size=batch_size)
+        last_id = task_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+        ('core_api', '0008_task_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskVisibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('RECEIVER', 'Task Receiver'), ('CREATOR', 'Task Creator')], max_length=16)),
+                ('is_deleted', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='taskvisibility',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibility', to='core_api.task'),
+        ),
+        migrations.AddField(
+            model_name='taskvisibility',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_visibility', to='context.tenant'),
+        ),
+        migrations.AddField(
+            model_name='taskvisibility',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_visibility', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='taskvisibility',
+            index=models.Index(fields=['tenant', 'scope', 'user', 'is_deleted', 'task'], name='core_api_ta_tenant__dd8da6_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskvisibility',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('task', 'scope', 'user'), name='uniq_task_visibility_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskvisibility',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('task', 'scope'), name='uniq_task_visibility_shared'),
+        ),
+        migrations.RunPython(backfill_task_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-18 07:05
+
+from django.db import migrations
+
+
+SEARCH_TABLE = "core_api_task_search"
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(row[0] == "ENABLE_FTS5" for row in cursor.fetchall())
+
+
+def create_task_search(apps, schema_editor):
+    """
+    Creates and backfills the full-text index table used by core_api/search.py.
+    Backends without full-text support get no table (search falls back to icontains).
+    """
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE {SEARCH_TABLE} ("
+            "task_id bigint PRIMARY KEY REFERENCES core_api_task (id) ON DELETE CASCADE, "
+            "tenant_id uuid NOT NULL, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX core_api_task_search_doc_idx ON {SEARCH_TABLE} USING GIN (document)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX core_api_task_search_tenant_idx ON {SEARCH_TABLE} (tenant_id)"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (task_id, tenant_id, document) "
+            "SELECT id, tenant_id, "
+            "setweight(to_tsvector('simple', ref_id), 'A') || "
+            "setweight(to_tsvector('english', title), 'A') || "
+            "setweight(to_tsvector('english', description), 'B') "
+            "FROM core_api_task WHERE NOT is_deleted"
+        )
+    elif connection.vendor == "sqlite" and sqlite_has_fts5(connection):
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "tenant_id UNINDEXED, ref_id, title, description, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, tenant_id, ref_id, title, description) "
+            "SELECT id, tenant_id, ref_id, title, description "
+            "FROM core_api_task WHERE is_deleted = 0"
+        )
+
+
+def drop_task_search(apps, schema_editor):
+    if schema_editor.connection.vendor in {"postgresql", "sqlite"}:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0009_task_visibility'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_task_search, drop_task_search),
+    ]
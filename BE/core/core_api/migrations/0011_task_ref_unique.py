@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+        ('core_api', '0010_task_search'),
+        ('workflows', '0003_workflowstage_workflowstatus_color'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('ref_id', ''), _negated=True), fields=('tenant', 'ref_id'), name='uniq_task_ref_per_tenant'),
+        ),
+    ]
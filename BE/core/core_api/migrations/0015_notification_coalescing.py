@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0014_notification_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='event_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('TASK_ASSIGNED', 'Task Assigned'), ('TASK_STATUS_CHANGED', 'Task Status Changed'), ('TASK_PROOF_SUBMITTED', 'Task Proof Submitted'), ('TASK_COMPLETED', 'Task Completed'), ('DIGEST', 'Digest')], max_length=32),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-18 07:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+        ('core_api', '0015_notification_coalescing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_minutes', models.PositiveIntegerField()),
+                ('due_date', models.DateTimeField()),
+                ('sent_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('TASK_ASSIGNED', 'Task Assigned'), ('TASK_STATUS_CHANGED', 'Task Status Changed'), ('TASK_PROOF_SUBMITTED', 'Task Proof Submitted'), ('TASK_COMPLETED', 'Task Completed'), ('TASK_DUE_SOON', 'Task Due Soon'), ('DIGEST', 'Digest')], max_length=32),
+        ),
+        migrations.AddField(
+            model_name='taskreminder',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='core_api.task'),
+        ),
+        migrations.AddField(
+            model_name='taskreminder',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_reminders', to='context.tenant'),
+        ),
+        migrations.AddField(
+            model_name='taskreminder',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_reminders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='taskreminder',
+            constraint=models.UniqueConstraint(fields=('task', 'user', 'window_minutes', 'due_date'), name='uniq_task_reminder'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-18 07:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+        ('core_api', '0016_task_reminder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='taskstatusrollup',
+            name='status',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='core_api.boardstatus'),
+        ),
+        migrations.AddField(
+            model_name='taskstatusrollup',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_status_rollups', to='context.tenant'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskstatusrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__isnull', False)), fields=('tenant', 'status'), name='uniq_task_status_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskstatusrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__isnull', True)), fields=('tenant',), name='uniq_task_status_rollup_unassigned'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:30
+
+from django.db import migrations
+
+
+SEARCH_TABLE = "core_api_task_search"
+
+
+def reindex_documents(apps, schema_editor):
+    """
+    Rebuilds the PostgreSQL documents so ref ids are indexed as the terms
+    core_api/search.py queries for ("ACME-00042" -> 'acme', '00042').
+    SQLite's FTS5 tokenizer already splits on punctuation.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"UPDATE {SEARCH_TABLE} AS s SET document = "
+        "setweight(to_tsvector('simple', regexp_replace(t.ref_id, '[^[:alnum:]]+', ' ', 'g')), 'A') || "
+        "setweight(to_tsvector('english', t.title), 'A') || "
+        "setweight(to_tsvector('english', t.description), 'B') "
+        "FROM core_api_task AS t WHERE t.id = s.task_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0018_task_history_feed_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_documents, migrations.RunPython.noop),
+    ]
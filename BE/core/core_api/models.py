@@ -76,7 +76,8 @@ class OrganizationProfile(models.Model):
         primary_key=True,
     )
 
-    # Atomic per-tenant counter. TAS-1, TAS-2, TAS-3...
+    # Per-tenant high-water mark for TAS-1, TAS-2, TAS-3...
+    # Numbers are leased in blocks by core_api.refs, so refs may have gaps.
     task_sequence = models.PositiveIntegerField(default=0)
 
     plan = models.CharField(
@@ -90,6 +91,11 @@ class OrganizationProfile(models.Model):
         ],
     )
 
+    # Overrides for the plan's settings.NOTIFICATION_RETENTION entry
+    # (see core_api.retention). Empty means "use the plan's value".
+    notification_retention_days = models.PositiveIntegerField(null=True, blank=True)
+    notification_keep_per_user = models.PositiveIntegerField(null=True, blank=True)
+
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -98,18 +104,21 @@ class OrganizationProfile(models.Model):
     def __str__(self):
         return f"{self.tenant.name} ({self.plan})"
 
-    def next_task_ref(self):
+    @classmethod
+    def lease_task_refs(cls, tenant_id, size, using=None):
         """
-        Atomically increments task_sequence and returns the new value.
-        Must be called inside a transaction with select_for_update on self.
+        Reserves `size` consecutive ref numbers and returns (first, last).
+        The row lock is held only for this UPDATE (or until the caller's
+        transaction ends when called inside one).
 
-        Called automatically in Task.save() — do not call manually.
+        Called by core_api.refs — use allocate_task_refs() instead.
         """
-        OrganizationProfile.objects.filter(pk=self.pk).update(
-            task_sequence=models.F("task_sequence") + 1
-        )
-        self.refresh_from_db(fields=["task_sequence"])
-        return self.task_sequence
+        queryset = cls.objects.using(using).filter(pk=tenant_id)
+        with transaction.atomic(using=using):
+            if not queryset.update(task_sequence=models.F("task_sequence") + size):
+                raise cls.DoesNotExist(f"No OrganizationProfile for tenant {tenant_id}.")
+            last = queryset.values_list("task_sequence", flat=True).get()
+        return last - size + 1, last
 
 
 # =============================================================================
@@ -557,8 +566,54 @@ class Task(models.Model):
             models.Index(fields=["division"]),
             models.Index(fields=["board", "order"]),
             models.Index(fields=["parent"]),
+            # Keyset pagination key — see core_api.pagination.TaskCursorPagination.
+            models.Index(fields=["tenant", "order", "-created_at", "id"]),
+            # Delta sync key — see core_api.changes.TaskChangeFeed.
+            models.Index(fields=["tenant", "updated_at", "id"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "ref_id"],
+                condition=~models.Q(ref_id=""),
+                name="uniq_task_ref_per_tenant",
+            ),
         ]
 
+    # Fields that denormalized tables (e.g. TaskVisibility) derive from.
+    # Their values at load time are kept so signal handlers can tell
+    # whether a save actually changed them.
+    TRACKED_FIELDS = ("created_by_id", "is_deleted", "ref_id", "title", "description", "status_id")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def snapshot_tracked_fields(self):
+        self._loaded_values = {
+            name: self.__dict__[name]
+            for name in self.TRACKED_FIELDS
+            if name in self.__dict__
+        }
+
+    def loaded_value(self, name):
+        """Value of a TRACKED_FIELDS entry as loaded (None if unknown)."""
+        return getattr(self, "_loaded_values", {}).get(name)
+
+    def tracked_fields_changed(self, *names):
+        """
+        True if any of `names` (default: all TRACKED_FIELDS) differs from
+        the value loaded from the database. Unknown state counts as changed.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return True
+        for name in names or self.TRACKED_FIELDS:
+            if name not in loaded or loaded[name] != self.__dict__.get(name):
+                return True
+        return False
+
     def save(self, *args, **kwargs):
         # Keep task division aligned with the selected board.
         if self.board_id:
@@ -568,11 +623,9 @@ class Task(models.Model):
             self.division_id = board_division_id
 
         if not self.ref_id and self.tenant_id:
-            with transaction.atomic():
-                profile = OrganizationProfile.objects.select_for_update().get(
-                    tenant_id=self.tenant_id
-                )
-                self.ref_id = f"TAS-{profile.next_task_ref()}"
+            from core_api.refs import allocate_task_refs
+
+            self.ref_id = allocate_task_refs(self.tenant_id)[0]
         super().save(*args, **kwargs)
 
     @property
@@ -612,6 +665,67 @@ class TaskAssignee(models.Model):
         return f"{self.user} on [{self.task.ref_id}]"
 
 
+# =============================================================================
+# TASK VISIBILITY
+# Denormalized (tenant, user, task) rows behind role-scoped task lists, so
+# TASK_RECEIVER / TASK_CREATOR scoping is one indexed join without DISTINCT.
+# Maintained by core_api.visibility — do not write to it directly.
+#
+#   RECEIVER  one row per assignee; a shared row (user=NULL) for legacy
+#             orphaned tasks with no creator and no assignees.
+#   CREATOR   one row for the creator; a shared row when created_by is empty.
+#
+# is_deleted mirrors Task.is_deleted so scans can skip soft-deleted tasks
+# without touching the task table.
+# Rebuild with: python manage.py rebuild_task_visibility
+# =============================================================================
+
+class TaskVisibility(models.Model):
+
+    class Scope(models.TextChoices):
+        RECEIVER = "RECEIVER", "Task Receiver"
+        CREATOR  = "CREATOR",  "Task Creator"
+
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="task_visibility",
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="visibility",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name="task_visibility",
+    )
+    scope = models.CharField(max_length=16, choices=Scope.choices)
+    is_deleted = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "scope", "user"],
+                condition=models.Q(user__isnull=False),
+                name="uniq_task_visibility_per_user",
+            ),
+            models.UniqueConstraint(
+                fields=["task", "scope"],
+                condition=models.Q(user__isnull=True),
+                name="uniq_task_visibility_shared",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["tenant", "scope", "user", "is_deleted", "task"]),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.user_id or '*'} → [{self.task_id}]"
+
+
 # =============================================================================
 # TASK DEPENDENCY
 # Blocking relationships. Used for Gantt chart critical path rendering.
@@ -753,8 +867,22 @@ class TaskHistory(models.Model):
         indexes = [
             models.Index(fields=["tenant", "task"]),
             models.Index(fields=["timestamp"]),
+            # Activity feed: newest first per tenant (core_api/activity.py).
+            models.Index(fields=["tenant", "-timestamp", "-id"], name="task_history_feed_idx"),
         ]
 
+    @classmethod
+    def action_for_status_change(cls, old_status_name, new_status_name):
+        """Classifies a status move for the audit log (review cycle vs plain update)."""
+        if old_status_name != new_status_name:
+            if old_status_name == "In Progress" and new_status_name == "In Review":
+                return cls.Action.SUBMITTED
+            if old_status_name == "In Review" and new_status_name == "Done":
+                return cls.Action.APPROVED
+            if old_status_name == "In Review" and new_status_name == "In Progress":
+                return cls.Action.REJECTED
+        return cls.Action.UPDATED
+
     def save(self, *args, **kwargs):
         if self.pk:
             raise ValueError("TaskHistory records are immutable.")
@@ -868,6 +996,8 @@ class Notification(models.Model):
         TASK_STATUS_CHANGED = "TASK_STATUS_CHANGED", "Task Status Changed"
         TASK_PROOF_SUBMITTED = "TASK_PROOF_SUBMITTED", "Task Proof Submitted"
         TASK_COMPLETED = "TASK_COMPLETED", "Task Completed"
+        TASK_DUE_SOON = "TASK_DUE_SOON", "Task Due Soon"
+        DIGEST = "DIGEST", "Digest"
 
     tenant = models.ForeignKey(
         Tenant,
@@ -898,6 +1028,9 @@ class Notification(models.Model):
     body = models.CharField(max_length=255, blank=True)
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
+    # Events merged into this row (see core_api.notifications.coalesce).
+    # created_at moves to the latest one, title/body show its state.
+    event_count = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -905,11 +1038,124 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=["tenant", "user", "is_read"]),
             models.Index(fields=["tenant", "user", "-created_at"]),
+            # Retention scans (core_api.retention) only look at read rows.
+            models.Index(
+                fields=["tenant", "created_at"],
+                condition=models.Q(is_read=True),
+                name="notification_read_age_idx",
+            ),
         ]
 
     def __str__(self):
         return f"{self.user_id}:{self.kind}:{self.title}"
 
 
+# =============================================================================
+# NOTIFICATION COUNTER
+# Unread notification count per user, so polls read one row instead of
+# running COUNT(*). Maintained by core_api.notification_counters — do not
+# write to it directly. Created lazily on first read or first notification.
+# Repair drift with: python manage.py reconcile_notification_counters
+# =============================================================================
+
+class NotificationCounter(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="notification_counters",
+    )
+    unread = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+# =============================================================================
+# TASK STATUS ROLLUP
+# Live (not soft-deleted) task count per (tenant, status), so dashboards
+# read O(statuses) rows instead of grouping every task. Only maintained
+# and read when settings.TASK_STATUS_ROLLUP is on; see core_api.rollups.
+# status=NULL counts tasks without a status.
+# Rebuild with: python manage.py rebuild_task_status_rollup
+# =============================================================================
+
+class TaskStatusRollup(models.Model):
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="task_status_rollups",
+    )
+    status = models.ForeignKey(
+        BoardStatus,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name="rollups",
+    )
+    task_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "status"],
+                condition=models.Q(status__isnull=False),
+                name="uniq_task_status_rollup",
+            ),
+            models.UniqueConstraint(
+                fields=["tenant"],
+                condition=models.Q(status__isnull=True),
+                name="uniq_task_status_rollup_unassigned",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant_id} / {self.status_id or '-'}: {self.task_count}"
+
+
+# =============================================================================
+# TASK REMINDER
+# One row per due-date reminder sent, written by core_api.reminders. The
+# unique key includes due_date, so moving a task's due date re-arms its
+# reminders while re-running the scheduler never sends one twice.
+# =============================================================================
+
+class TaskReminder(models.Model):
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="task_reminders",
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="reminders",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="task_reminders",
+    )
+    window_minutes = models.PositiveIntegerField()
+    due_date = models.DateTimeField()
+    sent_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "user", "window_minutes", "due_date"],
+                name="uniq_task_reminder",
+            ),
+        ]
+
+    def __str__(self):
+        return f"[{self.task_id}] {self.user_id} {self.window_minutes}m before {self.due_date}"
+
+
 # Semantic alias for per-board task statuses.
 TaskStatus = BoardStatus
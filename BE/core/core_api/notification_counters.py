@@ -0,0 +1,187 @@
+"""
+core_api/notification_counters.py
+
+Maintenance and reads of NotificationCounter, the per-user unread count
+behind notifications_list and GET /api/notifications/unread-count/.
+
+Every path that changes a notification's unread state goes through here:
+    new notifications      increment_unread()   (notifications.save_notifications)
+    mark one / all read    decrement_unread()   with the number of rows the
+                                                conditional UPDATE actually flipped
+
+lock_counters() doubles as the per-recipient lock for coalescing
+(notifications.coalesce), so concurrent notifies queue on the counter
+rows rather than on the recipients' User rows, which logins and profile
+writes also update.
+
+Increments and decrements are F() updates, so concurrent writers do not
+lose counts. A missing counter row is created from a real COUNT(*), which
+is also how existing users are backfilled.
+
+Reads can additionally go through Django's cache when
+NOTIFICATION_UNREAD_CACHE_SECONDS > 0. Writes delete the cached value
+once their transaction commits. Only enable it with a cache shared by
+all workers (e.g. Redis); a per-process LocMemCache would serve other
+workers' stale values until they expire.
+
+Counts can still drift when notifications disappear outside these paths
+(e.g. a task hard delete cascading to its notifications);
+reconcile_counters() repairs that.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from core_api.models import Notification, NotificationCounter
+
+
+def _cache_seconds():
+    return int(getattr(settings, "NOTIFICATION_UNREAD_CACHE_SECONDS", 0))
+
+
+def _cache_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def _invalidate(user_ids):
+    if _cache_seconds() > 0:
+        keys = [_cache_key(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _actual_unread(user_ids):
+    """{user_id: unread} counted from the notification table."""
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        Notification.objects.filter(user_id__in=user_ids, is_read=False)
+        .order_by()
+        .values_list("user_id")
+        .annotate(n=Count("id"))
+    )
+    return counts
+
+
+def _create_counters(tenant_by_user):
+    """Creates missing counter rows from a real count; existing rows win."""
+    counts = _actual_unread(list(tenant_by_user))
+    NotificationCounter.objects.bulk_create(
+        [
+            NotificationCounter(user_id=user_id, tenant_id=tenant_id, unread=counts[user_id])
+            for user_id, tenant_id in tenant_by_user.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def lock_counters(tenant_by_user):
+    """
+    Locks the counter rows of {user_id: tenant_id} until the transaction
+    ends, creating missing ones first. Locked in user_id order so
+    overlapping recipient sets cannot deadlock.
+    """
+    counters = NotificationCounter.objects.order_by("user_id").select_for_update()
+    locked = set(counters.filter(user_id__in=tenant_by_user).values_list("user_id", flat=True))
+    missing = {user_id: tenant_id for user_id, tenant_id in tenant_by_user.items() if user_id not in locked}
+    if missing:
+        # A concurrent creator makes this insert wait for its commit.
+        _create_counters(missing)
+        list(counters.filter(user_id__in=missing).values_list("user_id", flat=True))
+
+
+def unread_count(user):
+    seconds = _cache_seconds()
+    if seconds > 0:
+        cached = cache.get(_cache_key(user.id))
+        if cached is not None:
+            return cached
+
+    unread = (
+        NotificationCounter.objects.filter(user_id=user.id)
+        .values_list("unread", flat=True)
+        .first()
+    )
+    if unread is None:
+        _create_counters({user.id: user.tenant_id})
+        unread = NotificationCounter.objects.get(user_id=user.id).unread
+
+    if seconds > 0:
+        cache.set(_cache_key(user.id), unread, seconds)
+    return unread
+
+
+def increment_unread(notifications):
+    """Counts freshly inserted unread notifications against their recipients."""
+    per_user = Counter(n.user_id for n in notifications if not n.is_read)
+    if not per_user:
+        return
+    tenant_by_user = {n.user_id: n.tenant_id for n in notifications}
+
+    by_amount = {}
+    for user_id, amount in per_user.items():
+        by_amount.setdefault(amount, []).append(user_id)
+    missing = {}
+    for amount, user_ids in by_amount.items():
+        counters = NotificationCounter.objects.filter(user_id__in=user_ids)
+        if counters.update(unread=F("unread") + amount) < len(user_ids):
+            existing = set(counters.values_list("user_id", flat=True))
+            missing.update(
+                (user_id, tenant_by_user[user_id]) for user_id in user_ids if user_id not in existing
+            )
+
+    # New rows are counted after the insert, so they already include it.
+    if missing:
+        _create_counters(missing)
+    _invalidate(per_user)
+
+
+def decrement_unread(user_id, amount):
+    if amount <= 0:
+        return
+    NotificationCounter.objects.filter(user_id=user_id).update(
+        unread=Greatest(F("unread") - amount, 0)
+    )
+    _invalidate([user_id])
+
+
+def reconcile_counters(tenant_id=None):
+    """
+    Rewrites every counter that disagrees with the notification table and
+    creates missing ones. Returns the number of rows repaired.
+    """
+    counters = NotificationCounter.objects.all()
+    unread_rows = Notification.objects.filter(is_read=False)
+    if tenant_id is not None:
+        counters = counters.filter(tenant_id=tenant_id)
+        unread_rows = unread_rows.filter(tenant_id=tenant_id)
+
+    stored = dict(counters.values_list("user_id", "unread"))
+    actual = {}
+    tenant_by_user = {}
+    for user_id, user_tenant_id, unread in (
+        unread_rows.order_by().values_list("user_id", "tenant_id").annotate(n=Count("id"))
+    ):
+        actual[user_id] = unread
+        tenant_by_user[user_id] = user_tenant_id
+
+    repaired = []
+    for user_id, unread in stored.items():
+        expected = actual.get(user_id, 0)
+        # Only rewrite if nothing moved the counter meanwhile.
+        if unread != expected and NotificationCounter.objects.filter(
+            user_id=user_id,
+            unread=unread,
+        ).update(unread=expected):
+            repaired.append(user_id)
+
+    missing = {user_id: tenant_by_user[user_id] for user_id in actual if user_id not in stored}
+    if missing:
+        _create_counters(missing)
+        repaired.extend(missing)
+
+    _invalidate(repaired)
+    return len(repaired)
@@ -1,6 +1,38 @@
+"""
+core_api/notifications.py
+
+In-app notifications for task activity.
+
+The build_* helpers turn one event into unsaved Notification rows, one per
+recipient, skipping recipients that opted out (the notify_* flags are read
+off the User rows the caller already loaded, see task_recipients()).
+save_notifications() writes them with one bulk_create. With
+NOTIFICATIONS_DEFER_TO_COMMIT on, the insert waits for the request's
+transaction to commit, so a task update with a long assignee list only
+queues the rows instead of holding its locks through the INSERT.
+
+Bursts are coalesced: a new notification for the same (user, task, kind)
+as an unread one from the last NOTIFICATION_COALESCE_SECONDS is merged
+into it instead of inserted. The existing row takes the new title, body
+and actor, its event_count grows and created_at moves to now, so a task
+dragged through five statuses in a minute leaves one unread row saying
+"moved TAS-7 from Review to Done" with event_count=5. Concurrent notifies
+for the same recipients queue on their NotificationCounter rows, so the
+second one sees (and merges into) the row the first one inserted.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
 from users.models import User
 
+from core_api.events import publish_notifications
 from core_api.models import Notification, Task
+from core_api.notification_counters import increment_unread, lock_counters
 
 
 def _full_name(user):
@@ -10,13 +42,14 @@ def _full_name(user):
     return full_name or user.email or user.username or "Someone"
 
 
-def create_notification(*, recipient, actor, task, kind, title, body=""):
+def build_notification(*, recipient, actor, task, kind, title, body=""):
+    """Unsaved Notification, or None when the recipient should not get one."""
     if not recipient or not recipient.is_active:
         return None
     if actor and recipient.id == actor.id:
         return None
-    return Notification.objects.create(
-        tenant=recipient.tenant,
+    return Notification(
+        tenant_id=recipient.tenant_id,
         user=recipient,
         actor=actor,
         task=task,
@@ -26,61 +59,241 @@ def create_notification(*, recipient, actor, task, kind, title, body=""):
     )
 
 
-def notify_task_assigned(*, task: Task, actor: User, recipients):
+def create_notification(*, recipient, actor, task, kind, title, body=""):
+    notification = build_notification(
+        recipient=recipient,
+        actor=actor,
+        task=task,
+        kind=kind,
+        title=title,
+        body=body,
+    )
+    if notification is not None:
+        save_notifications([notification])
+    return notification
+
+
+def task_recipients(task: Task, assignees, *, include_creator=True):
+    """
+    Distinct recipients for a task event: the given assignees plus the
+    creator. The creator is only fetched when they are not already among
+    the assignees.
+    """
+    recipients_by_id = {user.id: user for user in assignees}
+    if include_creator and task.created_by_id and task.created_by_id not in recipients_by_id:
+        creator = task.created_by
+        if creator is not None:
+            recipients_by_id[creator.id] = creator
+    return list(recipients_by_id.values())
+
+
+# =============================================================================
+# BUILDERS
+# Return unsaved Notification rows so callers touching many tasks at once
+# (e.g. the bulk task endpoint) can insert them with one bulk_create.
+# =============================================================================
+
+def build_task_assigned(*, task: Task, actor: User, recipients):
     actor_name = _full_name(actor)
+    notifications = []
     for recipient in recipients:
         if not getattr(recipient, "notify_task_assigned", True):
             continue
-        create_notification(
+        notifications.append(build_notification(
             recipient=recipient,
             actor=actor,
             task=task,
             kind=Notification.Kind.TASK_ASSIGNED,
             title=f"Assigned: {task.title}",
             body=f"{actor_name} assigned you to {task.ref_id}.",
-        )
+        ))
+    return [n for n in notifications if n is not None]
 
 
-def notify_status_changed(*, task: Task, actor: User, from_status: str, to_status: str, recipients):
+def build_status_changed(*, task: Task, actor: User, from_status: str, to_status: str, recipients):
     actor_name = _full_name(actor)
+    notifications = []
     for recipient in recipients:
         if not getattr(recipient, "notify_task_status_changed", True):
             continue
-        create_notification(
+        notifications.append(build_notification(
             recipient=recipient,
             actor=actor,
             task=task,
             kind=Notification.Kind.TASK_STATUS_CHANGED,
             title=f"Status changed: {task.title}",
             body=f"{actor_name} moved {task.ref_id} from {from_status or 'Unknown'} to {to_status or 'Unknown'}.",
-        )
+        ))
+    return [n for n in notifications if n is not None]
 
 
-def notify_proof_submitted(*, task: Task, actor: User, recipients):
+def build_proof_submitted(*, task: Task, actor: User, recipients):
     actor_name = _full_name(actor)
+    notifications = []
     for recipient in recipients:
         if not getattr(recipient, "notify_proof_submitted", True):
             continue
-        create_notification(
+        notifications.append(build_notification(
             recipient=recipient,
             actor=actor,
             task=task,
             kind=Notification.Kind.TASK_PROOF_SUBMITTED,
             title=f"Proof submitted: {task.title}",
             body=f"{actor_name} submitted proof on {task.ref_id}.",
-        )
+        ))
+    return [n for n in notifications if n is not None]
 
 
-def notify_task_completed(*, task: Task, actor: User, recipients):
+def build_task_completed(*, task: Task, actor: User, recipients):
     actor_name = _full_name(actor)
+    notifications = []
     for recipient in recipients:
         if not getattr(recipient, "notify_task_status_changed", True):
             continue
-        create_notification(
+        notifications.append(build_notification(
             recipient=recipient,
             actor=actor,
             task=task,
             kind=Notification.Kind.TASK_COMPLETED,
             title=f"Task completed: {task.title}",
             body=f"{actor_name} marked {task.ref_id} as done.",
-        )
+        ))
+    return [n for n in notifications if n is not None]
+
+
+def build_task_due_soon(*, task: Task, recipients, within: str):
+    """Reminders have no actor; `within` reads e.g. "1 hour"."""
+    notifications = []
+    for recipient in recipients:
+        if not getattr(recipient, "notify_due_reminder", True):
+            continue
+        notifications.append(build_notification(
+            recipient=recipient,
+            actor=None,
+            task=task,
+            kind=Notification.Kind.TASK_DUE_SOON,
+            title=f"Due soon: {task.title}",
+            body=f"{task.ref_id} is due within {within}.",
+        ))
+    return [n for n in notifications if n is not None]
+
+
+# =============================================================================
+# NOTIFY
+# =============================================================================
+
+COALESCED_FIELDS = ["actor", "title", "body", "event_count", "created_at"]
+
+
+def coalesce(notifications):
+    """
+    Splits unsaved notifications into (new rows to insert, existing unread
+    rows they were merged into). Duplicates within the batch collapse too.
+    Must run inside a transaction: the recipients' counters and the rows
+    merged into are locked until it ends.
+    """
+    window = int(getattr(settings, "NOTIFICATION_COALESCE_SECONDS", 0))
+    if window <= 0:
+        return notifications, []
+
+    unkeyed, latest = [], {}
+    for notification in notifications:
+        if notification.task_id is None:
+            unkeyed.append(notification)
+            continue
+        key = (notification.user_id, notification.task_id, notification.kind)
+        earlier = latest.get(key)
+        if earlier is not None:
+            notification.event_count += earlier.event_count
+        latest[key] = notification
+    if not latest:
+        return unkeyed, []
+
+    # Serialise notifies per recipient: without a row to lock, two that both
+    # find nothing to merge into would both insert.
+    lock_counters({n.user_id: n.tenant_id for n in latest.values()})
+
+    now = timezone.now()
+    existing = {}
+    candidates = Notification.objects.filter(
+        tenant_id__in={n.tenant_id for n in latest.values()},
+        user_id__in={key[0] for key in latest},
+        task_id__in={key[1] for key in latest},
+        kind__in={key[2] for key in latest},
+        is_read=False,
+        created_at__gte=now - timedelta(seconds=window),
+    ).order_by("created_at", "id").select_for_update()
+    for row in candidates:
+        existing[(row.user_id, row.task_id, row.kind)] = row
+
+    fresh, merged = unkeyed, []
+    for key, notification in latest.items():
+        row = existing.get(key)
+        if row is None:
+            fresh.append(notification)
+            continue
+        row.actor_id = notification.actor_id
+        row.title = notification.title
+        row.body = notification.body
+        row.event_count = F("event_count") + notification.event_count
+        row.created_at = now
+        merged.append(row)
+    return fresh, merged
+
+
+def _insert(notifications):
+    with transaction.atomic():
+        notifications, merged = coalesce(notifications)
+        notifications = Notification.objects.bulk_create(notifications)
+        increment_unread(notifications)
+        if merged:
+            # Merged rows were and stay unread, so the counters don't move.
+            Notification.objects.bulk_update(merged, COALESCED_FIELDS)
+            counts = dict(
+                Notification.objects.filter(id__in=[row.id for row in merged])
+                .values_list("id", "event_count")
+            )
+            for row in merged:
+                row.event_count = counts[row.id]
+    publish_notifications(notifications)
+    publish_notifications(merged, action="updated")
+
+
+def save_notifications(notifications):
+    """
+    Coalesces the rows into recent unread ones where possible, inserts the
+    rest with one bulk_create and publishes both. Deferred to
+    transaction commit when NOTIFICATIONS_DEFER_TO_COMMIT is set; a failed
+    deferred insert is logged rather than failing the committed request.
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return notifications
+    connection = transaction.get_connection()
+    if getattr(settings, "NOTIFICATIONS_DEFER_TO_COMMIT", False) and connection.in_atomic_block:
+        transaction.on_commit(lambda: _insert(notifications), robust=True)
+    else:
+        _insert(notifications)
+    return notifications
+
+
+def notify_task_assigned(*, task: Task, actor: User, recipients):
+    return save_notifications(build_task_assigned(task=task, actor=actor, recipients=recipients))
+
+
+def notify_status_changed(*, task: Task, actor: User, from_status: str, to_status: str, recipients):
+    return save_notifications(build_status_changed(
+        task=task,
+        actor=actor,
+        from_status=from_status,
+        to_status=to_status,
+        recipients=recipients,
+    ))
+
+
+def notify_proof_submitted(*, task: Task, actor: User, recipients):
+    return save_notifications(build_proof_submitted(task=task, actor=actor, recipients=recipients))
+
+
+def notify_task_completed(*, task: Task, actor: User, recipients):
+    return save_notifications(build_task_completed(task=task, actor=actor, recipients=recipients))
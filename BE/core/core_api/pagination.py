@@ -1,5 +1,12 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+import base64
+import json
 import math
 
 
@@ -21,3 +28,301 @@ class TaskPagination(PageNumberPagination):
             "previous": self.get_previous_link(),
             "results": data,
         })
+
+
+# =============================================================================
+# KEYSET CURSORS
+# Opaque cursors over the task list ordering (order, -created_at, id).
+# The id tie-breaker makes the ordering total, so a position is unambiguous
+# and a page never needs an OFFSET.
+# =============================================================================
+
+TASK_KEYSET_ORDERING = ("order", "-created_at", "id")
+TASK_KEYSET_REVERSE_ORDERING = ("-order", "created_at", "-id")
+
+
+def encode_cursor(position):
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value):
+    """Returns the position dict stored in a cursor, or None if it is malformed."""
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(position, dict):
+        return None
+    return position
+
+
+# Cursor numbers go straight into SQL; keep them within a signed 64-bit
+# column so a forged cursor cannot overflow the driver.
+MAX_CURSOR_INT = 2 ** 63 - 1
+
+
+def cursor_int(value):
+    if isinstance(value, bool):
+        raise TypeError("Invalid cursor number.")
+    number = int(value)
+    if abs(number) > MAX_CURSOR_INT:
+        raise ValueError("Cursor number out of range.")
+    return number
+
+
+def task_position(task, reverse=False):
+    return {
+        "o": task.order,
+        "c": task.created_at.isoformat(),
+        "i": task.id,
+        "r": reverse,
+    }
+
+
+def task_keyset_filter(position, reverse=False):
+    """
+    Q matching tasks strictly after `position` in (order, -created_at, id)
+    ordering, or strictly before it when `reverse` is set.
+    Raises ValueError when the position is incomplete.
+    """
+    order = cursor_int(position["o"])
+    created_at = parse_datetime(str(position["c"]))
+    task_id = cursor_int(position["i"])
+    if created_at is None:
+        raise ValueError("Invalid cursor timestamp.")
+
+    if reverse:
+        return (
+            Q(order__lt=order)
+            | Q(order=order, created_at__gt=created_at)
+            | Q(order=order, created_at=created_at, id__lt=task_id)
+        )
+    return (
+        Q(order__gt=order)
+        | Q(order=order, created_at__lt=created_at)
+        | Q(order=order, created_at=created_at, id__gt=task_id)
+    )
+
+
+def estimate_count(queryset, cap=10000):
+    """
+    Cheap row count for large result sets.
+    PostgreSQL: planner estimate from EXPLAIN (no rows are scanned).
+    Other backends: exact count capped at `cap`.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return queryset[:cap].count()
+
+
+class TaskCursorPagination(BasePagination):
+    """
+    Keyset pagination for the task list.
+
+    Query params:
+        cursor     — opaque cursor from a previous next/previous link
+        page_size  — same bounds as TaskPagination
+        count      — "none" (default), "estimate" or "exact"
+
+    Pages are fetched with a WHERE on the (order, -created_at, id) keys
+    instead of OFFSET, and the total COUNT is skipped unless asked for.
+    """
+
+    page_size = TaskPagination.page_size
+    page_size_query_param = TaskPagination.page_size_query_param
+    max_page_size = TaskPagination.max_page_size
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    count_modes = {"none", "estimate", "exact"}
+    estimate_cap = 10000
+    invalid_cursor_message = "Invalid cursor"
+
+    def invalid_cursor(self):
+        return ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_count_mode(self, request):
+        mode = str(request.query_params.get(self.count_query_param, "none")).strip().lower()
+        return mode if mode in self.count_modes else "none"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        position = None
+        reverse = False
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            position = decode_cursor(encoded)
+            if position is None:
+                raise self.invalid_cursor()
+            reverse = bool(position.get("r"))
+
+        self.count = None
+        self.count_is_estimate = False
+        count_mode = self.get_count_mode(request)
+        if count_mode == "exact":
+            self.count = queryset.count()
+        elif count_mode == "estimate":
+            self.count = estimate_count(queryset, cap=self.estimate_cap)
+            self.count_is_estimate = True
+
+        if position is not None:
+            try:
+                queryset = queryset.filter(task_keyset_filter(position, reverse=reverse))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                raise self.invalid_cursor()
+
+        ordering = TASK_KEYSET_REVERSE_ORDERING if reverse else TASK_KEYSET_ORDERING
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def _build_link(self, task, reverse):
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            encode_cursor(task_position(task, reverse=reverse)),
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._build_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "count_is_estimate": self.count_is_estimate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+
+# =============================================================================
+# FORWARD-ONLY KEYSET CURSORS
+# For feeds and directories that only page onwards: a next link and no
+# previous one. Pages are lists of dicts (QuerySet.values()).
+# =============================================================================
+
+class ForwardCursorPagination(TaskCursorPagination):
+    """
+    Subclasses set `ordering` and implement position(row) and
+    keyset_filter(position), the Q for rows strictly after `position`
+    (raising ValueError / KeyError / TypeError / OverflowError when it is
+    malformed).
+
+    Query params:
+        cursor     — opaque cursor from a previous next link
+        page_size  — same bounds as TaskPagination
+    """
+
+    ordering = ("id",)
+
+    def position(self, row):
+        raise NotImplementedError
+
+    def keyset_filter(self, position):
+        raise NotImplementedError
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            position = decode_cursor(encoded)
+            if position is None:
+                raise self.invalid_cursor()
+            try:
+                queryset = queryset.filter(self.keyset_filter(position))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                raise self.invalid_cursor()
+
+        results = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            encode_cursor(self.position(self.page[-1])),
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+
+# Activity feed: newest first on (-timestamp, -id), matching
+# task_history_feed_idx.
+ACTIVITY_KEYSET_ORDERING = ("-timestamp", "-id")
+
+
+class ActivityCursorPagination(ForwardCursorPagination):
+    ordering = ACTIVITY_KEYSET_ORDERING
+
+    def position(self, row):
+        return {"t": row["timestamp"].isoformat(), "i": row["id"]}
+
+    def keyset_filter(self, position):
+        timestamp = parse_datetime(str(position["t"]))
+        history_id = cursor_int(position["i"])
+        if timestamp is None:
+            raise ValueError("Invalid cursor timestamp.")
+        return Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=history_id)
+
+
+class UserDirectoryCursorPagination(ForwardCursorPagination):
+    ordering = ("id",)
+
+    def position(self, row):
+        return {"i": row["id"]}
+
+    def keyset_filter(self, position):
+        return Q(id__gt=cursor_int(position["i"]))
@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission
 from users.models import Role
-from users.utils import is_admin, user_has_role
+from users.roles import get_role_context
 
 
 class IsAdminRole(BasePermission):
@@ -14,30 +14,29 @@ class IsAdminRole(BasePermission):
         if not hasattr(user, "tenant_id") or not user.tenant_id:
             return False
 
-        return user.user_roles.filter(
-            tenant_id=user.tenant_id,
-            role__name__iexact=Role.ADMIN,
-        ).exists()
+        return get_role_context(request).is_admin
     
 class TaskPermission(BasePermission):
 
     def has_permission(self, request, view):
-        if is_admin(request.user):
+        role_context = get_role_context(request)
+        if role_context.is_admin:
             return True
 
         if view.action == "create":
-            return user_has_role(request.user, Role.TASK_CREATOR)
+            return role_context.has_role(Role.TASK_CREATOR)
 
         return True
 
     def has_object_permission(self, request, view, obj):
-        if is_admin(request.user):
+        if get_role_context(request).is_admin:
             return True
 
         if obj.created_by_id == request.user.id:
             return True
 
-        if obj.assignees.filter(id=request.user.id).exists():
+        # Uses the prefetched assignees when the task came from the list queryset.
+        if any(assignee.id == request.user.id for assignee in obj.assignees.all()):
             return True
 
         return False
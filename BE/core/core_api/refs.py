@@ -0,0 +1,105 @@
+"""
+core_api/refs.py
+
+Task ref allocation (TAS-123) from leased number blocks.
+
+OrganizationProfile.task_sequence is the high-water mark of numbers handed
+out for a tenant. Instead of locking that row for every task, a process
+leases TASK_REF_LEASE_SIZE numbers at a time with one UPDATE and serves
+refs from the block in memory. Numbers left in a block when the process
+exits are never used, so refs can have gaps; they are never reused.
+
+Leased blocks are committed immediately and shared by all threads of the
+process. Inside an atomic block nothing can be committed early, so a
+transaction first draws from the shared blocks and leases only its
+shortfall, exactly, as part of its own transaction. Rolling back undoes
+that bump too, and no numbers leased by an uncommitted transaction are
+ever kept in memory, so nothing needs to track whether it is still open.
+The row lock from that UPDATE is held until the transaction ends, as it
+was before blocks existed.
+"""
+
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core_api.models import OrganizationProfile
+
+TASK_REF_PREFIX = "TAS-"
+
+
+def format_task_ref(number):
+    return f"{TASK_REF_PREFIX}{number}"
+
+
+def lease_size():
+    return max(1, int(getattr(settings, "TASK_REF_LEASE_SIZE", 100)))
+
+
+class _Block:
+
+    def __init__(self, first, last):
+        self.next = first
+        self.last = last
+
+    @property
+    def remaining(self):
+        return self.last - self.next + 1
+
+    def take(self, count):
+        count = min(count, self.remaining)
+        numbers = list(range(self.next, self.next + count))
+        self.next += count
+        return numbers
+
+
+class TaskRefAllocator:
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self._lock = threading.Lock()
+        self._shared = {}  # tenant_id -> committed _Block
+
+    def allocate(self, tenant_id, count=1):
+        """Returns `count` unused ref numbers for the tenant, in ascending order."""
+        numbers = self._take_shared(tenant_id, count)
+        while len(numbers) < count:
+            needed = count - len(numbers)
+            if connections[self.using].in_atomic_block:
+                first, last = OrganizationProfile.lease_task_refs(tenant_id, needed, using=self.using)
+                numbers.extend(range(first, last + 1))
+            else:
+                self._lease(tenant_id, max(lease_size(), needed))
+                numbers.extend(self._take_shared(tenant_id, needed))
+        return numbers
+
+    def _take_shared(self, tenant_id, count):
+        with self._lock:
+            block = self._shared.get(tenant_id)
+            if block is None:
+                return []
+            numbers = block.take(count)
+            if not block.remaining:
+                del self._shared[tenant_id]
+            return numbers
+
+    def _lease(self, tenant_id, size):
+        first, last = OrganizationProfile.lease_task_refs(tenant_id, size, using=self.using)
+        block = _Block(first, last)
+        with self._lock:
+            current = self._shared.get(tenant_id)
+            if current is None or current.remaining < block.remaining:
+                self._shared[tenant_id] = block
+
+    def reset(self):
+        with self._lock:
+            self._shared.clear()
+
+
+allocator = TaskRefAllocator()
+
+
+def allocate_task_refs(tenant_id, count=1):
+    """Formatted refs ("TAS-42") for `count` new tasks of the tenant."""
+    return [format_task_ref(number) for number in allocator.allocate(tenant_id, count)]
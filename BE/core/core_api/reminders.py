@@ -0,0 +1,168 @@
+"""
+core_api/reminders.py
+
+Due-date reminders, sent by `manage.py send_due_reminders` (once, or with
+--loop as a long-running process; no broker needed).
+
+settings.TASK_DUE_REMINDER_WINDOWS lists minutes before due_date, e.g.
+[1440, 60] for "a day before" and "an hour before". Each run, per tenant:
+
+    1. walks tasks with now < due_date <= now + widest window in
+       (due_date, id) keyset batches on the (tenant, due_date) index, so
+       the cost follows the number of tasks due soon, not the table size
+    2. skips deleted tasks and tasks in a terminal status or stage
+    3. picks the narrowest window each task falls in; a task due in 30
+       minutes gets the 1-hour reminder only
+    4. records TaskReminder rows (ignore_conflicts on their unique key) and
+       writes TASK_DUE_SOON notifications only for rows this run inserted
+
+Reminders go to assignees with notify_due_reminder on, or to the creator
+when the task has no assignees. A TaskReminder for a narrower window
+suppresses the wider ones, so a late run never sends "due within a day"
+after "due within an hour". Because TaskReminder rows are keyed by
+due_date, changing a task's due date re-arms its reminders.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core_api.models import BoardStatus, Task, TaskAssignee, TaskReminder
+from core_api.notifications import build_task_due_soon, save_notifications
+from users.models import User
+from workflows.models import WorkflowStage
+
+REMINDER_BATCH_SIZE = 1000
+
+
+def reminder_windows():
+    return sorted({int(m) for m in getattr(settings, "TASK_DUE_REMINDER_WINDOWS", [1440, 60]) if int(m) > 0})
+
+
+def window_label(minutes):
+    if minutes % 1440 == 0:
+        amount, unit = minutes // 1440, "day"
+    elif minutes % 60 == 0:
+        amount, unit = minutes // 60, "hour"
+    else:
+        amount, unit = minutes, "minute"
+    return f"{amount} {unit}{'s' if amount != 1 else ''}"
+
+
+class DueReminderScan:
+
+    def __init__(self, *, batch_size=REMINDER_BATCH_SIZE, now=None):
+        self.batch_size = batch_size
+        self.now = now or timezone.now()
+        self.windows = reminder_windows()
+
+    def run(self, tenant_ids):
+        report = {"tasks": 0, "reminders": 0, "seconds": 0.0}
+        if not self.windows:
+            return report
+        started = time.monotonic()
+        for tenant_id in tenant_ids:
+            for tasks in self.batches(tenant_id):
+                report["tasks"] += len(tasks)
+                report["reminders"] += self.send(tenant_id, tasks)
+        report["seconds"] = time.monotonic() - started
+        return report
+
+    def due_soon(self, tenant_id):
+        horizon = self.now + timedelta(minutes=self.windows[-1])
+        return (
+            Task.objects.filter(
+                tenant_id=tenant_id,
+                due_date__gt=self.now,
+                due_date__lte=horizon,
+                is_deleted=False,
+            )
+            .exclude(status__in=BoardStatus.objects.filter(board__tenant_id=tenant_id, is_terminal=True))
+            .exclude(stage__in=WorkflowStage.objects.filter(workflow__tenant_id=tenant_id, is_terminal=True))
+        )
+
+    def batches(self, tenant_id):
+        tasks = self.due_soon(tenant_id).only("id", "tenant_id", "ref_id", "title", "due_date", "created_by_id")
+        last = None
+        while True:
+            page = tasks
+            if last is not None:
+                page = page.filter(Q(due_date__gt=last[0]) | Q(due_date=last[0], id__gt=last[1]))
+            page = list(page.order_by("due_date", "id")[: self.batch_size])
+            if not page:
+                return
+            yield page
+            if len(page) < self.batch_size:
+                return
+            last = (page[-1].due_date, page[-1].id)
+
+    def window_for(self, task):
+        remaining = task.due_date - self.now
+        for minutes in self.windows:
+            if remaining <= timedelta(minutes=minutes):
+                return minutes
+        return None
+
+    def recipients(self, tasks):
+        """{task_id: [User]} — assignees, or the creator for unassigned tasks."""
+        by_task = {task.id: [] for task in tasks}
+        for assignment in TaskAssignee.objects.filter(task_id__in=by_task).select_related("user"):
+            by_task[assignment.task_id].append(assignment.user)
+        creator_ids = {task.created_by_id for task in tasks if not by_task[task.id] and task.created_by_id}
+        creators = User.objects.in_bulk(creator_ids) if creator_ids else {}
+        for task in tasks:
+            if not by_task[task.id] and task.created_by_id in creators:
+                by_task[task.id].append(creators[task.created_by_id])
+        return by_task
+
+    def send(self, tenant_id, tasks):
+        recipients = self.recipients(tasks)
+        # (task, user, due_date) -> narrowest window already reminded
+        sent = {}
+        for task_id, user_id, due_date, minutes in TaskReminder.objects.filter(
+            task_id__in=recipients,
+        ).values_list("task_id", "user_id", "due_date", "window_minutes"):
+            key = (task_id, user_id, due_date)
+            sent[key] = min(minutes, sent.get(key, minutes))
+
+        reminders, candidates = [], {}
+        for task in tasks:
+            minutes = self.window_for(task)
+            if minutes is None:
+                continue
+            for notification in build_task_due_soon(
+                task=task,
+                recipients=recipients[task.id],
+                within=window_label(minutes),
+            ):
+                key = (task.id, notification.user_id)
+                already = sent.get((task.id, notification.user_id, task.due_date))
+                if already is not None and already <= minutes:
+                    continue
+                reminders.append(TaskReminder(
+                    tenant_id=tenant_id,
+                    task=task,
+                    user_id=notification.user_id,
+                    window_minutes=minutes,
+                    due_date=task.due_date,
+                    sent_at=self.now,
+                ))
+                candidates[key] = notification
+        if not reminders:
+            return 0
+
+        with transaction.atomic():
+            TaskReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+            # Only rows stamped with this run's time are ours; a concurrent
+            # run that got there first keeps its own.
+            ours = TaskReminder.objects.filter(
+                task_id__in={task_id for task_id, _ in candidates},
+                sent_at=self.now,
+            ).values_list("task_id", "user_id")
+            notifications = [candidates[key] for key in ours if key in candidates]
+            save_notifications(notifications)
+        return len(notifications)
@@ -0,0 +1,206 @@
+"""
+core_api/retention.py
+
+Notification retention, run by `manage.py prune_notifications`.
+
+Each tenant's policy comes from settings.NOTIFICATION_RETENTION for its
+OrganizationProfile.plan, with the profile's notification_retention_days /
+notification_keep_per_user overriding it when set:
+
+    days            read notifications older than this are removed
+    keep_per_user   read notifications beyond each user's newest N are removed
+
+Unread notifications are never removed, so NotificationCounter stays exact.
+
+Users over keep_per_user are found one at a time on the notification
+indexes: a seek to the next user_id, then an index-only read of their
+keep_per_user-th newest created_at. The cost grows with the number of
+users and keep_per_user, not with the size of the table. Rows sharing
+the oldest kept row's created_at are kept as well.
+
+Rows go in batches of `batch_size` ids, each deleted in its own short
+transaction, so no lock is held for longer than one batch. Batches are
+selected by the policy alone, which makes a run resumable: stopping it
+(Ctrl-C, --max-seconds) loses nothing and the next run picks up what is
+left. With an archive directory, every batch is appended to a gzipped
+NDJSON file per tenant before it is deleted.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from core_api.models import Notification, OrganizationProfile
+
+PRUNE_BATCH_SIZE = 1000
+
+DEFAULT_NOTIFICATION_RETENTION = {"days": 90, "keep_per_user": 500}
+
+ARCHIVE_FIELDS = (
+    "id",
+    "tenant_id",
+    "user_id",
+    "actor_id",
+    "task_id",
+    "kind",
+    "title",
+    "body",
+    "is_read",
+    "read_at",
+    "created_at",
+)
+
+
+def retention_policy(profile):
+    """{"days": int | None, "keep_per_user": int | None} for a tenant's profile."""
+    plans = getattr(settings, "NOTIFICATION_RETENTION", {})
+    plan = profile.plan if profile is not None else "free"
+    policy = dict(plans.get(plan, DEFAULT_NOTIFICATION_RETENTION))
+    if profile is not None:
+        if profile.notification_retention_days is not None:
+            policy["days"] = profile.notification_retention_days
+        if profile.notification_keep_per_user is not None:
+            policy["keep_per_user"] = profile.notification_keep_per_user
+    return policy
+
+
+def users_over_cap(tenant, keep_per_user):
+    """
+    Yields (user_id, created_at) for each user of `tenant` with more than
+    `keep_per_user` notifications, where created_at is that of the oldest
+    row inside the cap (None when keep_per_user is 0).
+    """
+    notifications = Notification.objects.filter(tenant=tenant)
+    user_id = 0
+    while True:
+        # Next user with notifications: one seek on (tenant, user, ...), so no
+        # aggregate over the whole tenant is needed to find them.
+        user_id = (
+            notifications.filter(user_id__gt=user_id)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+            .first()
+        )
+        if user_id is None:
+            return
+        # The keep_per_user-th and next-newest created_at, read off the
+        # (tenant, user, -created_at) index alone.
+        newest = notifications.filter(user_id=user_id).order_by("-created_at").values_list(
+            "created_at", flat=True
+        )
+        if keep_per_user <= 0:
+            if newest[:1]:
+                yield user_id, None
+            continue
+        boundary = list(newest[keep_per_user - 1:keep_per_user + 1])
+        if len(boundary) > 1:
+            yield user_id, boundary[0]
+
+
+class NotificationPruner:
+
+    def __init__(self, *, batch_size=PRUNE_BATCH_SIZE, archive_dir=None, dry_run=False,
+                 pause=0.0, deadline=None):
+        """
+        pause    — seconds to sleep between batches, to leave room for
+                   regular traffic
+        deadline — time.monotonic() value after which the run stops early
+        """
+        self.batch_size = batch_size
+        self.archive_dir = archive_dir
+        self.dry_run = dry_run
+        self.pause = pause
+        self.deadline = deadline
+        self.stopped_early = False
+
+    def out_of_time(self):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stopped_early = True
+        return self.stopped_early
+
+    def prune_tenant(self, tenant):
+        profile = OrganizationProfile.objects.filter(tenant=tenant).first()
+        policy = retention_policy(profile)
+        started = time.monotonic()
+        self._archive = None
+        cutoff = timezone.now() - timedelta(days=policy["days"]) if policy["days"] is not None else None
+        try:
+            expired = self._prune_expired(tenant, cutoff)
+            over_cap = self._prune_over_cap(tenant, policy["keep_per_user"], cutoff)
+        finally:
+            if self._archive is not None:
+                self._archive.close()
+        seconds = time.monotonic() - started
+        return {
+            "tenant": tenant.slug,
+            "policy": policy,
+            "expired": expired,
+            "over_cap": over_cap,
+            "seconds": seconds,
+            "rows_per_second": (expired + over_cap) / seconds if seconds > 0 else 0.0,
+        }
+
+    # -------------------------------------------------------------------------
+
+    def _prune_expired(self, tenant, cutoff):
+        if cutoff is None:
+            return 0
+        return self._delete_in_batches(
+            Notification.objects.filter(tenant=tenant, is_read=True, created_at__lt=cutoff),
+            tenant,
+        )
+
+    def _prune_over_cap(self, tenant, keep_per_user, cutoff):
+        if keep_per_user is None:
+            return 0
+        deleted = 0
+        for user_id, oldest_kept in users_over_cap(tenant, keep_per_user):
+            if self.out_of_time():
+                break
+            older = Notification.objects.filter(tenant=tenant, user_id=user_id, is_read=True)
+            if oldest_kept is not None:
+                older = older.filter(created_at__lt=oldest_kept)
+            if cutoff is not None:
+                # Already handled (or, in a dry run, counted) as expired.
+                older = older.filter(created_at__gte=cutoff)
+            deleted += self._delete_in_batches(older, tenant)
+        return deleted
+
+    def _delete_in_batches(self, queryset, tenant):
+        deleted = 0
+        last_id = 0
+        while not self.out_of_time():
+            ids = list(
+                queryset.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            if not self.dry_run:
+                with transaction.atomic():
+                    if self.archive_dir:
+                        self._write_archive(tenant, ids)
+                    Notification.objects.filter(id__in=ids).delete()
+                if self.pause:
+                    time.sleep(self.pause)
+            deleted += len(ids)
+        return deleted
+
+    def _write_archive(self, tenant, ids):
+        if self._archive is None:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+            path = os.path.join(self.archive_dir, f"notifications-{tenant.slug}-{stamp}.ndjson.gz")
+            self._archive = gzip.open(path, "at", encoding="utf-8")
+        for row in Notification.objects.filter(id__in=ids).order_by("id").values(*ARCHIVE_FIELDS):
+            self._archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+        self._archive.flush()
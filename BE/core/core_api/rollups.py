@@ -0,0 +1,85 @@
+"""
+core_api/rollups.py
+
+Maintenance of TaskStatusRollup, the per-(tenant, status) live task
+counts behind the dashboard KPIs (core_api/kpis.py).
+
+Nothing here runs unless settings.TASK_STATUS_ROLLUP is on. A tenant's
+rows are built on first read (or by rebuild_task_status_rollup) and then
+moved incrementally:
+
+    Task save / delete     SIGNAL 3 in core_api/signals.py
+    bulk task mutations    core_api/bulk.py
+    imports                core_api/importer.py
+    BoardStatus delete     full rebuild of the tenant after commit (its
+                           tasks fall back to status NULL via SET_NULL,
+                           which sends no Task signals)
+
+Increments are F() updates, so concurrent transitions do not lose counts.
+Tenants that were never built are skipped until their first read. Run the
+rebuild command after toggling the setting or after raw SQL changes.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from core_api.models import Task, TaskStatusRollup
+
+
+def status_rollup_enabled():
+    return bool(getattr(settings, "TASK_STATUS_ROLLUP", False))
+
+
+def task_status_delta(deltas, status_id, is_deleted, sign):
+    """Adds +1/-1 for a live task in `status_id` to a {status_id: delta} dict."""
+    if not is_deleted:
+        deltas[status_id] = deltas.get(status_id, 0) + sign
+    return deltas
+
+
+def adjust_status_rollup(tenant_id, deltas):
+    """Applies {status_id: delta} to a built tenant's rollup rows."""
+    if not status_rollup_enabled():
+        return
+    deltas = {status_id: delta for status_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows = TaskStatusRollup.objects.filter(tenant_id=tenant_id)
+    for status_id, delta in deltas.items():
+        if rows.filter(status_id=status_id).update(task_count=F("task_count") + delta):
+            continue
+        if not rows.exists():
+            return  # not built yet; the first read builds it from scratch
+        # First task in a new status.
+        TaskStatusRollup.objects.bulk_create(
+            [TaskStatusRollup(tenant_id=tenant_id, status_id=status_id, task_count=0)],
+            ignore_conflicts=True,
+        )
+        rows.filter(status_id=status_id).update(task_count=F("task_count") + delta)
+
+
+def rebuild_status_rollup(tenant_id):
+    """Recounts a tenant's rows from the task table. Returns the live task count."""
+    counts = (
+        Task.objects.filter(tenant_id=tenant_id, is_deleted=False)
+        .order_by()
+        .values_list("status_id")
+        .annotate(n=Count("id"))
+    )
+    with transaction.atomic():
+        TaskStatusRollup.objects.filter(tenant_id=tenant_id).delete()
+        rows = [
+            TaskStatusRollup(tenant_id=tenant_id, status_id=status_id, task_count=n)
+            for status_id, n in counts
+        ]
+        if not any(row.status_id is None for row in rows):
+            # Marks the tenant as built even when it has no tasks yet.
+            rows.append(TaskStatusRollup(tenant_id=tenant_id, status_id=None, task_count=0))
+        TaskStatusRollup.objects.bulk_create(rows)
+    return sum(row.task_count for row in rows)
+
+
+def rebuild_status_rollup_on_commit(tenant_id):
+    if status_rollup_enabled():
+        transaction.on_commit(lambda: rebuild_status_rollup(tenant_id))
@@ -0,0 +1,196 @@
+"""
+core_api/search.py
+
+Full-text search over Task.ref_id, title and description.
+
+The index lives in core_api_task_search, a table created by migration
+0010 outside the ORM because its shape depends on the database:
+
+    PostgreSQL  (task_id PK, tenant_id, document tsvector) + GIN index
+    SQLite      FTS5 virtual table (rowid = task id)
+
+Any other backend, or SQLite built without FTS5, gets no table and
+search_tasks() falls back to icontains matching.
+
+Rows are written per task by index_tasks(), called from the Task
+post_save signal. Soft-deleted tasks are dropped from the index.
+"""
+
+import re
+
+from django.db import connections, router
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from core_api.models import Task
+
+SEARCH_TABLE = "core_api_task_search"
+SEARCH_BATCH_SIZE = 500
+SEARCH_MAX_TERMS = 16
+
+# Stemmed English for prose, 'simple' for ref ids like "ACME-00042". The
+# parser reads "-00042" as a signed number, so punctuation in ref ids becomes
+# spaces to index the same terms search_terms() produces.
+PG_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple', regexp_replace(%s, '[^[:alnum:]]+', ' ', 'g')), 'A') || "
+    "setweight(to_tsvector('english', %s), 'A') || "
+    "setweight(to_tsvector('english', %s), 'B')"
+)
+# plainto_tsquery ANDs the terms like the quoted FTS5 query; websearch_to_tsquery
+# would read a bare "or" as an operator.
+PG_QUERY_SQL = "(plainto_tsquery('english', %s) || plainto_tsquery('simple', %s))"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _connection():
+    return connections[router.db_for_write(Task)]
+
+
+def search_backend(connection=None):
+    """Returns "postgresql", "sqlite" or None when no index table exists."""
+    connection = connection or _connection()
+    cached = getattr(connection, "_task_search_backend", False)
+    if cached is not False:
+        return cached
+
+    backend = None
+    if connection.vendor in {"postgresql", "sqlite"}:
+        with connection.cursor() as cursor:
+            if SEARCH_TABLE in connection.introspection.table_names(cursor):
+                backend = connection.vendor
+    connection._task_search_backend = backend
+    return backend
+
+
+def _tenant_param(connection, tenant_id):
+    # Tenant ids are UUIDs; SQLite stores them as hex text.
+    return Task._meta.get_field("tenant").get_db_prep_value(tenant_id, connection)
+
+
+def search_terms(query):
+    return _TERM_RE.findall(query or "")[:SEARCH_MAX_TERMS]
+
+
+def _fts5_match(terms):
+    # Quote every term so user input can never be parsed as FTS5 syntax.
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+# =============================================================================
+# INDEX MAINTENANCE
+# =============================================================================
+
+def index_tasks(task_ids):
+    """(Re)indexes the given tasks. Deleted or soft-deleted tasks are removed."""
+    connection = _connection()
+    backend = search_backend(connection)
+    if backend is None:
+        return
+
+    task_ids = sorted({task_id for task_id in task_ids if task_id is not None})
+    for start in range(0, len(task_ids), SEARCH_BATCH_SIZE):
+        batch = task_ids[start:start + SEARCH_BATCH_SIZE]
+        rows = [
+            (task_id, _tenant_param(connection, tenant_id), ref_id, title, description)
+            for task_id, tenant_id, ref_id, title, description in
+            Task.objects.filter(id__in=batch, is_deleted=False)
+            .values_list("id", "tenant_id", "ref_id", "title", "description")
+        ]
+        with connection.cursor() as cursor:
+            _delete_rows(cursor, backend, batch)
+            if not rows:
+                continue
+            if backend == "postgresql":
+                cursor.executemany(
+                    f"INSERT INTO {SEARCH_TABLE} (task_id, tenant_id, document) "
+                    f"VALUES (%s, %s, {PG_DOCUMENT_SQL})",
+                    rows,
+                )
+            else:
+                cursor.executemany(
+                    f"INSERT INTO {SEARCH_TABLE} (rowid, tenant_id, ref_id, title, description) "
+                    f"VALUES (%s, %s, %s, %s, %s)",
+                    rows,
+                )
+
+
+def remove_tasks(task_ids):
+    connection = _connection()
+    backend = search_backend(connection)
+    task_ids = [task_id for task_id in task_ids if task_id is not None]
+    if backend is None or not task_ids:
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(task_ids), SEARCH_BATCH_SIZE):
+            _delete_rows(cursor, backend, task_ids[start:start + SEARCH_BATCH_SIZE])
+
+
+def _delete_rows(cursor, backend, task_ids):
+    key = "task_id" if backend == "postgresql" else "rowid"
+    placeholders = ", ".join(["%s"] * len(task_ids))
+    cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE {key} IN ({placeholders})", task_ids)
+
+
+# =============================================================================
+# QUERYING
+# =============================================================================
+
+def search_tasks(queryset, query, tenant_id):
+    """
+    Filters a Task queryset to matches for `query` and annotates
+    `search_rank` (higher is better). Callers order by it.
+    Role scoping must already be applied to `queryset`.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+    table = Task._meta.db_table
+    connection = _connection()
+    backend = search_backend(connection)
+    tenant_id = _tenant_param(connection, tenant_id)
+
+    if backend == "postgresql":
+        text = " ".join(terms)
+        matches = RawSQL(
+            f"{table}.id IN (SELECT task_id FROM {SEARCH_TABLE} "
+            f"WHERE tenant_id = %s AND document @@ {PG_QUERY_SQL})",
+            (tenant_id, text, text),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"SELECT ts_rank_cd(document, {PG_QUERY_SQL}) FROM {SEARCH_TABLE} "
+            f"WHERE task_id = {table}.id",
+            (text, text),
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+    if backend == "sqlite":
+        match = _fts5_match(terms)
+        matches = RawSQL(
+            f"{table}.id IN (SELECT rowid FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND tenant_id = %s)",
+            (match, tenant_id),
+            output_field=BooleanField(),
+        )
+        # bm25() is lower-is-better; negate so every backend sorts descending.
+        rank = RawSQL(
+            f"SELECT -bm25({SEARCH_TABLE}, 0.0, 10.0, 10.0, 5.0) FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND rowid = {table}.id",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(ref_id__icontains=term)
+            | Q(title__icontains=term)
+            | Q(description__icontains=term)
+        )
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
@@ -10,6 +10,8 @@ Updated to work with the new model structure:
     since transitions are enforced by name, not by enum value
 """
 
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from .models import (
     Task, TaskHistory, TaskAttachment, TaskProof,
@@ -19,15 +21,10 @@ from .models import (
     Notification,
 )
 from users.models import User
+from users.roles import get_role_context
 from workflows.models import Workflow, WorkflowStage
 
 
-def normalize_role_value(value):
-    if value is None:
-        return None
-    return str(value).strip().upper().replace(" ", "_")
-
-
 # =============================================================================
 # STATUS TRANSITION MAP
 # Now keyed by BoardStatus.name (string) instead of Task.Status enum.
@@ -56,6 +53,52 @@ STATUS_NAME_TO_CODE = {
 STATUS_CODE_TO_NAME = {v: k for k, v in STATUS_NAME_TO_CODE.items()}
 
 
+def validate_status_change(current_status, new_status, active_role, blocked_reason):
+    """
+    Transition rules for moving a task between BoardStatus rows.
+    Shared by TaskSerializer.validate and the bulk mutation endpoint.
+    Raises serializers.ValidationError keyed by the offending field.
+    """
+    if new_status and current_status and new_status != current_status:
+        current_name = current_status.name
+        new_name = new_status.name
+
+        # If current status is a default status, enforce transition rules
+        if current_name in DEFAULT_ALLOWED_TRANSITIONS:
+            allowed_names = DEFAULT_ALLOWED_TRANSITIONS[current_name]
+
+            # Terminal "Cancelled" can never be left
+            if current_status.is_cancelled:
+                raise serializers.ValidationError(
+                    {"status": "Cancelled tasks cannot be modified."}
+                )
+
+            # "Done" can only be reopened by ADMIN
+            if current_status.is_terminal and not current_status.is_cancelled:
+                if active_role != "ADMIN":
+                    raise serializers.ValidationError(
+                        {"status": "Only admin can reopen completed tasks."}
+                    )
+
+            # Enforce transition map for default statuses
+            if new_name in DEFAULT_ALLOWED_TRANSITIONS and new_name not in allowed_names:
+                raise serializers.ValidationError(
+                    {"status": f"Cannot transition from '{current_name}' to '{new_name}'."}
+                )
+
+            # Task receiver cannot approve (move to Done)
+            if active_role == "TASK_RECEIVER" and new_status.is_terminal and not new_status.is_cancelled:
+                raise serializers.ValidationError(
+                    {"status": "Only the task creator can mark tasks as Done."}
+                )
+
+    # Blocked reason required when moving to Blocked
+    if new_status and new_status.name == "Blocked" and not blocked_reason:
+        raise serializers.ValidationError(
+            {"blocked_reason": "A reason is required when blocking a task."}
+        )
+
+
 # =============================================================================
 # USER SERIALIZER
 # =============================================================================
@@ -84,6 +127,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "body",
             "is_read",
             "read_at",
+            "event_count",
             "created_at",
             "actor",
             "task_ref",
@@ -283,11 +327,46 @@ class TaskSerializer(serializers.ModelSerializer):
             "created_by",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Loads everything the read-only fields need in a fixed number of
+        queries, independent of page size. Objects that were not loaded
+        through this queryset fall back to per-object queries below.
+        """
+        live_subtasks = (
+            Task.objects.filter(parent=OuterRef("pk"), is_deleted=False)
+            .order_by()
+            .values("parent")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return (
+            queryset
+            .select_related("status", "created_by", "workflow", "stage")
+            .annotate(_subtask_count=Coalesce(Subquery(live_subtasks), 0))
+            .prefetch_related(
+                "assignees",
+                "attachments__uploaded_by",
+                Prefetch(
+                    "taskassignee_set",
+                    queryset=TaskAssignee.objects.select_related("user").order_by("assigned_at", "id"),
+                ),
+            )
+        )
+
     def get_subtask_count(self, obj):
+        annotated = getattr(obj, "_subtask_count", None)
+        if annotated is not None:
+            return annotated
         return obj.subtasks.filter(is_deleted=False).count()
 
     def get_assigned_to(self, obj):
-        assignee = obj.assignees.order_by("taskassignee__assigned_at").first()
+        if "taskassignee_set" in getattr(obj, "_prefetched_objects_cache", {}):
+            assignments = obj.taskassignee_set.all()
+            assignee = assignments[0].user if assignments else None
+        else:
+            assignee = obj.assignees.order_by("taskassignee__assigned_at").first()
         if not assignee:
             return None
         return TaskUserSerializer(assignee).data
@@ -300,20 +379,24 @@ class TaskSerializer(serializers.ModelSerializer):
     def get_workflow(self, obj):
         if not obj.workflow_id:
             return None
-        return (
-            Workflow.objects.filter(id=obj.workflow_id)
-            .values("id", "name", "is_default")
-            .first()
-        )
+        workflow = obj.workflow
+        return {
+            "id": workflow.id,
+            "name": workflow.name,
+            "is_default": workflow.is_default,
+        }
 
     def get_stage(self, obj):
         if not obj.stage_id:
             return None
-        return (
-            WorkflowStage.objects.filter(id=obj.stage_id)
-            .values("id", "name", "order", "is_terminal", "color")
-            .first()
-        )
+        stage = obj.stage
+        return {
+            "id": stage.id,
+            "name": stage.name,
+            "order": stage.order,
+            "is_terminal": stage.is_terminal,
+            "color": stage.color,
+        }
 
     # -------------------------
     # FIELD VALIDATION
@@ -356,9 +439,9 @@ class TaskSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if not request:
             return users
-        tenant = request.user.tenant
+        tenant_id = request.user.tenant_id
         for user in users:
-            if user.tenant_id != tenant.id:
+            if user.tenant_id != tenant_id:
                 raise serializers.ValidationError(
                     f"User {user.email} does not belong to your organisation."
                 )
@@ -384,13 +467,13 @@ class TaskSerializer(serializers.ModelSerializer):
             return attrs
 
         user = request.user
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
+        active_role = get_role_context(request).active_role
 
         if self.instance is None:
             board = attrs.get("board")
             if board is None:
                 board = (
-                    Board.objects.filter(tenant=user.tenant, is_deleted=False)
+                    Board.objects.filter(tenant_id=user.tenant_id, is_deleted=False)
                     .order_by("order", "name")
                     .first()
                 )
@@ -423,7 +506,7 @@ class TaskSerializer(serializers.ModelSerializer):
                 legacy_assigned_to_id = int(legacy_assigned_to_id)
             except (TypeError, ValueError):
                 raise serializers.ValidationError({"assigned_to_id": "assigned_to_id must be an integer."})
-            assigned_user = User.objects.filter(id=legacy_assigned_to_id, tenant=user.tenant).first()
+            assigned_user = User.objects.filter(id=legacy_assigned_to_id, tenant_id=user.tenant_id).first()
             if not assigned_user:
                 raise serializers.ValidationError(
                     {"assigned_to_id": "Assigned user must belong to your organisation."}
@@ -454,50 +537,12 @@ class TaskSerializer(serializers.ModelSerializer):
 
             current_status = self.instance.status   # BoardStatus instance or None
             new_status = attrs.get("status", current_status)  # BoardStatus instance or None
-
-            if new_status and current_status and new_status != current_status:
-                current_name = current_status.name
-                new_name = new_status.name
-
-                # If current status is a default status, enforce transition rules
-                if current_name in DEFAULT_ALLOWED_TRANSITIONS:
-                    allowed_names = DEFAULT_ALLOWED_TRANSITIONS[current_name]
-
-                    # Terminal "Cancelled" can never be left
-                    if current_status.is_cancelled:
-                        raise serializers.ValidationError(
-                            {"status": "Cancelled tasks cannot be modified."}
-                        )
-
-                    # "Done" can only be reopened by ADMIN
-                    if current_status.is_terminal and not current_status.is_cancelled:
-                        if active_role != "ADMIN":
-                            raise serializers.ValidationError(
-                                {"status": "Only admin can reopen completed tasks."}
-                            )
-
-                    # Enforce transition map for default statuses
-                    if new_name in DEFAULT_ALLOWED_TRANSITIONS and new_name not in allowed_names:
-                        raise serializers.ValidationError(
-                            {"status": f"Cannot transition from '{current_name}' to '{new_name}'."}
-                        )
-
-                    # Task receiver cannot approve (move to Done)
-                    if active_role == "TASK_RECEIVER" and new_status.is_terminal and not new_status.is_cancelled:
-                        raise serializers.ValidationError(
-                            {"status": "Only the task creator can mark tasks as Done."}
-                        )
-
-            # Blocked reason required when moving to Blocked
-            if new_status and new_status.name == "Blocked":
-                blocked_reason = attrs.get(
-                    "blocked_reason",
-                    getattr(self.instance, "blocked_reason", None)
-                )
-                if not blocked_reason:
-                    raise serializers.ValidationError(
-                        {"blocked_reason": "A reason is required when blocking a task."}
-                    )
+            validate_status_change(
+                current_status,
+                new_status,
+                active_role,
+                attrs.get("blocked_reason", getattr(self.instance, "blocked_reason", None)),
+            )
 
         selected_workflow = attrs.get("workflow", getattr(self.instance, "workflow", None))
         selected_stage = attrs.get("stage", getattr(self.instance, "stage", None))
@@ -11,10 +11,38 @@ Signals registered here:
    → Creates 6 default BoardStatus rows for the new board
    → Uses bulk_create for efficiency (one DB round-trip)
 
+3. post_save/post_delete on Task, post_save/post_delete on TaskAssignee,
+   m2m_changed on Task.assignees, post_delete on BoardStatus
+   → Re-syncs TaskVisibility rows and the full-text search index
+     for the affected task, and moves TaskStatusRollup counts
+
+4. post_save/post_delete on TaskAssignee, TaskAttachment, subtasks and
+   BoardStatus, m2m_changed on Task.assignees
+   → Bumps updated_at on the parent Task / Board so the ETags in
+     core_api/conditional.py change with the embedded rows
+
+5. post_save/post_delete on Task, TaskAssignee, TaskHistory and
+   BoardStatus, m2m_changed on Task.assignees
+   → Bumps the tenant's dashboard widget data version after commit
+     (core_api/widget_cache.py)
+
+6. post_save on User
+   → Rewrites the user's type-ahead search tokens when a searchable
+     field changed (users/search.py)
+
+7. post_save/post_delete on Tenant
+   → Drops the tenant's cached (slug, status) after commit
+     (context/cache.py)
+
+8. post_save/post_delete on User and UserRole
+   → Drops the user's CachedJWTAuthentication snapshot after commit
+     (users/authentication.py)
+
 Connected in CoreApiConfig.ready() inside apps.py.
 """
 
-from django.db.models.signals import post_save
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 
 
@@ -119,4 +147,249 @@ def create_default_board_statuses(sender, instance, created, **kwargs):
         for data in DEFAULT_BOARD_STATUSES
     ]
 
-    BoardStatus.objects.bulk_create(statuses, ignore_conflicts=True)
\ No newline at end of file
+    BoardStatus.objects.bulk_create(statuses, ignore_conflicts=True)
+
+
+# =============================================================================
+# SIGNAL 3: Derived task rows (TaskVisibility, search index, status rollup)
+# Only fires for ORM saves/deletes. QuerySet.update() and bulk_create()
+# callers must call core_api.visibility.sync_task_visibility(),
+# core_api.search.index_tasks() and core_api.rollups.adjust_status_rollup()
+# themselves.
+# =============================================================================
+
+@receiver(post_save, sender="core_api.Task")
+def sync_derived_rows_on_task_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Re-syncs visibility when the creator / soft-delete flag changed, the
+    search index when the searchable text or soft-delete flag changed, and
+    the status rollup when the status or soft-delete flag changed.
+    One receiver so all checks see the snapshot taken at load time.
+    """
+    from core_api.rollups import adjust_status_rollup, task_status_delta
+    from core_api.search import index_tasks
+    from core_api.visibility import sync_task_visibility
+
+    if created or instance.tracked_fields_changed("created_by_id", "is_deleted"):
+        sync_task_visibility([instance.pk])
+    if created or instance.tracked_fields_changed("ref_id", "title", "description", "is_deleted"):
+        index_tasks([instance.pk])
+    if created or instance.tracked_fields_changed("status_id", "is_deleted"):
+        deltas = {}
+        if not created:
+            task_status_delta(
+                deltas,
+                instance.loaded_value("status_id"),
+                instance.loaded_value("is_deleted"),
+                -1,
+            )
+        task_status_delta(deltas, instance.status_id, instance.is_deleted, +1)
+        adjust_status_rollup(instance.tenant_id, deltas)
+    instance.snapshot_tracked_fields()
+
+
+@receiver(post_delete, sender="core_api.Task")
+def remove_derived_rows_on_task_delete(sender, instance, **kwargs):
+    # FTS5 tables cannot carry a foreign key, so hard deletes clean up here.
+    from core_api.rollups import adjust_status_rollup, task_status_delta
+    from core_api.search import remove_tasks
+
+    remove_tasks([instance.pk])
+    adjust_status_rollup(
+        instance.tenant_id,
+        task_status_delta({}, instance.status_id, instance.is_deleted, -1),
+    )
+
+
+@receiver(post_delete, sender="core_api.BoardStatus")
+def rebuild_rollup_on_status_delete(sender, instance, **kwargs):
+    # Its tasks were moved to status NULL by a SET_NULL UPDATE, which sends
+    # no Task signals, and its rollup row cascaded away.
+    from core_api.models import Board
+    from core_api.rollups import rebuild_status_rollup_on_commit
+
+    tenant_id = Board.objects.filter(id=instance.board_id).values_list("tenant_id", flat=True).first()
+    if tenant_id is not None:
+        rebuild_status_rollup_on_commit(tenant_id)
+
+
+@receiver(post_save, sender="core_api.TaskAssignee")
+@receiver(post_delete, sender="core_api.TaskAssignee")
+def sync_visibility_on_assignee_change(sender, instance, **kwargs):
+    from core_api.visibility import sync_task_visibility
+
+    sync_task_visibility([instance.task_id])
+
+
+# m2m_changed is a plain Signal (no lazy "app.Model" senders), so resolve
+# the through model here. Safe: this module is imported from ready().
+@receiver(m2m_changed, sender=apps.get_model("core_api", "TaskAssignee"))
+def sync_visibility_on_assignees_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    from core_api.models import Task
+    from core_api.visibility import sync_task_visibility
+
+    if not reverse:
+        sync_task_visibility([instance.pk])
+    elif pk_set:
+        sync_task_visibility(pk_set)
+    else:
+        # user.tasks_assigned.clear() — the through rows are already gone.
+        sync_task_visibility(
+            Task.objects.filter(visibility__user=instance).values_list("id", flat=True)
+        )
+
+
+# =============================================================================
+# SIGNAL 4: Change markers for conditional GET
+# Task and board payloads embed rows from other tables; touching the parent
+# keeps the updated_at-based ETags honest. bulk_create() callers
+# (core_api/bulk.py) set updated_at on the task UPDATE themselves.
+# =============================================================================
+
+@receiver(post_save, sender="core_api.TaskAssignee")
+@receiver(post_delete, sender="core_api.TaskAssignee")
+@receiver(post_save, sender="core_api.TaskAttachment")
+@receiver(post_delete, sender="core_api.TaskAttachment")
+def touch_task_on_related_change(sender, instance, **kwargs):
+    from core_api.conditional import touch
+    from core_api.models import Task
+
+    touch(Task, [instance.task_id])
+
+
+@receiver(m2m_changed, sender=apps.get_model("core_api", "TaskAssignee"))
+def touch_tasks_on_assignees_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    from core_api.conditional import touch
+    from core_api.models import Task
+
+    if not reverse:
+        touch(Task, [instance.pk])
+    elif pk_set:
+        touch(Task, pk_set)
+
+
+@receiver(post_save, sender="core_api.Task")
+@receiver(post_delete, sender="core_api.Task")
+def touch_parent_on_subtask_change(sender, instance, **kwargs):
+    # The parent's payload carries subtask_count.
+    if not instance.parent_id:
+        return
+
+    from core_api.conditional import touch
+    from core_api.models import Task
+
+    touch(Task, [instance.parent_id])
+
+
+@receiver(post_save, sender="core_api.BoardStatus")
+@receiver(post_delete, sender="core_api.BoardStatus")
+def touch_board_on_status_change(sender, instance, **kwargs):
+    from core_api.conditional import touch
+    from core_api.models import Board
+
+    touch(Board, [instance.board_id])
+
+
+# =============================================================================
+# SIGNAL 5: Dashboard widget data version
+# Cached widget payloads are keyed by it. bulk_create() / update() callers
+# (core_api/bulk.py, core_api/importer.py) bump it themselves.
+# =============================================================================
+
+@receiver(post_save, sender="core_api.Task")
+@receiver(post_delete, sender="core_api.Task")
+@receiver(post_save, sender="core_api.TaskHistory")
+@receiver(post_delete, sender="core_api.TaskHistory")
+def bump_widget_version_on_task_change(sender, instance, **kwargs):
+    from core_api.widget_cache import bump_data_version
+
+    bump_data_version(instance.tenant_id)
+
+
+@receiver(post_save, sender="core_api.TaskAssignee")
+@receiver(post_delete, sender="core_api.TaskAssignee")
+def bump_widget_version_on_assignee_change(sender, instance, **kwargs):
+    from core_api.models import Task
+    from core_api.widget_cache import bump_data_version, widget_cache_enabled
+
+    if widget_cache_enabled():
+        bump_data_version(
+            Task.objects.filter(id=instance.task_id).values_list("tenant_id", flat=True).first()
+        )
+
+
+@receiver(m2m_changed, sender=apps.get_model("core_api", "TaskAssignee"))
+def bump_widget_version_on_assignees_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    from core_api.widget_cache import bump_data_version
+
+    # Both sides (Task, User) carry the tenant.
+    bump_data_version(instance.tenant_id)
+
+
+@receiver(post_save, sender="core_api.BoardStatus")
+@receiver(post_delete, sender="core_api.BoardStatus")
+def bump_widget_version_on_status_change(sender, instance, **kwargs):
+    from core_api.models import Board
+    from core_api.widget_cache import bump_data_version, widget_cache_enabled
+
+    if widget_cache_enabled():
+        bump_data_version(
+            Board.objects.filter(id=instance.board_id).values_list("tenant_id", flat=True).first()
+        )
+
+
+# =============================================================================
+# SIGNAL 6: Type-ahead user search tokens
+# bulk_create() callers run `manage.py rebuild_user_search_tokens`.
+# Deleting a user cascades to its tokens.
+# =============================================================================
+
+@receiver(post_save, sender="users.User")
+def index_user_search_tokens(sender, instance, created, update_fields=None, **kwargs):
+    from users.search import SEARCH_FIELDS, index_users
+
+    # Logins save last_login alone; skip those.
+    if not created and update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    index_users([instance.pk])
+
+
+# =============================================================================
+# SIGNAL 7: Tenant state cache
+# =============================================================================
+
+@receiver(post_save, sender="context.Tenant")
+@receiver(post_delete, sender="context.Tenant")
+def invalidate_tenant_state(sender, instance, **kwargs):
+    from context.cache import invalidate_tenant
+
+    invalidate_tenant(instance.pk)
+
+
+# =============================================================================
+# SIGNAL 8: Authenticated user snapshots
+# =============================================================================
+
+@receiver(post_save, sender="users.User")
+@receiver(post_delete, sender="users.User")
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    from users.authentication import invalidate_user
+
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender="users.UserRole")
+@receiver(post_delete, sender="users.UserRole")
+def invalidate_user_snapshot_on_role_change(sender, instance, **kwargs):
+    from users.authentication import invalidate_user
+
+    invalidate_user(instance.user_id)
@@ -0,0 +1,234 @@
+"""
+core_api/sse.py
+
+GET /api/events/ — Server-Sent Events stream of core_api.events for the
+authenticated user.
+
+This is a plain ASGI app that core/asgi.py mounts in front of Django; it
+is not part of the URLconf. Django's own ASGI handler keeps a dedicated
+thread per in-flight request (for sync middleware and signals), and
+under WSGI a stream pins a worker. Here an idle stream is just a
+coroutine waiting on its asyncio.Queue plus a disconnect watcher, so one
+worker holds thousands of them. The token check runs once per connection
+on the shared executor. Serve core.asgi:application (uvicorn, daphne, ...)
+to get the endpoint.
+
+Browsers' EventSource cannot set headers, so the access token may be
+passed as ?token=<jwt> as well as in the Authorization header. The stream
+ends when the token expires; EventSource reconnects, and the client
+should supply a fresh token (and call /tasks/changes/ to catch up).
+
+Wire format:
+    retry: 5000
+    id: 42
+    event: task.updated
+    data: {"id": 7, "ref_id": "TAS-7", ...}
+
+Comment lines (": ping") are sent while idle to keep proxies from
+closing the connection. A `resync` event means events were dropped
+because the client fell behind.
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from context.cache import tenant_state
+from core_api.events import Subscription, get_broker
+from users.authentication import CachedJWTAuthentication
+from users.models import Role
+from users.roles import user_role_names
+
+EVENT_STREAM_PATH = "/api/events/"
+SSE_RETRY_MILLISECONDS = 5000
+
+
+def heartbeat_seconds():
+    return max(1, int(getattr(settings, "EVENT_STREAM_HEARTBEAT_SECONDS", 20)))
+
+
+def format_event(name, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {name}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+# =============================================================================
+# REQUEST HELPERS
+# =============================================================================
+
+def _headers(scope):
+    return {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
+
+def _raw_token(scope, headers):
+    parts = headers.get("authorization", "").split()
+    if len(parts) == 2 and parts[0] in settings.SIMPLE_JWT.get("AUTH_HEADER_TYPES", ("Bearer",)):
+        return parts[1]
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return (query.get("token") or [None])[0]
+
+
+def _cors_headers(headers):
+    # corsheaders middleware does not see this app.
+    origin = headers.get("origin")
+    if not origin:
+        return []
+    allowed = getattr(settings, "CORS_ALLOW_ALL_ORIGINS", False) or origin in getattr(
+        settings, "CORS_ALLOWED_ORIGINS", []
+    )
+    if not allowed:
+        return []
+    cors = [(b"access-control-allow-origin", origin.encode("latin-1")), (b"vary", b"origin")]
+    if getattr(settings, "CORS_ALLOW_CREDENTIALS", False):
+        cors.append((b"access-control-allow-credentials", b"true"))
+    return cors
+
+
+def _authenticate(raw_token):
+    """
+    (user, tenant, is_admin, token expiry) or raises InvalidToken /
+    AuthenticationFailed. Runs outside Django's request cycle, so it
+    manages the thread's DB connection the way request signals would.
+    """
+    close_old_connections()
+    try:
+        authentication = CachedJWTAuthentication()
+        token = authentication.get_validated_token(raw_token)
+        user = authentication.get_user(token)
+        tenant = tenant_state(user.tenant_id)
+        is_admin = Role.ADMIN in user_role_names(user)
+        return user, tenant, is_admin, token.get("exp")
+    finally:
+        close_old_connections()
+
+
+async def _send_json(send, status, payload, extra_headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *extra_headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# =============================================================================
+# STREAM
+# =============================================================================
+
+async def _events(subscription, expires_at):
+    heartbeat = heartbeat_seconds()
+    yield f"retry: {SSE_RETRY_MILLISECONDS}\n\n"
+    yield format_event("ready", {"user": subscription.user_id})
+    while True:
+        timeout = heartbeat
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                yield format_event("token_expired", {})
+                return
+            timeout = min(timeout, remaining)
+        try:
+            event = await asyncio.wait_for(subscription.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            yield ": ping\n\n"
+            continue
+
+        if subscription.overflowed:
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.overflowed = False
+            yield format_event("resync", {})
+            continue
+        yield format_event(event.name, event.data, event_id=event.id)
+
+
+async def _watch_disconnect(receive, stream_task):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            stream_task.cancel()
+            return
+
+
+async def event_stream(scope, receive, send):
+    headers = _headers(scope)
+    cors = _cors_headers(headers)
+    if scope["method"] != "GET":
+        await _send_json(send, 405, {"detail": f'Method "{scope["method"]}" not allowed.'}, cors)
+        return
+
+    raw_token = _raw_token(scope, headers)
+    if not raw_token:
+        await _send_json(send, 401, {"detail": "Authentication credentials were not provided."}, cors)
+        return
+    try:
+        user, tenant, is_admin, expires_at = await sync_to_async(
+            _authenticate, thread_sensitive=False
+        )(raw_token)
+    except (InvalidToken, AuthenticationFailed) as exc:
+        await _send_json(send, 401, {"detail": str(exc.detail)}, cors)
+        return
+    # Same checks as core.middleware.TenantMiddleware.
+    if tenant is None:
+        await _send_json(send, 403, {"error": "User has no tenant"}, cors)
+        return
+    if tenant.status != "active":
+        await _send_json(send, 403, {"error": "Tenant suspended"}, cors)
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            # Stop nginx from buffering the stream.
+            (b"x-accel-buffering", b"no"),
+            *cors,
+        ],
+    })
+
+    broker = get_broker()
+    subscription = broker.subscribe(
+        Subscription(tenant_id=user.tenant_id, user_id=user.id, is_admin=is_admin)
+    )
+    watcher = asyncio.create_task(_watch_disconnect(receive, asyncio.current_task()))
+    try:
+        async for chunk in _events(subscription, expires_at):
+            await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    except asyncio.CancelledError:
+        if not watcher.done():
+            raise
+        # The client went away.
+    finally:
+        watcher.cancel()
+        broker.unsubscribe(subscription)
+
+
+def mount_event_stream(django_application):
+    """ASGI app serving EVENT_STREAM_PATH itself and everything else via Django."""
+
+    async def application(scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == EVENT_STREAM_PATH:
+            await event_stream(scope, receive, send)
+        else:
+            await django_application(scope, receive, send)
+
+    return application
@@ -0,0 +1,89 @@
+"""
+core_api/tests/helpers.py
+
+Fixtures shared by the API tests: a tenant with one division and board,
+users with tenant roles, and API clients authenticated with the same
+access tokens /api/token/ issues (including the tenant_id claim).
+"""
+
+import threading
+
+from django.apps import apps
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from context.models import Tenant
+from core_api.models import Board, Division
+from users.models import Role, User, UserRole
+from users.token_serializer import CustomTokenObtainPairSerializer
+
+PASSWORD = "pw-Str0ng!!"
+
+
+def make_tenant(slug="acme"):
+    return Tenant.objects.create(name=slug.title(), slug=slug)
+
+
+def make_user(tenant, username, *role_names, **fields):
+    fields.setdefault("email", f"{username}@{tenant.slug}.test")
+    user = User.objects.create_user(username=username, password=PASSWORD, tenant=tenant, **fields)
+    for role_name in role_names:
+        role, _ = Role.objects.get_or_create(name=role_name)
+        UserRole.objects.create(user=user, tenant=tenant, role=role)
+    return user
+
+
+def make_board(tenant, name="Sprint"):
+    division = Division.objects.create(tenant=tenant, name=f"{name} division", slug=f"{name.lower()}-division")
+    return Board.objects.create(tenant=tenant, division=division, name=name, slug=name.lower())
+
+
+def api_client(user, active_role=None):
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+    if active_role:
+        headers["HTTP_X_ACTIVE_ROLE"] = active_role
+    client = APIClient()
+    client.credentials(**headers)
+    return client
+
+
+def count_queries(table, fn):
+    """(fn(), number of queries that touched `table`)."""
+    with CaptureQueriesContext(connection) as queries:
+        result = fn()
+    needle = connection.ops.quote_name(table)
+    return result, sum(1 for query in queries.captured_queries if needle in query["sql"])
+
+
+class ConcurrencyTestCase(TransactionTestCase):
+    """
+    For tests that hit the database from several threads, each on its own
+    connection. Needs a test database that allows that (not SQLite).
+    """
+
+    # core_api_task_search (migration 0010) references core_api_task without
+    # being a model, so flushing needs TRUNCATE ... CASCADE, which Django only
+    # issues when available_apps is set.
+    available_apps = [app_config.name for app_config in apps.get_app_configs()]
+
+    def run_threads(self, target, count):
+        """Runs target(index) for index in range(count) on parallel threads."""
+        errors = []
+
+        def run(index):
+            try:
+                target(index)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
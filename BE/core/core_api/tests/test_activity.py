@@ -0,0 +1,105 @@
+"""
+GET /api/activity/ (core_api/activity.py): keyset pages in (-timestamp,
+-id) order without gaps or repeats across tied timestamps, filters, role
+scoping, and no rows from other tenants.
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core_api.models import Task, TaskHistory
+from core_api.pagination import encode_cursor
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+
+def add_history(task, user, action, timestamp):
+    row = TaskHistory.objects.create(
+        tenant=task.tenant, task=task, action=action, performed_by=user, title=task.title,
+    )
+    # timestamp is auto_now_add; pin it to build ties.
+    TaskHistory.objects.filter(pk=row.pk).update(timestamp=timestamp)
+    return row
+
+
+class ActivityFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.acme = make_tenant()
+        cls.admin = make_user(cls.acme, "admin", Role.ADMIN)
+        cls.receiver = make_user(cls.acme, "receiver", Role.TASK_RECEIVER)
+        cls.board = make_board(cls.acme)
+        cls.other_board = make_board(cls.acme, "Ops")
+        cls.assigned = Task.objects.create(tenant=cls.acme, board=cls.board, title="Assigned", created_by=cls.admin)
+        cls.assigned.assignees.add(cls.receiver)
+        cls.private = Task.objects.create(tenant=cls.acme, board=cls.other_board, title="Private", created_by=cls.admin)
+
+        now = timezone.now()
+        # Three rows share each timestamp, so pages of two split the ties.
+        for step in range(3):
+            timestamp = now - timedelta(minutes=step)
+            add_history(cls.assigned, cls.admin, TaskHistory.Action.UPDATED, timestamp)
+            add_history(cls.private, cls.admin, TaskHistory.Action.UPDATED, timestamp)
+            add_history(cls.assigned, cls.receiver, TaskHistory.Action.COMMENTED, timestamp)
+
+        cls.globex = make_tenant("globex")
+        cls.globex_admin = make_user(cls.globex, "globex-admin", Role.ADMIN)
+        cls.globex_board = make_board(cls.globex)
+        globex_task = Task.objects.create(tenant=cls.globex, board=cls.globex_board, title="Theirs")
+        for step in range(3):
+            add_history(globex_task, cls.globex_admin, TaskHistory.Action.UPDATED, now - timedelta(minutes=step))
+
+    def expected(self, tenant, **filters):
+        return list(
+            TaskHistory.objects.filter(tenant=tenant, **filters)
+            .order_by("-timestamp", "-id")
+            .values_list("id", flat=True)
+        )
+
+    def walk(self, user, role, params=None):
+        """Ids of every page, following next links."""
+        client = api_client(user, role)
+        response = client.get("/api/activity/", {"page_size": 2, **(params or {})})
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            body = response.json()
+            self.assertLessEqual(len(body["results"]), 2)
+            ids += [row["id"] for row in body["results"]]
+            if not body["next"]:
+                return ids
+            response = client.get(body["next"])
+
+    def test_pages_follow_timestamp_then_id(self):
+        ids = self.walk(self.admin, Role.ADMIN)
+        self.assertEqual(len(ids), 9)
+        self.assertEqual(ids, self.expected(self.acme))
+
+    def test_filters(self):
+        self.assertEqual(
+            self.walk(self.admin, Role.ADMIN, {"board": self.board.id}),
+            self.expected(self.acme, task__board=self.board),
+        )
+        self.assertEqual(
+            self.walk(self.admin, Role.ADMIN, {"user": self.receiver.id}),
+            self.expected(self.acme, performed_by=self.receiver),
+        )
+        response = api_client(self.admin, Role.ADMIN).get("/api/activity/", {"board": "ops"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_role_scoping(self):
+        self.assertEqual(self.walk(self.receiver, Role.TASK_RECEIVER), self.expected(self.acme, task=self.assigned))
+
+    def test_tenant_isolation(self):
+        self.assertEqual(self.walk(self.globex_admin, Role.ADMIN), self.expected(self.globex))
+        # Another tenant's ids in filters match nothing rather than leaking.
+        self.assertEqual(self.walk(self.admin, Role.ADMIN, {"board": self.globex_board.id}), [])
+        self.assertEqual(self.walk(self.admin, Role.ADMIN, {"user": self.globex_admin.id}), [])
+
+    def test_invalid_cursor(self):
+        client = api_client(self.admin, Role.ADMIN)
+        for cursor in ("garbage", encode_cursor({"t": "yesterday", "i": 1}), encode_cursor({"i": 1})):
+            self.assertEqual(client.get("/api/activity/", {"cursor": cursor}).status_code, 400)
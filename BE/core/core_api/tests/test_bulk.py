@@ -0,0 +1,156 @@
+"""
+POST /api/tasks/bulk/ (core_api/bulk.py): per-item results, partial
+success, returned versions, no-op items and a query count that does not
+grow with the batch.
+"""
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core_api.models import BoardStatus, Task, TaskHistory
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+BULK = "/api/tasks/bulk/"
+
+
+class BulkTaskMutationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.admin = make_user(cls.tenant, "admin", Role.ADMIN)
+        cls.creator = make_user(cls.tenant, "creator", Role.TASK_CREATOR)
+        cls.receiver = make_user(cls.tenant, "receiver", Role.TASK_RECEIVER)
+        cls.board = make_board(cls.tenant)
+        statuses = BoardStatus.objects.filter(board=cls.board)
+        cls.not_started = statuses.get(name="Not Started")
+        cls.in_progress = statuses.get(name="In Progress")
+        cls.done = statuses.get(name="Done")
+
+    def task(self, title="Task", created_by=None, **fields):
+        fields.setdefault("status", self.not_started)
+        return Task.objects.create(
+            tenant=self.tenant, board=self.board, title=title, created_by=created_by or self.admin, **fields
+        )
+
+    def bulk(self, user, role, items):
+        response = api_client(user, role).post(BULK, {"items": items}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_partial_success_and_per_item_statuses(self):
+        updated, stale, bad_status = self.task("Updated"), self.task("Stale"), self.task("Bad status")
+        Task.objects.filter(pk=stale.pk).update(version=5)
+
+        body = self.bulk(self.admin, Role.ADMIN, [
+            {"id": updated.id, "version": 1, "changes": {"priority": "P2", "status_id": self.in_progress.id}},
+            {"id": stale.id, "version": 1, "changes": {"priority": "P2"}},
+            {"id": 999999, "version": 1, "changes": {"priority": "P2"}},
+            {"id": bad_status.id, "version": 1, "changes": {"status_id": self.done.id}},
+            {"id": updated.id, "version": 1, "changes": {"priority": "P4"}},
+            {"id": bad_status.id, "version": 1, "changes": {"title": "Renamed"}},
+            "not an item",
+        ])
+
+        self.assertEqual([result["status"] for result in body["results"]], [200, 409, 404, 400, 400, 400, 400])
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 6))
+        self.assertEqual(body["results"][0]["version"], 2)
+        self.assertEqual(body["results"][1]["version"], 5)
+        self.assertIn("status", body["results"][3]["errors"])
+
+        updated.refresh_from_db()
+        self.assertEqual((updated.priority, updated.status_id, updated.version), ("P2", self.in_progress.id, 2))
+        self.assertEqual(Task.objects.get(pk=stale.pk).priority, stale.priority)
+        self.assertEqual(
+            list(TaskHistory.objects.filter(tenant=self.tenant).values_list("task_id", flat=True)),
+            [updated.id],
+        )
+
+    def test_role_restrictions(self):
+        own = self.task("Own", created_by=self.creator)
+        admins = self.task("Admin's")
+        orphan = Task.objects.create(
+            tenant=self.tenant, board=self.board, title="Legacy", created_by=None, status=self.not_started
+        )
+        own.assignees.add(self.receiver)
+
+        # Creators see ownerless tasks but may only modify their own.
+        body = self.bulk(self.creator, Role.TASK_CREATOR, [
+            {"id": own.id, "version": own.version, "changes": {"priority": "P2"}},
+            {"id": orphan.id, "version": orphan.version, "changes": {"priority": "P2"}},
+            {"id": admins.id, "version": admins.version, "changes": {"priority": "P2"}},
+        ])
+        self.assertEqual([result["status"] for result in body["results"]], [200, 403, 404])
+
+        own.refresh_from_db()
+        body = self.bulk(self.receiver, Role.TASK_RECEIVER, [
+            {"id": own.id, "version": own.version, "changes": {"status_id": self.in_progress.id}},
+            {"id": own.id, "version": own.version, "changes": {"delete": True}},
+            {"id": admins.id, "version": admins.version, "changes": {"priority": "P4"}},
+            {"id": admins.id, "version": admins.version, "changes": {"status_id": self.in_progress.id}},
+        ])
+        # The last item is not assigned to the receiver, so it is not found.
+        self.assertEqual([result["status"] for result in body["results"]], [200, 403, 403, 404])
+
+    def test_delete_and_assignees(self):
+        deleted, reassigned = self.task("Deleted"), self.task("Reassigned")
+        reassigned.assignees.add(self.creator)
+
+        body = self.bulk(self.admin, Role.ADMIN, [
+            {"id": deleted.id, "version": 1, "changes": {"delete": True}},
+            {"id": reassigned.id, "version": 1, "changes": {"assignee_ids": [self.receiver.id]}},
+        ])
+        self.assertEqual([result["version"] for result in body["results"]], [1, 2])
+        self.assertTrue(Task.objects.get(pk=deleted.pk).is_deleted)
+        self.assertEqual(list(reassigned.assignees.values_list("id", flat=True)), [self.receiver.id])
+
+        receiver_tasks = api_client(self.receiver, Role.TASK_RECEIVER).get("/api/tasks/").json()["results"]
+        self.assertEqual([task["id"] for task in receiver_tasks], [reassigned.id])
+
+    def test_noop_items_write_nothing(self):
+        task = self.task("Unchanged", priority="P2")
+        task.assignees.add(self.receiver)
+        changes = {
+            "priority": "P2",
+            "status_id": self.not_started.id,
+            "assignee_ids": [self.receiver.id],
+            "board": self.board.id,
+        }
+
+        with mock.patch("core_api.bulk.bump_data_version") as bump, \
+                mock.patch("core_api.bulk.publish_task_event") as publish:
+            body = self.bulk(self.admin, Role.ADMIN, [{"id": task.id, "version": 1, "changes": changes}])
+
+        self.assertEqual(body["results"], [{"id": task.id, "status": 200, "version": 1}])
+        self.assertEqual(Task.objects.get(pk=task.pk).version, 1)
+        self.assertFalse(TaskHistory.objects.filter(task=task).exists())
+        bump.assert_not_called()
+        publish.assert_not_called()
+
+        # A stale version is still a conflict, even with nothing to change.
+        body = self.bulk(self.admin, Role.ADMIN, [{"id": task.id, "version": 0, "changes": changes}])
+        self.assertEqual(body["results"][0]["status"], 409)
+
+    def test_queries_do_not_grow_with_batch_size(self):
+        assignee = make_user(self.tenant, "assignee", Role.TASK_RECEIVER)
+
+        def run(count):
+            tasks = [self.task(f"Batch {count}.{n}") for n in range(count)]
+            for task in tasks:
+                task.assignees.add(assignee)
+            items = [
+                {"id": task.id, "version": 1, "changes": {"status_id": self.in_progress.id, "priority": "P2"}}
+                for task in tasks
+            ]
+            client = api_client(self.admin, Role.ADMIN)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.post(BULK, {"items": items}, format="json")
+            self.assertEqual(response.json()["succeeded"], count)
+            return len(queries.captured_queries)
+
+        run(1)  # warm per-process caches
+        self.assertEqual(run(2), run(20))
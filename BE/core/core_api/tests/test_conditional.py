@@ -0,0 +1,77 @@
+"""
+Conditional GET on the task endpoints (core_api/conditional.py): ETags
+round-trip to 304, change with the data and the caller's role, and never
+let a 304 stand in for a 404 or 403.
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+
+from core_api.models import Task
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role, UserRole
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.admin = make_user(self.tenant, "admin", Role.ADMIN, Role.TASK_CREATOR)
+        self.creator = make_user(self.tenant, "creator", Role.TASK_CREATOR)
+        board = make_board(self.tenant)
+        self.task = Task.objects.create(tenant=self.tenant, board=board, title="Draft", created_by=self.admin)
+        # Creators see ownerless tasks in lists but may not open them.
+        self.ownerless = Task.objects.create(tenant=self.tenant, board=board, title="Legacy", created_by=None)
+        self.client = api_client(self.admin, Role.ADMIN)
+        self.detail = f"/api/tasks/{self.task.id}/"
+
+    def get(self, path, etag=None, client=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return (client or self.client).get(path, **headers)
+
+    def test_etag_round_trip(self):
+        for path in ("/api/tasks/", self.detail):
+            response = self.get(path)
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+            response = self.get(path, etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response["ETag"], etag)
+            self.assertEqual(self.get(path, f"W/{etag}").status_code, 304)
+
+    def test_etag_changes_after_update(self):
+        list_etag = self.get("/api/tasks/")["ETag"]
+        detail_etag = self.get(self.detail)["ETag"]
+
+        response = self.client.patch(self.detail, {"title": "Final", "version": self.task.version}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.get(self.detail, detail_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Final")
+        self.assertEqual(self.get("/api/tasks/", list_etag).status_code, 200)
+
+        self.task.assignees.add(self.creator)
+        self.assertEqual(self.get(self.detail, response["ETag"]).status_code, 200)
+
+    def test_etag_changes_with_role(self):
+        etag = self.get("/api/tasks/")["ETag"]
+        as_creator = api_client(self.admin, Role.TASK_CREATOR)
+        self.assertEqual(self.get("/api/tasks/", etag, client=as_creator).status_code, 200)
+
+        UserRole.objects.filter(user=self.admin, role__name=Role.ADMIN).delete()
+        self.assertNotEqual(self.get("/api/tasks/", etag).status_code, 304)
+
+    def test_wildcard_is_not_a_match(self):
+        self.assertEqual(self.get(self.detail, "*").status_code, 200)
+        self.assertEqual(self.get("/api/tasks/", "*").status_code, 200)
+        self.assertEqual(self.get("/api/tasks/999999/", "*").status_code, 404)
+
+    def test_matching_etag_never_hides_404_or_403(self):
+        as_creator = api_client(self.creator, Role.TASK_CREATOR)
+        with mock.patch("core_api.conditional.etag_matches", return_value=True):
+            self.assertEqual(self.get("/api/tasks/999999/", '"x"').status_code, 404)
+            self.assertEqual(self.get(f"/api/tasks/{self.task.id}/", '"x"', client=as_creator).status_code, 404)
+            self.assertEqual(self.get(f"/api/tasks/{self.ownerless.id}/", '"x"', client=as_creator).status_code, 403)
+            self.assertEqual(self.get(self.detail, '"x"').status_code, 304)
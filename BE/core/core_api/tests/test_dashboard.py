@@ -0,0 +1,116 @@
+"""
+AdminDashboardView and DashboardWidgetsView (core_api/views_admin.py):
+KPIs agree with the task table, and the number of queries does not grow
+with tasks, statuses or boards, with and without the status rollup
+(core_api/kpis.py, core_api/rollups.py).
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core_api import rollups
+from core_api.models import BoardStatus, Task
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+ADMIN_DASHBOARD = "/api/admin/dashboard/"
+WIDGETS = "/api/dashboard/widgets/"
+
+
+def add_tasks(tenant, board, counts, **fields):
+    """Creates counts[status_name] live tasks in each of the board's statuses."""
+    statuses = {s.name: s for s in BoardStatus.objects.filter(board=board)}
+    for name, count in counts.items():
+        for n in range(count):
+            Task.objects.create(tenant=tenant, board=board, status=statuses[name], title=f"{name} {n}", **fields)
+
+
+@override_settings(TASK_STATUS_ROLLUP=False, DASHBOARD_WIDGET_CACHE_SECONDS=0)
+class DashboardTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.admin = make_user(cls.tenant, "admin", Role.ADMIN)
+        make_user(cls.tenant, "receiver", Role.TASK_RECEIVER, is_active=False)
+        cls.board = make_board(cls.tenant)
+        add_tasks(cls.tenant, cls.board, {"In Progress": 2, "Blocked": 1, "Done": 3, "Cancelled": 1})
+        add_tasks(cls.tenant, cls.board, {"In Progress": 1}, due_date=timezone.now() - timedelta(days=1))
+        add_tasks(cls.tenant, cls.board, {"Done": 1}, due_date=timezone.now() - timedelta(days=1))
+        add_tasks(cls.tenant, cls.board, {"Blocked": 4}, is_deleted=True)
+        # Another tenant's tasks never count.
+        other = make_tenant("globex")
+        add_tasks(other, make_board(other), {"In Progress": 5})
+
+    def get(self, path):
+        response = api_client(self.admin, Role.ADMIN).get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def queries(self, path):
+        with CaptureQueriesContext(connection) as captured:
+            self.get(path)
+        return len(captured.captured_queries)
+
+    def test_admin_dashboard_kpis(self):
+        body = self.get(ADMIN_DASHBOARD)
+        self.assertEqual(body["kpis"], {
+            "total_users": 2,
+            "active_users": 1,
+            "active_tasks": 3,
+            "blocked_tasks": 1,
+            "completion_rate": 44.4,
+        })
+        self.assertEqual(
+            {row["name"]: row["count"] for row in body["status_overview"]},
+            {"In Progress": 3, "Blocked": 1, "Done": 4, "Cancelled": 1},
+        )
+
+    def test_widget_kpis(self):
+        widgets = {widget["key"]: widget for widget in self.get(WIDGETS)["widgets"]}
+        self.assertEqual(widgets["tasks_overdue"]["value"], 1)
+        self.assertEqual(widgets["active_tasks"]["value"], 3)
+        self.assertEqual(widgets["completion_rate"]["value"], 44.4)
+        self.assertEqual(
+            widgets["workflow_stage_distribution"]["data"],
+            [
+                {"status__name": "Blocked", "count": 1},
+                {"status__name": "Cancelled", "count": 1},
+                {"status__name": "Done", "count": 4},
+                {"status__name": "In Progress", "count": 3},
+            ],
+        )
+
+    def test_queries_do_not_grow_with_tasks_or_statuses(self):
+        for index, path in enumerate((ADMIN_DASHBOARD, WIDGETS)):
+            with self.subTest(path=path):
+                self.queries(path)  # warm per-process caches and the rollup
+                before = self.queries(path)
+                board = make_board(self.tenant, f"Extra{index}")
+                add_tasks(self.tenant, board, {"Not Started": 3, "In Review": 2, "Done": 2})
+                for task in Task.objects.filter(board=board):
+                    task.assignees.add(self.admin)
+                self.assertEqual(self.queries(path), before)
+
+
+@override_settings(TASK_STATUS_ROLLUP=True, DASHBOARD_WIDGET_CACHE_SECONDS=0)
+class RollupDashboardTests(DashboardTests):
+
+    def test_rollup_is_built_once(self):
+        tenant = make_tenant("initech")
+        self.admin = make_user(tenant, "initech-admin", Role.ADMIN)
+        with mock.patch("core_api.kpis.rebuild_status_rollup", wraps=rollups.rebuild_status_rollup) as rebuild:
+            for _ in range(2):
+                self.assertEqual(self.get(ADMIN_DASHBOARD)["kpis"]["completion_rate"], 0)
+                self.assertEqual(self.get(WIDGETS)["widgets"][1]["value"], 0)
+        self.assertEqual(rebuild.call_count, 1)
+
+        add_tasks(tenant, make_board(tenant), {"Done": 1})
+        with mock.patch("core_api.kpis.rebuild_status_rollup") as rebuild:
+            self.assertEqual(self.get(ADMIN_DASHBOARD)["kpis"]["completion_rate"], 100.0)
+        rebuild.assert_not_called()
@@ -0,0 +1,100 @@
+"""
+TaskSerializer.setup_eager_loading: the task list runs the same number of
+queries at any page size, and the eager-loaded fields serialize exactly
+like the per-object fallbacks.
+"""
+
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core_api.models import Task, TaskAssignee
+from core_api.serializers import TaskSerializer
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+from workflows.models import Workflow, WorkflowStage
+
+
+def as_json(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+class TaskEagerLoadingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        tenant = make_tenant()
+        cls.admin = make_user(tenant, "admin", Role.ADMIN)
+        ada = make_user(tenant, "ada", Role.TASK_RECEIVER)
+        bob = make_user(tenant, "bob", Role.TASK_RECEIVER)
+        board = make_board(tenant)
+        workflow = Workflow.objects.create(tenant=tenant, name="Review")
+        stage = WorkflowStage.objects.create(workflow=workflow, name="Draft", order=1)
+
+        now = timezone.now()
+        for n in range(12):
+            task = Task.objects.create(
+                tenant=tenant,
+                board=board,
+                title=f"Task {n}",
+                created_by=cls.admin,
+                workflow=workflow if n % 2 else None,
+                stage=stage if n % 2 else None,
+            )
+            if n % 3 == 0:
+                # bob is assigned second but earlier, so assigned_to is bob.
+                TaskAssignee.objects.create(task=task, user=ada, assigned_by=cls.admin)
+                TaskAssignee.objects.create(task=task, user=bob, assigned_by=cls.admin)
+                TaskAssignee.objects.filter(task=task, user=bob).update(assigned_at=now - timedelta(hours=1))
+            elif n % 3 == 1:
+                TaskAssignee.objects.create(task=task, user=ada, assigned_by=cls.admin)
+            if n % 4 == 0:
+                for m in range(n // 4 + 1):
+                    Task.objects.create(
+                        tenant=tenant, board=board, parent=task, title=f"Task {n}.{m}", created_by=cls.admin
+                    )
+                Task.objects.create(
+                    tenant=tenant, board=board, parent=task, title=f"Task {n}.x", created_by=cls.admin,
+                    is_deleted=True,
+                )
+
+    def setUp(self):
+        self.client = api_client(self.admin, Role.ADMIN)
+
+    def list_queries(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tasks/", {"page_size": page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), page_size)
+        return len(queries.captured_queries)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        self.list_queries(1)  # warm per-process caches
+        self.assertEqual(self.list_queries(2), self.list_queries(12))
+
+    def test_eager_fields_match_per_object_fallbacks(self):
+        tasks = Task.objects.order_by("id")
+        eager = as_json(TaskSerializer(TaskSerializer.setup_eager_loading(tasks), many=True).data)
+        plain = as_json(TaskSerializer(list(tasks), many=True).data)
+        self.assertEqual(eager, plain)
+
+        by_id = {task["id"]: task for task in plain}
+        subtask_counts = {task["subtask_count"] for task in plain}
+        self.assertTrue({0, 1, 2, 3} <= subtask_counts)
+        self.assertTrue(any(len(task["assignees"]) == 2 for task in plain))
+        self.assertTrue(any(task["workflow"] is None for task in plain))
+        self.assertTrue(any(task["stage"] for task in plain))
+
+        results = self.client.get("/api/tasks/", {"page_size": 50}).json()["results"]
+        self.assertEqual(len(results), 12)
+        for task in results:
+            expected = by_id[task["id"]]
+            for field in ("subtask_count", "assigned_to", "assignees", "workflow", "stage", "status"):
+                self.assertEqual(task[field], expected[field], field)
+        two_assignees = [task for task in results if len(task["assignees"]) == 2]
+        self.assertTrue(all(task["assigned_to"]["email"] == "bob@acme.test" for task in two_assignees))
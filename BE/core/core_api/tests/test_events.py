@@ -0,0 +1,199 @@
+"""
+Real-time events (core_api/events.py) and the SSE stream (core_api/sse.py):
+who receives which event, broker fan-out, and stream authentication.
+"""
+
+import asyncio
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from context.models import Tenant
+from core_api.events import Event, InProcessBroker, Subscription, get_broker, publish_task_event
+from core_api.models import Task
+from core_api.sse import _events, event_stream
+from core_api.tests.helpers import ConcurrencyTestCase, make_board, make_tenant, make_user
+from users.models import Role
+from users.token_serializer import CustomTokenObtainPairSerializer
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+def access_token(user, lifetime=None):
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    if lifetime is not None:
+        token.set_exp(lifetime=lifetime)
+    return str(token)
+
+
+class SubscriptionTests(TestCase):
+
+    def test_wants(self):
+        async def check():
+            user = Subscription(tenant_id="t", user_id=1)
+            admin = Subscription(tenant_id="t", user_id=2, is_admin=True)
+            for_user = Event("task.updated", "t", {}, user_ids=[1])
+            unaddressed = Event("task.updated", "t", {}, user_ids=[])
+            notification = Event("notification.created", "t", {}, user_ids=[3])
+            return [
+                (user.wants(event), admin.wants(event))
+                for event in (for_user, unaddressed, notification)
+            ]
+
+        self.assertEqual(run(check()), [(True, True), (False, True), (False, False)])
+
+
+class InProcessBrokerTests(TestCase):
+
+    def test_fan_out_by_tenant_and_overflow(self):
+        async def check():
+            broker = InProcessBroker()
+            mine = broker.subscribe(Subscription(tenant_id="a", user_id=1, queue_size=2))
+            theirs = broker.subscribe(Subscription(tenant_id="b", user_id=1))
+            self.assertEqual(broker.subscriber_count(), 2)
+
+            events = [Event("task.updated", "a", {"n": n}, user_ids=[1]) for n in range(3)]
+            for event in events:
+                broker.publish(event)
+            await asyncio.sleep(0)  # deliver() hops through call_soon_threadsafe
+
+            self.assertEqual([event.id for event in events], [1, 2, 3])
+            self.assertEqual([mine.queue.get_nowait().data["n"] for _ in range(2)], [0, 1])
+            self.assertTrue(mine.overflowed)
+            self.assertTrue(theirs.queue.empty())
+
+            broker.unsubscribe(mine)
+            broker.unsubscribe(theirs)
+            self.assertEqual(broker.subscriber_count(), 0)
+
+        run(check())
+
+    def test_stream_ends_when_token_expires(self):
+        async def check():
+            subscription = Subscription(tenant_id="a", user_id=1)
+            return [chunk async for chunk in _events(subscription, expires_at=0)]
+
+        chunks = run(check())
+        self.assertTrue(chunks[0].startswith("retry:"))
+        self.assertIn("event: ready", chunks[1])
+        self.assertIn("event: token_expired", chunks[-1])
+
+
+class PublishTaskEventTests(TestCase):
+
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.board = make_board(self.tenant)
+        self.admin = make_user(self.tenant, "admin", Role.ADMIN)
+        self.ada = make_user(self.tenant, "ada", Role.TASK_RECEIVER)
+
+    def audience(self, task, **kwargs):
+        with mock.patch("core_api.events.publish") as publish:
+            publish_task_event(task, "updated", **kwargs)
+        return publish.call_args.args[0].user_ids
+
+    def test_audience(self):
+        task = Task.objects.create(tenant=self.tenant, board=self.board, title="Owned", created_by=self.admin)
+        task.assignees.add(self.ada)
+        self.assertEqual(self.audience(task), {self.admin.id, self.ada.id})
+        self.assertEqual(self.audience(task, assignee_ids=[], extra_user_ids=[self.ada.id]), {self.admin.id, self.ada.id})
+
+    def test_unowned_unassigned_task_is_not_broadcast(self):
+        task = Task.objects.create(tenant=self.tenant, board=self.board, title="Legacy", created_by=None)
+        self.assertEqual(self.audience(task), frozenset())
+
+
+# The token check runs on another thread (sync_to_async), so the rows it
+# reads must be committed, and that thread's persistent connection is
+# closed afterwards so the test database can be dropped.
+@override_settings(TENANT_CACHE_SECONDS=0)
+@mock.patch("core_api.sse.close_old_connections", connections.close_all)
+class EventStreamTests(TransactionTestCase):
+
+    available_apps = ConcurrencyTestCase.available_apps
+
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.user = make_user(self.tenant, "ada", Role.TASK_RECEIVER)
+
+    def stream(self, headers=(), query=b"", events=()):
+        """
+        Opens the stream and returns (status, body). Once it is ready the
+        `events` are published, and the client disconnects after the last
+        one arrives; without events it reads until the server closes.
+        """
+        async def call():
+            messages = []
+            received = asyncio.Condition()
+            disconnect = asyncio.Event()
+
+            async def receive():
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                async with received:
+                    messages.append(message)
+                    received.notify_all()
+
+            def body():
+                return b"".join(message.get("body", b"") for message in messages[1:]).decode()
+
+            scope = {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/events/",
+                "query_string": query,
+                "headers": [(name.encode(), value.encode()) for name, value in headers],
+            }
+            stream = asyncio.create_task(event_stream(scope, receive, send))
+            if events:
+                async with received:
+                    await received.wait_for(lambda: "event: ready" in body())
+                for event in events:
+                    get_broker().publish(event)
+                last = f'"id":{events[-1].data["id"]}'
+                async with received:
+                    await received.wait_for(lambda: last in body())
+                disconnect.set()
+            await stream
+            return messages[0]["status"], body()
+
+        return run(call())
+
+    def test_missing_and_invalid_tokens(self):
+        self.assertEqual(self.stream()[0], 401)
+        self.assertEqual(self.stream(headers=[("authorization", "Bearer nope")])[0], 401)
+        self.assertEqual(self.stream(query=b"token=nope")[0], 401)
+
+    def test_header_token_receives_own_events(self):
+        status, body = self.stream(
+            headers=[("authorization", f"Bearer {access_token(self.user)}")],
+            events=[
+                Event("task.updated", self.tenant.id, {"id": 1}, user_ids=[self.user.id + 1]),
+                Event("task.updated", make_tenant("globex").id, {"id": 2}, user_ids=[self.user.id]),
+                Event("task.updated", self.tenant.id, {"id": 3}, user_ids=[self.user.id]),
+            ],
+        )
+        self.assertEqual(status, 200)
+        self.assertNotIn('"id":1', body)
+        self.assertNotIn('"id":2', body)
+        self.assertIn('event: task.updated\ndata: {"id":3}', body)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    def test_query_token_and_expiry_close(self):
+        status, body = self.stream(query=f"token={access_token(self.user, timedelta(seconds=1))}".encode())
+        self.assertEqual(status, 200)
+        events = [line.removeprefix("event: ") for line in body.splitlines() if line.startswith("event: ")]
+        self.assertEqual(events, ["ready", "token_expired"])
+        self.assertEqual(json.loads(body.split("data: ")[1].split("\n")[0]), {"user": self.user.id})
+
+    def test_inactive_tenant_is_refused(self):
+        Tenant.objects.filter(pk=self.tenant.pk).update(status="suspended")
+        status, body = self.stream(headers=[("authorization", f"Bearer {access_token(self.user)}")])
+        self.assertEqual((status, json.loads(body)), (403, {"error": "Tenant suspended"}))
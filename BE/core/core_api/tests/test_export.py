@@ -0,0 +1,49 @@
+"""
+GET /api/tasks/export/ (core_api/export.py): subtasks are exported with
+their parent_id, within the same role scoping as the task list.
+"""
+
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from core_api.models import Task
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+
+class TaskExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        tenant = make_tenant()
+        cls.admin = make_user(tenant, "admin", Role.ADMIN)
+        cls.receiver = make_user(tenant, "receiver", Role.TASK_RECEIVER)
+        board = make_board(tenant)
+        cls.parent = Task.objects.create(tenant=tenant, board=board, title="Parent", created_by=cls.admin)
+        cls.subtask = Task.objects.create(
+            tenant=tenant, board=board, title="Subtask", parent=cls.parent, created_by=cls.admin
+        )
+        Task.objects.create(
+            tenant=tenant, board=board, title="Deleted", parent=cls.parent, created_by=cls.admin, is_deleted=True
+        )
+        cls.subtask.assignees.add(cls.receiver)
+
+    def export(self, user, role, output):
+        response = api_client(user, role).get("/api/tasks/export/", {"output": output})
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_includes_subtasks_with_parent_id(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(self.admin, Role.ADMIN, "csv"))))
+        self.assertEqual(
+            {row["title"]: row["parent_id"] for row in rows},
+            {"Parent": "", "Subtask": str(self.parent.id)},
+        )
+
+    def test_ndjson_is_role_scoped(self):
+        records = [json.loads(line) for line in self.export(self.receiver, Role.TASK_RECEIVER, "ndjson").splitlines()]
+        self.assertEqual([(record["id"], record["parent_id"]) for record in records], [(self.subtask.id, self.parent.id)])
+        self.assertEqual(records[0]["assignees"], [self.receiver.email])
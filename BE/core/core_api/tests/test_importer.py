@@ -0,0 +1,148 @@
+"""
+Task import (core_api/importer.py): CSV/JSON/NDJSON parsing, the per-row
+error report, dry runs, derived rows for bulk-created tasks, and ref
+allocation inside each chunk's transaction.
+"""
+
+import io
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase
+
+from core_api.importer import ImportFormatError, TaskImporter, read_rows
+from core_api.models import OrganizationProfile, Task, TaskHistory
+from core_api.refs import allocator
+from core_api.search import search_tasks
+from core_api.tests.helpers import ConcurrencyTestCase, api_client, make_board, make_tenant, make_user
+from core_api.visibility import scope_tasks_for_role
+from users.models import Role
+
+CSV_ROWS = (
+    "title,board,status,priority,assignees,due_date,estimated_hours\n"
+    "Write launch plan,Sprint,In Progress,High,ada@acme.test;bob,2026-11-01,3.5\n"
+    ",Sprint,,,,,\n"
+    "Book venue,Nowhere,,P9,carol,soon,-1\n"
+    "Order badges,,,,,,\n"
+)
+
+
+class ReadRowsTests(TestCase):
+
+    def test_formats(self):
+        self.assertEqual(
+            [row["title"] for row in read_rows(io.StringIO(CSV_ROWS), "csv")],
+            ["Write launch plan", "", "Book venue", "Order badges"],
+        )
+        self.assertEqual(
+            list(read_rows(io.StringIO('[{"title": "A"}, {"title": "B"}]'), "json")),
+            [{"title": "A"}, {"title": "B"}],
+        )
+        self.assertEqual(
+            list(read_rows(io.StringIO('{"title": "A"}\n\n{"title": "B"}\n'), "ndjson")),
+            [{"title": "A"}, {"title": "B"}],
+        )
+
+    def test_malformed_input(self):
+        with self.assertRaisesMessage(ImportFormatError, "Line 2"):
+            list(read_rows(io.StringIO('{"title": "A"}\n{oops\n'), "ndjson"))
+        with self.assertRaisesMessage(ImportFormatError, "must be a list"):
+            list(read_rows(io.StringIO('{"title": "A"}'), "json"))
+        with self.assertRaises(ImportFormatError):
+            list(read_rows(io.StringIO(""), "xml"))
+
+
+class TaskImporterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.admin = make_user(cls.tenant, "admin", Role.ADMIN)
+        cls.ada = make_user(cls.tenant, "ada", Role.TASK_RECEIVER)
+        cls.bob = make_user(cls.tenant, "bob", Role.TASK_RECEIVER)
+        cls.board = make_board(cls.tenant)
+
+    def run_import(self, text, input_format="csv", **options):
+        importer = TaskImporter(tenant=self.tenant, user=self.admin, **options)
+        return importer.run(read_rows(io.StringIO(text), input_format))
+
+    def test_valid_rows_are_imported_and_errors_reported(self):
+        report = self.run_import(CSV_ROWS, chunk_size=2)
+
+        self.assertEqual(
+            {key: report[key] for key in ("total", "valid", "imported", "failed")},
+            {"total": 4, "valid": 2, "imported": 2, "failed": 2},
+        )
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        self.assertEqual(set(report["errors"][0]["errors"]), {"title"})
+        self.assertEqual(
+            set(report["errors"][1]["errors"]),
+            {"board", "priority", "assignees", "due_date", "estimated_hours"},
+        )
+
+        plan = Task.objects.get(title="Write launch plan")
+        self.assertEqual((plan.priority, plan.status.name, plan.board_id), ("P2", "In Progress", self.board.id))
+        self.assertEqual(str(plan.estimated_hours), "3.50")
+        self.assertEqual(set(plan.assignees.all()), {self.ada, self.bob})
+        refs = set(Task.objects.filter(tenant=self.tenant).values_list("ref_id", flat=True))
+        self.assertEqual(len(refs), 2)
+        self.assertNotIn("", refs)
+        self.assertEqual(TaskHistory.objects.filter(tenant=self.tenant).count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        sequence = OrganizationProfile.objects.get(tenant=self.tenant).task_sequence
+        report = self.run_import(CSV_ROWS, dry_run=True)
+
+        self.assertEqual((report["valid"], report["imported"], report["failed"]), (2, 0, 2))
+        self.assertFalse(Task.objects.filter(tenant=self.tenant).exists())
+        self.assertEqual(OrganizationProfile.objects.get(tenant=self.tenant).task_sequence, sequence)
+
+    def test_imported_tasks_get_visibility_and_search_rows(self):
+        self.run_import('{"title": "Quarterly budget", "assignees": ["ada"]}\n{"title": "Unassigned"}\n', "ndjson")
+
+        tenant_tasks = Task.objects.filter(tenant=self.tenant, is_deleted=False)
+        visible = scope_tasks_for_role(tenant_tasks, self.ada, "TASK_RECEIVER")
+        self.assertEqual(list(visible.values_list("title", flat=True)), ["Quarterly budget"])
+        self.assertFalse(scope_tasks_for_role(tenant_tasks, self.bob, "TASK_RECEIVER").exists())
+        self.assertEqual(
+            list(search_tasks(tenant_tasks, "budget", self.tenant.id).values_list("title", flat=True)),
+            ["Quarterly budget"],
+        )
+
+    def test_endpoint(self):
+        client = api_client(self.admin, Role.ADMIN)
+        upload = SimpleUploadedFile("tasks.json", b'[{"title": "From a file"}, {"title": ""}]')
+        response = client.post("/api/tasks/import/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()["imported"], response.json()["failed"]), (1, 1))
+
+        response = client.post("/api/tasks/import/?dry_run=true", {"rows": [{"title": "Dry"}]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Task.objects.filter(title="Dry").exists())
+
+        receiver = api_client(self.ada, Role.TASK_RECEIVER)
+        response = receiver.post("/api/tasks/import/", {"rows": [{"title": "Nope"}]}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+class ImportRollbackTests(TransactionTestCase):
+
+    available_apps = ConcurrencyTestCase.available_apps
+
+    def setUp(self):
+        allocator.reset()
+        self.tenant = make_tenant()
+        self.admin = make_user(self.tenant, "admin", Role.ADMIN)
+        make_board(self.tenant)
+
+    def tearDown(self):
+        allocator.reset()
+
+    def test_failed_chunk_returns_its_refs(self):
+        importer = TaskImporter(tenant=self.tenant, user=self.admin)
+        with mock.patch("core_api.importer.bump_data_version", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                importer.run([{"title": "A"}, {"title": "B"}])
+
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(OrganizationProfile.objects.get(tenant=self.tenant).task_sequence, 0)
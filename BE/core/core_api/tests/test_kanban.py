@@ -0,0 +1,122 @@
+"""
+GET /api/boards/{id}/kanban/ (core_api/kanban.py): per-column limits,
+counts and next cursors, and a query count independent of the number of
+columns and tasks.
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core_api.models import BoardStatus, Task
+from core_api.pagination import encode_cursor
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+
+class KanbanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.admin = make_user(cls.tenant, "admin", Role.ADMIN)
+        cls.receiver = make_user(cls.tenant, "receiver", Role.TASK_RECEIVER)
+        cls.board = make_board(cls.tenant)
+        cls.statuses = list(BoardStatus.objects.filter(board=cls.board).order_by("order", "id"))
+        cls.not_started, cls.in_progress = cls.statuses[0], cls.statuses[1]
+
+        cls.column_ids = {board_status.id: [] for board_status in cls.statuses}
+        for n in range(5):
+            cls.add_task(cls.not_started, order=n % 2)
+        for n in range(3):
+            task = cls.add_task(cls.in_progress, order=0)
+            if n == 0:
+                task.assignees.add(cls.receiver)
+        # Subtasks and soft-deleted tasks are not on the board.
+        parent = Task.objects.get(pk=cls.column_ids[cls.not_started.id][0])
+        Task.objects.create(
+            tenant=cls.tenant, board=cls.board, status=cls.not_started, title="Subtask", parent=parent
+        )
+        Task.objects.create(
+            tenant=cls.tenant, board=cls.board, status=cls.not_started, title="Deleted", is_deleted=True
+        )
+
+    @classmethod
+    def add_task(cls, board_status, order):
+        task = Task.objects.create(
+            tenant=cls.tenant, board=cls.board, status=board_status, order=order,
+            title=f"{board_status.name} {len(cls.column_ids[board_status.id])}", created_by=cls.admin,
+        )
+        cls.column_ids[board_status.id].append(task.id)
+        return task
+
+    def expected(self, status_id):
+        return list(
+            Task.objects.filter(id__in=self.column_ids[status_id])
+            .order_by("order", "-created_at", "id")
+            .values_list("id", flat=True)
+        )
+
+    def kanban(self, params=None, client=None, expected_status=200):
+        client = client or api_client(self.admin, Role.ADMIN)
+        response = client.get(f"/api/boards/{self.board.id}/kanban/", params)
+        self.assertEqual(response.status_code, expected_status, response.content)
+        return response.json()
+
+    def test_columns_counts_and_limit(self):
+        body = self.kanban({"limit": 2})
+
+        self.assertEqual(body["limit"], 2)
+        self.assertEqual([column["status"]["id"] for column in body["columns"]], [s.id for s in self.statuses])
+        for column in body["columns"]:
+            status_id = column["status"]["id"]
+            expected = self.expected(status_id)
+            self.assertEqual(column["count"], len(expected))
+            self.assertEqual([task["id"] for task in column["tasks"]], expected[:2])
+            self.assertEqual(column["next"] is not None, len(expected) > 2)
+
+    def test_next_cursor_walks_one_column(self):
+        column = self.kanban({"limit": 2})["columns"][0]
+        seen = [task["id"] for task in column["tasks"]]
+        client = api_client(self.admin, Role.ADMIN)
+        while column["next"]:
+            response = client.get(column["next"])
+            self.assertEqual(response.status_code, 200)
+            columns = response.json()["columns"]
+            self.assertEqual(len(columns), 1)
+            column = columns[0]
+            self.assertEqual((column["status"]["id"], column["count"]), (self.not_started.id, 5))
+            seen += [task["id"] for task in column["tasks"]]
+        self.assertEqual(seen, self.expected(self.not_started.id))
+
+    def test_role_scoping(self):
+        body = self.kanban(client=api_client(self.receiver, Role.TASK_RECEIVER))
+        counts = {column["status"]["id"]: column["count"] for column in body["columns"]}
+        self.assertEqual(counts[self.in_progress.id], 1)
+        self.assertEqual(sum(counts.values()), 1)
+
+    def test_bad_parameters(self):
+        self.kanban({"status": self.not_started.id, "cursor": "garbage"}, expected_status=400)
+        self.kanban(
+            {"status": self.not_started.id, "cursor": encode_cursor({"o": 10 ** 30, "c": "x", "i": 1})},
+            expected_status=400,
+        )
+        self.kanban({"status": "todo"}, expected_status=400)
+        self.kanban({"status": 999999}, expected_status=404)
+        self.assertEqual(self.kanban({"limit": "lots"})["limit"], 20)
+
+    def test_queries_do_not_grow_with_columns_or_tasks(self):
+        def queries(limit):
+            with CaptureQueriesContext(connection) as captured:
+                self.kanban({"limit": limit})
+            return len(captured.captured_queries)
+
+        queries(2)  # warm per-process caches
+        before = queries(2)
+        for board_status in self.statuses[2:]:
+            for n in range(4):
+                Task.objects.create(
+                    tenant=self.tenant, board=self.board, status=board_status, order=n, title=f"Extra {n}"
+                )
+        self.assertEqual(queries(2), before)
+        self.assertEqual(queries(50), before)
@@ -0,0 +1,135 @@
+"""
+Unread counters (core_api/notification_counters.py) agree with the
+notification table through inserts, mark-read, read-all and coalescing
+merges, and reconcile_notification_counters repairs the ones that don't.
+"""
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from core_api.models import Notification, NotificationCounter, Task
+from core_api.notification_counters import reconcile_counters
+from core_api.tests.helpers import api_client, make_tenant, make_user
+from core_api.tests.test_notifications import notify
+from users.models import Role
+
+
+@override_settings(NOTIFICATION_COALESCE_SECONDS=0, NOTIFICATIONS_DEFER_TO_COMMIT=False)
+class UnreadCounterTests(TestCase):
+
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.recipient = make_user(self.tenant, "recipient", Role.TASK_RECEIVER)
+        self.actor = make_user(self.tenant, "actor", Role.TASK_CREATOR)
+        self.tasks = [
+            Task.objects.create(tenant=self.tenant, title=f"Task {n}", created_by=self.actor)
+            for n in range(3)
+        ]
+        self.client = api_client(self.recipient, Role.TASK_RECEIVER)
+
+    def stored(self):
+        return NotificationCounter.objects.get(user=self.recipient).unread
+
+    def actual(self):
+        return Notification.objects.filter(user=self.recipient, is_read=False).count()
+
+    def api_count(self):
+        return self.client.get("/api/notifications/unread-count/").json()["unread_count"]
+
+    def test_inserts_count_against_the_recipient(self):
+        for task in self.tasks:
+            notify(task, self.recipient, self.actor)
+        notify(self.tasks[0], self.recipient, self.actor)
+
+        self.assertEqual(self.stored(), 4)
+        self.assertEqual(self.api_count(), self.actual())
+        self.assertFalse(NotificationCounter.objects.filter(user=self.actor).exists())
+
+    def test_missing_counter_is_created_from_a_real_count(self):
+        notify(self.tasks[0], self.recipient, self.actor)
+        NotificationCounter.objects.filter(user=self.recipient).delete()
+        notify(self.tasks[1], self.recipient, self.actor)
+        self.assertEqual(self.stored(), 2)
+
+        NotificationCounter.objects.filter(user=self.recipient).delete()
+        self.assertEqual(self.api_count(), 2)
+
+    def test_mark_read_decrements_once(self):
+        for task in self.tasks:
+            notify(task, self.recipient, self.actor)
+        notification = Notification.objects.filter(user=self.recipient).first()
+
+        for _ in range(2):
+            response = self.client.post(f"/api/notifications/{notification.id}/read/")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual((self.stored(), self.actual()), (2, 2))
+
+        other = api_client(self.actor, Role.TASK_CREATOR)
+        self.assertEqual(other.post(f"/api/notifications/{notification.id}/read/").status_code, 404)
+
+    def test_read_all_zeroes_the_counter(self):
+        for task in self.tasks:
+            notify(task, self.recipient, self.actor)
+        notification = Notification.objects.filter(user=self.recipient).first()
+        self.client.post(f"/api/notifications/{notification.id}/read/")
+
+        for _ in range(2):
+            self.assertEqual(self.client.post("/api/notifications/read-all/").status_code, 200)
+        self.assertEqual((self.stored(), self.actual()), (0, 0))
+
+        notify(self.tasks[0], self.recipient, self.actor)
+        self.assertEqual(self.api_count(), 1)
+
+    @override_settings(NOTIFICATION_COALESCE_SECONDS=60)
+    def test_coalescing_merges_leave_the_counter_alone(self):
+        for _ in range(3):
+            notify(self.tasks[0], self.recipient, self.actor)
+        notify(self.tasks[1], self.recipient, self.actor)
+        self.assertEqual((self.stored(), self.actual()), (2, 2))
+
+        self.client.post("/api/notifications/read-all/")
+        notify(self.tasks[0], self.recipient, self.actor)
+        notify(self.tasks[0], self.recipient, self.actor)
+        self.assertEqual((self.stored(), self.actual()), (1, 1))
+
+
+@override_settings(NOTIFICATION_COALESCE_SECONDS=0, NOTIFICATIONS_DEFER_TO_COMMIT=False)
+class ReconcileCountersTests(TestCase):
+
+    def setUp(self):
+        self.acme = make_tenant()
+        self.globex = make_tenant("globex")
+        self.ada = make_user(self.acme, "ada")
+        self.bob = make_user(self.globex, "bob")
+        for user in (self.ada, self.bob):
+            actor = make_user(user.tenant, f"{user.username}-actor")
+            task = Task.objects.create(tenant=user.tenant, title="Report", created_by=actor)
+            for _ in range(2):
+                notify(task, user, actor)
+
+    def unread(self, user):
+        return NotificationCounter.objects.get(user=user).unread
+
+    def test_repairs_drift_and_missing_rows(self):
+        self.assertEqual(reconcile_counters(), 0)
+
+        # A hard delete bypasses decrement_unread().
+        Notification.objects.filter(user=self.ada).first().delete()
+        NotificationCounter.objects.filter(user=self.bob).delete()
+
+        self.assertEqual(reconcile_counters(), 2)
+        self.assertEqual((self.unread(self.ada), self.unread(self.bob)), (1, 2))
+        self.assertEqual(reconcile_counters(), 0)
+
+    def test_command_limits_to_tenant(self):
+        NotificationCounter.objects.filter(user__in=[self.ada, self.bob]).update(unread=9)
+
+        out = StringIO()
+        call_command("reconcile_notification_counters", "--tenant", "globex", stdout=out)
+        self.assertIn("Repaired 1 notification counter(s).", out.getvalue())
+        self.assertEqual((self.unread(self.ada), self.unread(self.bob)), (9, 2))
+
+        with self.assertRaisesMessage(CommandError, "Tenant 'initech' not found."):
+            call_command("reconcile_notification_counters", "--tenant", "initech")
@@ -0,0 +1,85 @@
+"""
+Coalesced notifications (core_api/notifications.py) neither lose events
+nor duplicate rows when several connections notify the same user at once.
+"""
+
+from django.db import connection
+from django.test import TestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+
+from core_api.models import Notification, NotificationCounter, Task
+from core_api.notifications import create_notification
+from core_api.tests.helpers import ConcurrencyTestCase, make_tenant, make_user
+from users.models import User
+
+THREADS = 8
+NOTIFIES_PER_THREAD = 10
+
+
+def notify(task, recipient, actor):
+    return create_notification(
+        recipient=recipient,
+        actor=actor,
+        task=task,
+        kind=Notification.Kind.TASK_STATUS_CHANGED,
+        title=f"Status changed: {task.title}",
+    )
+
+
+@override_settings(NOTIFICATION_COALESCE_SECONDS=60, NOTIFICATIONS_DEFER_TO_COMMIT=False)
+class CoalesceTests(TestCase):
+
+    def setUp(self):
+        tenant = make_tenant()
+        self.recipient = make_user(tenant, "recipient")
+        self.actor = make_user(tenant, "actor")
+        self.task = Task.objects.create(tenant=tenant, title="Write report", created_by=self.actor)
+
+    def test_repeat_events_merge_into_one_unread_row(self):
+        for _ in range(3):
+            notify(self.task, self.recipient, self.actor)
+
+        row = Notification.objects.get(user=self.recipient)
+        self.assertEqual(row.event_count, 3)
+        self.assertEqual(NotificationCounter.objects.get(user=self.recipient).unread, 1)
+
+    def test_read_rows_are_not_merged_into(self):
+        notify(self.task, self.recipient, self.actor)
+        Notification.objects.filter(user=self.recipient).update(is_read=True)
+        notify(self.task, self.recipient, self.actor)
+
+        self.assertEqual(Notification.objects.filter(user=self.recipient).count(), 2)
+
+    @skipUnlessDBFeature("has_select_for_update")
+    def test_locks_counter_rows_not_users(self):
+        with CaptureQueriesContext(connection) as captured:
+            notify(self.task, self.recipient, self.actor)
+            notify(self.task, self.recipient, self.actor)
+
+        locking = [query["sql"] for query in captured.captured_queries if "FOR UPDATE" in query["sql"]]
+        self.assertTrue(any(NotificationCounter._meta.db_table in sql for sql in locking))
+        self.assertFalse(any(f'FROM "{User._meta.db_table}"' in sql for sql in locking))
+        self.assertEqual(NotificationCounter.objects.get(user=self.recipient).unread, 1)
+
+
+@skipUnlessDBFeature("test_db_allows_multiple_connections")
+@override_settings(NOTIFICATION_COALESCE_SECONDS=60, NOTIFICATIONS_DEFER_TO_COMMIT=False)
+class ConcurrentCoalesceTests(ConcurrencyTestCase):
+
+    def setUp(self):
+        tenant = make_tenant()
+        self.recipient = make_user(tenant, "recipient")
+        self.actors = [make_user(tenant, f"actor{index}") for index in range(THREADS)]
+        self.task = Task.objects.create(tenant=tenant, title="Write report", created_by=self.actors[0])
+
+    def test_concurrent_notifies_merge_into_one_row(self):
+        def notify_repeatedly(index):
+            for _ in range(NOTIFIES_PER_THREAD):
+                notify(self.task, self.recipient, self.actors[index])
+
+        self.run_threads(notify_repeatedly, THREADS)
+
+        rows = list(Notification.objects.filter(user=self.recipient))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].event_count, THREADS * NOTIFIES_PER_THREAD)
+        self.assertEqual(NotificationCounter.objects.get(user=self.recipient).unread, 1)
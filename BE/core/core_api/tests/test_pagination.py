@@ -0,0 +1,97 @@
+"""
+Keyset pagination of the task list (?pagination=cursor, core_api/pagination.py).
+"""
+
+import base64
+import json
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core_api.models import Task
+from core_api.pagination import encode_cursor
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+
+class TaskCursorPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        tenant = make_tenant()
+        cls.admin = make_user(tenant, "admin", Role.ADMIN)
+        board = make_board(tenant)
+        tasks = [
+            Task.objects.create(tenant=tenant, board=board, title=f"Task {n}", order=n % 3, created_by=cls.admin)
+            for n in range(11)
+        ]
+        # Every task shares created_at, and most share their order, so only
+        # the id tie-breaker tells them apart.
+        Task.objects.filter(id__in=[task.id for task in tasks]).update(created_at=timezone.now())
+        cls.expected = [
+            task.id for task in sorted(tasks, key=lambda task: (task.order, task.id))
+        ]
+
+    def setUp(self):
+        self.client = api_client(self.admin, Role.ADMIN)
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_forward_walk_has_no_duplicates_or_gaps(self):
+        page = self.get("/api/tasks/", {"pagination": "cursor", "page_size": 3})
+        self.assertIsNone(page["previous"])
+        seen = [task["id"] for task in page["results"]]
+        while page["next"]:
+            page = self.get(page["next"])
+            self.assertIsNotNone(page["previous"])
+            seen += [task["id"] for task in page["results"]]
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_walk_returns_the_same_pages(self):
+        page = self.get("/api/tasks/", {"pagination": "cursor", "page_size": 4})
+        forward = [[task["id"] for task in page["results"]]]
+        while page["next"]:
+            page = self.get(page["next"])
+            forward.append([task["id"] for task in page["results"]])
+
+        backward = [[task["id"] for task in page["results"]]]
+        while page["previous"]:
+            page = self.get(page["previous"])
+            backward.insert(0, [task["id"] for task in page["results"]])
+        self.assertEqual(backward, forward)
+
+    def test_count_modes(self):
+        params = {"pagination": "cursor", "page_size": 3}
+        page = self.get("/api/tasks/", params)
+        self.assertIsNone(page["count"])
+        self.assertFalse(page["count_is_estimate"])
+
+        page = self.get("/api/tasks/", {**params, "count": "exact"})
+        self.assertEqual(page["count"], len(self.expected))
+        self.assertFalse(page["count_is_estimate"])
+
+        page = self.get("/api/tasks/", {**params, "count": "estimate"})
+        self.assertTrue(page["count_is_estimate"])
+        self.assertIsInstance(page["count"], int)
+        self.assertGreaterEqual(page["count"], 0)
+
+    def test_invalid_cursors_are_rejected(self):
+        def raw(payload):
+            return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+        for cursor in [
+            "not-a-cursor!",
+            raw(b"[1, 2]"),
+            raw(b"\xff\xfe"),
+            encode_cursor({"o": 0, "c": "yesterday", "i": 1}),
+            encode_cursor({"o": 0, "c": timezone.now().isoformat()}),
+            encode_cursor({"o": None, "c": timezone.now().isoformat(), "i": 1}),
+            encode_cursor({"o": 10 ** 30, "c": timezone.now().isoformat(), "i": 1}),
+            raw(json.dumps({"o": float("inf"), "c": "2026-01-01T00:00:00Z", "i": 1}).encode()),
+        ]:
+            response = self.client.get("/api/tasks/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertIn("cursor", response.json())
@@ -0,0 +1,69 @@
+"""
+Task refs (core_api/refs.py) stay unique when several connections create
+tasks in the same tenant at once.
+"""
+
+from django.db import transaction
+from django.test import override_settings, skipUnlessDBFeature
+
+from core_api.models import OrganizationProfile, Task
+from core_api.refs import allocate_task_refs, allocator
+from core_api.tests.helpers import ConcurrencyTestCase, make_tenant
+
+THREADS = 8
+TASKS_PER_THREAD = 25
+
+
+class Rollback(Exception):
+    pass
+
+
+@skipUnlessDBFeature("test_db_allows_multiple_connections")
+@override_settings(TASK_REF_LEASE_SIZE=10)
+class ConcurrentTaskRefTests(ConcurrencyTestCase):
+
+    def setUp(self):
+        allocator.reset()
+        self.tenant = make_tenant()
+
+    def tearDown(self):
+        allocator.reset()
+
+    def test_concurrent_creates_get_unique_refs(self):
+        def create_tasks(index):
+            for number in range(TASKS_PER_THREAD):
+                # Mix autocommit creates (shared blocks) with creates inside
+                # transactions, some of which roll back.
+                if number % 3 == 0:
+                    Task.objects.create(tenant=self.tenant, title=f"{index}-{number}")
+                    continue
+                try:
+                    with transaction.atomic():
+                        Task.objects.create(tenant=self.tenant, title=f"{index}-{number}")
+                        if number % 3 == 2:
+                            raise Rollback
+                except Rollback:
+                    pass
+
+        self.run_threads(create_tasks, THREADS)
+
+        refs = list(Task.objects.filter(tenant=self.tenant).values_list("ref_id", flat=True))
+        expected = THREADS * sum(1 for number in range(TASKS_PER_THREAD) if number % 3 != 2)
+        self.assertEqual(len(refs), expected)
+        self.assertEqual(len(set(refs)), len(refs))
+
+        high_water = OrganizationProfile.objects.get(tenant=self.tenant).task_sequence
+        self.assertTrue(all(int(ref.split("-")[1]) <= high_water for ref in refs))
+
+    def test_concurrent_batches_do_not_overlap(self):
+        batches = []
+
+        def allocate(index):
+            for _ in range(5):
+                batches.append(allocate_task_refs(self.tenant.id, 7))
+
+        self.run_threads(allocate, THREADS)
+
+        refs = [ref for batch in batches for ref in batch]
+        self.assertEqual(len(refs), THREADS * 5 * 7)
+        self.assertEqual(len(set(refs)), len(refs))
@@ -0,0 +1,59 @@
+"""
+NotificationPruner (core_api/retention.py) keeps each user's newest
+keep_per_user notifications and never removes unread ones.
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core_api.models import Notification, OrganizationProfile
+from core_api.retention import NotificationPruner
+from core_api.tests.helpers import make_tenant, make_user
+
+
+class PruneOverCapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        OrganizationProfile.objects.filter(tenant=cls.tenant).update(
+            notification_retention_days=30, notification_keep_per_user=5,
+        )
+        cls.busy = make_user(cls.tenant, "busy")
+        cls.quiet = make_user(cls.tenant, "quiet")
+
+    def notify(self, user, count, age_days=1, is_read=True):
+        created_at = timezone.now() - timedelta(days=age_days)
+        rows = Notification.objects.bulk_create([
+            Notification(tenant=self.tenant, user=user, kind=Notification.Kind.TASK_ASSIGNED,
+                         title=f"n{index}", is_read=is_read)
+            for index in range(count)
+        ])
+        for offset, row in enumerate(rows):
+            # auto_now_add ignores the value passed to bulk_create().
+            Notification.objects.filter(id=row.id).update(created_at=created_at - timedelta(seconds=offset))
+        return [row.id for row in rows]
+
+    def test_keeps_newest_and_unread(self):
+        newest = self.notify(self.busy, 5)
+        older = self.notify(self.busy, 4, age_days=2)
+        unread_older = self.notify(self.busy, 2, age_days=3, is_read=False)
+        quiet = self.notify(self.quiet, 3, age_days=2)
+
+        report = NotificationPruner(batch_size=2).prune_tenant(self.tenant)
+
+        self.assertEqual(report["over_cap"], len(older))
+        self.assertEqual(report["expired"], 0)
+        remaining = set(Notification.objects.filter(tenant=self.tenant).values_list("id", flat=True))
+        self.assertEqual(remaining, set(newest) | set(unread_older) | set(quiet))
+
+    def test_expired_rows_are_not_counted_twice(self):
+        self.notify(self.busy, 6)
+        self.notify(self.busy, 3, age_days=40)
+
+        report = NotificationPruner(dry_run=True).prune_tenant(self.tenant)
+
+        self.assertEqual((report["expired"], report["over_cap"]), (3, 1))
+        self.assertEqual(Notification.objects.filter(tenant=self.tenant).count(), 9)
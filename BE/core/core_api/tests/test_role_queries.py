@@ -0,0 +1,89 @@
+"""
+RoleContext (users/roles.py) resolves a request's roles with at most one
+UserRole query, however many permission classes, views and serializers
+ask for them.
+"""
+
+from django.test import TestCase, override_settings
+
+from core_api.tests.helpers import api_client, count_queries, make_board, make_tenant, make_user
+from users.models import Role
+from workflows.models import ModuleDefinition, TenantModule
+
+USER_ROLE_TABLE = "users_userrole"
+
+
+# With the snapshot cache on, CachedJWTAuthentication hands the roles over
+# and RoleContext runs no query at all; pin it off to count RoleContext's.
+@override_settings(USER_AUTH_CACHE_SECONDS=0)
+class RoleQueriesPerRequestTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.board = make_board(cls.tenant)
+        cls.admin = make_user(cls.tenant, "admin", Role.ADMIN, Role.TASK_CREATOR)
+        cls.receiver = make_user(cls.tenant, "receiver", Role.TASK_RECEIVER)
+        cls.module = ModuleDefinition.objects.create(
+            key="time-tracking", name="Time tracking", description="", category="work",
+        )
+
+    def assertOneRoleQuery(self, request, expected_status):
+        response, role_queries = count_queries(USER_ROLE_TABLE, request)
+        self.assertEqual(response.status_code, expected_status, response.content)
+        self.assertEqual(role_queries, 1)
+        return response
+
+    def test_task_patch(self):
+        client = api_client(self.admin, Role.ADMIN)
+        task = client.post(
+            "/api/tasks/",
+            {"title": "Draft", "board": self.board.id, "assignee_ids": [self.receiver.id]},
+            format="json",
+        ).json()
+
+        response = self.assertOneRoleQuery(
+            lambda: client.patch(
+                f"/api/tasks/{task['id']}/", {"title": "Final", "version": task["version"]}, format="json"
+            ),
+            200,
+        )
+        self.assertEqual(response.json()["title"], "Final")
+
+    def test_is_admin_role_views(self):
+        client = api_client(self.admin, Role.ADMIN)
+        self.assertOneRoleQuery(lambda: client.get("/api/dashboard/widgets/cache-stats/"), 200)
+        self.assertOneRoleQuery(
+            lambda: client.patch(f"/api/divisions/{self.board.division_id}/", {"name": "Eng"}, format="json"),
+            200,
+        )
+
+    def test_is_admin_role_rejects_with_one_query(self):
+        client = api_client(self.receiver, Role.TASK_RECEIVER)
+        self.assertOneRoleQuery(lambda: client.get("/api/admin/dashboard/"), 403)
+
+    def test_dashboard_config_patch(self):
+        client = api_client(self.admin, Role.ADMIN)
+        response = self.assertOneRoleQuery(
+            lambda: client.patch(
+                "/api/dashboard/config/", {"scope_key": "home", "auto_refresh_seconds": 60}, format="json"
+            ),
+            200,
+        )
+        self.assertEqual(response.json()["auto_refresh_seconds"], 60)
+
+    def test_tenant_module_partial_update(self):
+        tenant_module = TenantModule.objects.create(tenant=self.tenant, module=self.module, is_enabled=False)
+        client = api_client(self.admin, Role.ADMIN)
+        self.assertOneRoleQuery(
+            lambda: client.patch(f"/api/modules/{tenant_module.id}/", {"is_enabled": True}, format="json"),
+            200,
+        )
+        tenant_module.refresh_from_db()
+        self.assertTrue(tenant_module.is_enabled)
+
+        client = api_client(self.receiver, Role.TASK_RECEIVER)
+        self.assertOneRoleQuery(
+            lambda: client.patch(f"/api/modules/{tenant_module.id}/", {"is_enabled": False}, format="json"),
+            403,
+        )
@@ -0,0 +1,99 @@
+"""
+Task full-text search (core_api/search.py, migration 0010): ranking, index
+sync on save and delete, and the icontains fallback. Runs against FTS5 on
+SQLite and tsvector on PostgreSQL, whichever backs the test database.
+"""
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from core_api import search
+from core_api.models import Task
+from core_api.search import SEARCH_TABLE, search_backend, search_tasks
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from users.models import Role
+
+
+class TaskSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.admin = make_user(cls.tenant, "admin", Role.ADMIN)
+        board = make_board(cls.tenant)
+
+        def task(title, description=""):
+            return Task.objects.create(
+                tenant=cls.tenant, board=board, title=title, description=description, created_by=cls.admin
+            )
+
+        cls.in_title = task("Quarterly budget review", "Numbers for the board meeting")
+        cls.in_description = task("Meeting notes", "We went over the budget briefly")
+        cls.unrelated = task("Office plants", "Water them on Fridays")
+        other = make_tenant("globex")
+        Task.objects.create(tenant=other, board=make_board(other), title="Budget for globex")
+
+    def search(self, query):
+        qs = search_tasks(Task.objects.filter(tenant=self.tenant, is_deleted=False), query, self.tenant.id)
+        return list(qs.order_by("-search_rank", "id").values_list("id", flat=True))
+
+    def index_rows(self, task):
+        key = "task_id" if search_backend() == "postgresql" else "rowid"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {key} = %s", [task.id])
+            return cursor.fetchone()[0]
+
+    def test_backend_matches_database(self):
+        if connection.vendor == "postgresql":
+            self.assertEqual(search_backend(), "postgresql")
+        elif connection.vendor == "sqlite":
+            # None only on SQLite builds without FTS5.
+            self.assertIn(search_backend(), {"sqlite", None})
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search("budget"), [self.in_title.id, self.in_description.id])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search("budget meeting"), [self.in_title.id, self.in_description.id])
+        self.assertEqual(self.search("budget fridays"), [])
+        self.assertEqual(self.search("plants"), [self.unrelated.id])
+
+    def test_ref_id_and_punctuation(self):
+        ref_id = self.unrelated.ref_id
+        self.assertIn(self.unrelated.id, self.search(ref_id))
+        self.assertEqual(self.search('"budget* OR) NEAR('), [])
+        self.assertEqual(self.search("  ?! "), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        task = self.unrelated
+        task.title = "Budget plants"
+        task.save()
+        self.assertIn(task.id, self.search("budget"))
+        self.assertEqual(self.search("office"), [])
+
+        task.is_deleted = True
+        task.save()
+        self.assertNotIn(task.id, self.search("budget"))
+        if search_backend():
+            self.assertEqual(self.index_rows(task), 0)
+
+        self.in_description.delete()
+        self.assertEqual(self.search("budget"), [self.in_title.id])
+        if search_backend():
+            self.assertEqual(self.index_rows(self.in_description), 0)
+
+    def test_icontains_fallback(self):
+        with mock.patch.object(search, "search_backend", return_value=None):
+            self.assertEqual(self.search("budget"), [self.in_title.id, self.in_description.id])
+            self.assertEqual(self.search("udge meet"), [self.in_title.id, self.in_description.id])
+            self.assertEqual(self.search("budget fridays"), [])
+
+    def test_endpoint_orders_by_rank(self):
+        response = api_client(self.admin, Role.ADMIN).get("/api/tasks/", {"search": "budget"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [task["id"] for task in response.json()["results"]],
+            [self.in_title.id, self.in_description.id],
+        )
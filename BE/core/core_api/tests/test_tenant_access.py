@@ -0,0 +1,60 @@
+"""
+API requests check their tenant once, during DRF authentication, and the
+hot paths filter on tenant_id: a warm request runs no context_tenant query.
+"""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from context.models import Tenant
+from core_api.models import Task
+from core_api.tests.helpers import api_client, count_queries, make_board, make_tenant, make_user
+from users.models import Role
+
+
+@override_settings(TENANT_CACHE_SECONDS=30, USER_AUTH_CACHE_SECONDS=0)
+class TenantAccessTests(TestCase):
+
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.admin = make_user(self.tenant, "admin", Role.ADMIN)
+        self.board = make_board(self.tenant)
+        Task.objects.create(tenant=self.tenant, board=self.board, title="Write report", created_by=self.admin)
+        self.client = api_client(self.admin, Role.ADMIN)
+
+    def assertNoTenantQuery(self, path, params=None):
+        self.assertEqual(self.client.get(path, params).status_code, 200)  # warms the tenant cache
+        response, queries = count_queries(Tenant._meta.db_table, lambda: self.client.get(path, params))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 0, path)
+
+    def test_hot_paths_run_no_tenant_query(self):
+        self.assertNoTenantQuery("/api/tasks/")
+        self.assertNoTenantQuery("/api/tasks/", {"search": "report"})
+        self.assertNoTenantQuery("/api/tasks/changes/")
+        self.assertNoTenantQuery(f"/api/boards/{self.board.id}/kanban/")
+        self.assertNoTenantQuery("/api/notifications/")
+        self.assertNoTenantQuery("/api/notifications/unread-count/")
+
+    def test_token_is_validated_once(self):
+        with mock.patch.object(
+            JWTAuthentication,
+            "get_validated_token",
+            autospec=True,
+            side_effect=JWTAuthentication.get_validated_token,
+        ) as validate:
+            self.assertEqual(self.client.get("/api/tasks/").status_code, 200)
+        self.assertEqual(validate.call_count, 1)
+
+    @override_settings(TENANT_CACHE_SECONDS=0)
+    def test_suspended_tenant_is_refused(self):
+        Tenant.objects.filter(pk=self.tenant.pk).update(status="suspended")
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"error": "Tenant suspended"})
+
+    def test_invalid_token_is_unauthorized(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        self.assertEqual(self.client.get("/api/tasks/").status_code, 401)
@@ -0,0 +1,121 @@
+"""
+TaskVisibility (core_api/visibility.py) stays equal to the original
+per-role scoping as assignees, creators and deletions change, and the
+rebuild_task_visibility command produces the rows the signals maintain.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Q
+from django.test import TestCase
+
+from core_api.models import Task, TaskVisibility
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from core_api.visibility import scope_tasks_for_role
+from users.models import Role
+
+ROLES = ("TASK_RECEIVER", "TASK_CREATOR", "ADMIN")
+
+
+class TaskVisibilityTests(TestCase):
+
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.board = make_board(self.tenant)
+        self.admin = make_user(self.tenant, "admin", Role.ADMIN, Role.TASK_CREATOR)
+        self.ada = make_user(self.tenant, "ada", Role.TASK_RECEIVER, Role.TASK_CREATOR)
+        self.bob = make_user(self.tenant, "bob", Role.TASK_RECEIVER)
+        self.users = [self.admin, self.ada, self.bob]
+
+        self.mine = self.task("Admin's", created_by=self.admin)
+        self.theirs = self.task("Ada's", created_by=self.ada)
+        self.orphan = self.task("Legacy", created_by=None)
+        other_tenant = make_tenant("globex")
+        Task.objects.create(
+            tenant=other_tenant, board=make_board(other_tenant), title="Elsewhere", created_by=None
+        )
+
+    def task(self, title, **fields):
+        return Task.objects.create(tenant=self.tenant, board=self.board, title=title, **fields)
+
+    def original_scope(self, user, role):
+        """The Exists/M2M filters TaskVisibility replaced."""
+        qs = Task.objects.filter(tenant=self.tenant, is_deleted=False)
+        if role == "TASK_RECEIVER":
+            qs = qs.filter(Q(assignees=user) | Q(created_by__isnull=True, assignees__isnull=True))
+        elif role == "TASK_CREATOR":
+            qs = qs.filter(Q(created_by=user) | Q(created_by__isnull=True))
+        return set(qs.values_list("id", flat=True))
+
+    def assertScopesMatch(self):
+        for user in self.users:
+            for role in ROLES:
+                visible = scope_tasks_for_role(
+                    Task.objects.filter(tenant_id=user.tenant_id, is_deleted=False), user, role
+                )
+                ids = list(visible.values_list("id", flat=True))
+                self.assertEqual(len(ids), len(set(ids)), (user.username, role))
+                self.assertEqual(set(ids), self.original_scope(user, role), (user.username, role))
+
+    def visibility_rows(self):
+        return set(
+            TaskVisibility.objects.filter(tenant=self.tenant)
+            .values_list("task_id", "user_id", "scope", "is_deleted")
+        )
+
+    def test_initial_rows(self):
+        self.assertScopesMatch()
+
+    def test_assignee_added_and_removed(self):
+        self.mine.assignees.add(self.bob)
+        self.orphan.assignees.add(self.ada, self.bob)
+        self.assertScopesMatch()
+
+        self.orphan.assignees.remove(self.ada)
+        self.assertScopesMatch()
+        self.orphan.assignees.clear()
+        self.assertScopesMatch()
+
+        self.mine.assignees.add(self.ada)
+        self.bob.tasks_assigned.clear()
+        self.assertScopesMatch()
+
+    def test_reassign_through_api(self):
+        client = api_client(self.admin, Role.ADMIN)
+        self.mine.assignees.add(self.ada)
+        for assignee_ids in ([self.bob.id], [self.ada.id, self.bob.id], []):
+            version = Task.objects.get(pk=self.mine.pk).version
+            response = client.patch(
+                f"/api/tasks/{self.mine.id}/",
+                {"assignee_ids": assignee_ids, "version": version},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertScopesMatch()
+
+        self.theirs.created_by = None
+        self.theirs.save()
+        self.assertScopesMatch()
+
+    def test_deleted_tasks(self):
+        self.theirs.assignees.add(self.bob)
+        client = api_client(self.admin, Role.ADMIN)
+        self.assertEqual(client.delete(f"/api/tasks/{self.theirs.id}/").status_code, 204)
+        self.assertScopesMatch()
+        self.assertTrue(all(row[3] for row in self.visibility_rows() if row[0] == self.theirs.id))
+
+        self.orphan.delete()
+        self.assertScopesMatch()
+        self.assertFalse(TaskVisibility.objects.filter(task_id=self.orphan.id).exists())
+
+    def test_rebuild_matches_signals(self):
+        self.mine.assignees.add(self.ada, self.bob)
+        self.orphan.assignees.add(self.bob)
+        self.task("Soft-deleted", created_by=self.ada, is_deleted=True)
+        maintained = self.visibility_rows()
+
+        TaskVisibility.objects.filter(tenant=self.tenant).delete()
+        call_command("rebuild_task_visibility", tenant=self.tenant.slug, stdout=StringIO())
+        self.assertEqual(self.visibility_rows(), maintained)
+        self.assertScopesMatch()
@@ -0,0 +1,97 @@
+"""
+Dashboard widget cache (core_api/widget_cache.py): writes move the tenant
+to a new data version only once they commit, and cached parts are never
+shared across tenants, nor my_tasks across users.
+"""
+
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from core_api.models import BoardStatus, Task
+from core_api.tests.helpers import api_client, make_board, make_tenant, make_user
+from core_api.widget_cache import cache_stats, data_version
+from users.models import Role
+
+
+@override_settings(DASHBOARD_WIDGET_CACHE_SECONDS=60, TASK_STATUS_ROLLUP=False)
+class WidgetCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.acme = make_tenant()
+        cls.globex = make_tenant("globex")
+        cls.admin = make_user(cls.acme, "admin", Role.ADMIN)
+        cls.receiver = make_user(cls.acme, "receiver", Role.TASK_RECEIVER)
+        cls.globex_admin = make_user(cls.globex, "globex-admin", Role.ADMIN)
+        cls.board = make_board(cls.acme)
+        cls.in_progress = BoardStatus.objects.get(board=cls.board, name="In Progress")
+        task = Task.objects.create(tenant=cls.acme, board=cls.board, status=cls.in_progress, title="Assigned")
+        task.assignees.add(cls.receiver)
+
+    def setUp(self):
+        caches["widgets"].clear()
+
+    def widgets(self, user, role):
+        response = api_client(user, role).get("/api/dashboard/widgets/")
+        self.assertEqual(response.status_code, 200, response.content)
+        return {widget["key"]: widget for widget in response.json()["widgets"]}
+
+    def stats(self, tenant):
+        stats = cache_stats(tenant.id)
+        return stats["hits"], stats["misses"]
+
+    def add_task(self, title):
+        return Task.objects.create(tenant=self.acme, board=self.board, status=self.in_progress, title=title)
+
+    def test_write_bumps_version_on_commit(self):
+        version = data_version(self.acme.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_task("Committed")
+        self.assertNotEqual(data_version(self.acme.id), version)
+
+    def test_rolled_back_write_keeps_version(self):
+        version = data_version(self.acme.id)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.add_task("Rolled back")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(data_version(self.acme.id), version)
+
+    def test_cached_until_next_write(self):
+        self.assertEqual(self.widgets(self.admin, Role.ADMIN)["active_tasks"]["value"], 1)
+        self.widgets(self.admin, Role.ADMIN)
+        self.assertEqual(self.stats(self.acme), (2, 2))
+
+        # Uncommitted (here: never committed) writes keep serving the cache.
+        self.add_task("Pending")
+        self.assertEqual(self.widgets(self.admin, Role.ADMIN)["active_tasks"]["value"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_task("Committed")
+        self.assertEqual(self.widgets(self.admin, Role.ADMIN)["active_tasks"]["value"], 3)
+        self.assertEqual(self.stats(self.acme), (4, 4))
+
+    def test_entries_are_per_tenant_and_per_user(self):
+        admin = self.widgets(self.admin, Role.ADMIN)
+        receiver = self.widgets(self.receiver, Role.TASK_RECEIVER)
+        globex = self.widgets(self.globex_admin, Role.ADMIN)
+
+        # The tenant-wide part is shared across users and roles ...
+        self.assertEqual(self.stats(self.acme), (1, 3))
+        self.assertEqual(receiver["active_tasks"], admin["active_tasks"])
+        # ... my_tasks is not ...
+        self.assertEqual(admin["my_tasks"]["data"], [])
+        self.assertEqual([task["title"] for task in receiver["my_tasks"]["data"]], ["Assigned"])
+        # ... and nothing is shared across tenants.
+        self.assertEqual(self.stats(self.globex), (0, 2))
+        self.assertEqual(globex["active_tasks"]["value"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_task("Acme only")
+        self.widgets(self.globex_admin, Role.ADMIN)
+        self.assertEqual(self.stats(self.globex), (2, 2))
@@ -1,15 +1,23 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from users.views import CustomTokenObtainPairView, TenantUserListView, TenantUserDetailView
+from users.views import (
+    CustomTokenObtainPairView,
+    TenantUserListView,
+    TenantUserDirectoryView,
+    TenantUserSearchView,
+    TenantUserDetailView,
+)
 from .views import (
     health,
     TaskViewSet,
     me,
     me_password,
     notifications_list,
+    notifications_unread_count,
     notification_mark_read,
     notifications_mark_all_read,
+    activity_feed,
     DivisionViewSet,
     SectionViewSet,
     BoardViewSet,
@@ -23,7 +31,12 @@ from .views import (
     org_task_by_ref,
     org_subtask_by_ref,
 )
-from .views_admin import AdminDashboardView, DashboardWidgetsView, DashboardConfigView
+from .views_admin import (
+    AdminDashboardView,
+    DashboardWidgetsView,
+    DashboardWidgetCacheStatsView,
+    DashboardConfigView,
+)
 from workflows.views import WorkflowViewSet, WorkflowPresetViewSet, TenantModuleViewSet
 
 router = DefaultRouter()
@@ -41,19 +54,28 @@ urlpatterns = [
     path("me/", me, name="me"),
     path("me/password/", me_password, name="me-password"),
     path("notifications/", notifications_list, name="notifications-list"),
+    path("notifications/unread-count/", notifications_unread_count, name="notifications-unread-count"),
     path("notifications/<int:notification_id>/read/", notification_mark_read, name="notification-mark-read"),
     path("notifications/read-all/", notifications_mark_all_read, name="notifications-mark-all-read"),
+    path("activity/", activity_feed, name="activity-feed"),
 
     # JWT login endpoint
     path("token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
 
     # Tenant users endpoint
     path("users/", TenantUserListView.as_view(), name="tenant-users"),
+    path("users/search/", TenantUserSearchView.as_view(), name="tenant-user-search"),
+    path("users/directory/", TenantUserDirectoryView.as_view(), name="tenant-user-directory"),
     path("users/<int:user_id>/", TenantUserDetailView.as_view(), name="tenant-user-detail"),
 
     # Admin dashboard endpoint
     path("admin/dashboard/", AdminDashboardView.as_view(), name="admin-dashboard"),
     path("dashboard/widgets/", DashboardWidgetsView.as_view(), name="dashboard-widgets"),
+    path(
+        "dashboard/widgets/cache-stats/",
+        DashboardWidgetCacheStatsView.as_view(),
+        name="dashboard-widgets-cache-stats",
+    ),
     path("dashboard/config/", DashboardConfigView.as_view(), name="dashboard-config"),
 
     # Slug-based hierarchy/task routes
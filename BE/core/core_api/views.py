@@ -9,11 +9,12 @@ Updated for new model structure:
   - Filtering updated accordingly
 """
 
-from django.db.models import Q, Exists, OuterRef
+from django.db.models import Q
 from django.utils import timezone
 from django.db import transaction
-from django.db.models import F
+from django.db.models import F, Max, Sum
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from django.contrib.auth.password_validation import validate_password
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError as DjangoValidationError
@@ -38,6 +39,17 @@ from core_api.serializers import (
     NotificationSerializer,
 )
 from core_api.permissions import TaskPermission, IsAdminRole
+from core_api.conditional import ConditionalGetMixin, DEFAULT_ETAG_AGGREGATES
+from core_api.visibility import scope_tasks_for_role
+from core_api.search import search_tasks
+from core_api.bulk import BulkTaskMutation, BULK_MAX_ITEMS
+from core_api.export import TaskExporter, EXPORT_OUTPUTS
+from core_api.kanban import KanbanBoard
+from core_api.changes import TaskChangeFeed
+from core_api.activity import activity_queryset, parse_activity_filters, serialize_activity
+from core_api.events import publish_task_event
+from core_api.notification_counters import decrement_unread, unread_count
+from core_api.importer import TaskImporter, IMPORT_INPUTS, detect_input_format, read_rows, text_stream
 from core_api.models import (
     Task,
     TaskHistory,
@@ -53,11 +65,18 @@ from core_api.models import (
 )
 from core_api.serializers import TaskAttachmentSerializer
 
-from users.models import UserRole
+from context.cache import tenant_state
 from users.models import User
+from users.roles import get_role_context
 
-from core_api.pagination import TaskPagination
+from core_api.pagination import (
+    ActivityCursorPagination,
+    TaskPagination,
+    TaskCursorPagination,
+    TASK_KEYSET_ORDERING,
+)
 
+from workflows.models import Workflow
 from workflows.utils import (
     get_default_workflow_for_tenant,
     get_first_stage,
@@ -69,26 +88,10 @@ from core_api.notifications import (
     notify_status_changed,
     notify_proof_submitted,
     notify_task_completed,
+    task_recipients,
 )
 
 
-def normalize_role_value(value):
-    if value is None:
-        return None
-    return str(value).strip().upper().replace(" ", "_")
-
-
-def get_normalized_user_roles(user, tenant):
-    raw_roles = UserRole.objects.filter(user=user, tenant=tenant).values_list(
-        "role__name", flat=True
-    )
-    return {
-        normalized
-        for normalized in (normalize_role_value(role) for role in raw_roles)
-        if normalized
-    }
-
-
 def _coerce_bool(value, fallback):
     if value is None:
         return fallback
@@ -112,7 +115,6 @@ def health(request):
 @permission_classes([IsAuthenticated])
 def me(request):
     user = request.user
-    tenant = user.tenant
 
     if request.method == "PATCH":
         first_name = str(request.data.get("first_name", user.first_name)).strip()
@@ -139,6 +141,10 @@ def me(request):
             request.data.get("notify_proof_submitted"),
             user.notify_proof_submitted,
         )
+        notification_digest = _coerce_bool(
+            request.data.get("notification_digest"),
+            user.notification_digest,
+        )
 
         if (
             len(first_name) > 150
@@ -206,13 +212,13 @@ def me(request):
         if user.notify_proof_submitted != notify_proof_submitted:
             user.notify_proof_submitted = notify_proof_submitted
             dirty_fields.append("notify_proof_submitted")
+        if user.notification_digest != notification_digest:
+            user.notification_digest = notification_digest
+            dirty_fields.append("notification_digest")
         if dirty_fields:
             user.save(update_fields=dirty_fields)
 
-    roles = list(
-        UserRole.objects.filter(user=user, tenant=tenant)
-        .values_list("role__name", flat=True)
-    )
+    roles = list(get_role_context(request).role_names)
 
     return Response({
         "id": user.id,
@@ -228,7 +234,8 @@ def me(request):
         "notify_task_status_changed": user.notify_task_status_changed,
         "notify_due_reminder": user.notify_due_reminder,
         "notify_proof_submitted": user.notify_proof_submitted,
-        "tenant_slug": tenant.slug,
+        "notification_digest": user.notification_digest,
+        "tenant_slug": tenant_state(user.tenant_id).slug,
         "roles": roles,
     })
 
@@ -279,7 +286,7 @@ def me_password(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def notifications_list(request):
-    tenant = request.user.tenant
+    tenant_id = request.user.tenant_id
     unread_only = str(request.query_params.get("unread", "")).strip().lower() in {"1", "true", "yes"}
     try:
         limit = int(request.query_params.get("limit", 20))
@@ -287,99 +294,117 @@ def notifications_list(request):
         limit = 20
     limit = max(1, min(limit, 100))
 
-    queryset = Notification.objects.filter(tenant=tenant, user=request.user).select_related(
+    queryset = Notification.objects.filter(tenant_id=tenant_id, user=request.user).select_related(
         "actor", "task"
     )
     if unread_only:
         queryset = queryset.filter(is_read=False)
     items = list(queryset[:limit])
-    unread_count = Notification.objects.filter(
-        tenant=tenant,
-        user=request.user,
-        is_read=False,
-    ).count()
     return Response({
         "results": NotificationSerializer(items, many=True).data,
-        "unread_count": unread_count,
+        "unread_count": unread_count(request.user),
     })
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def activity_feed(request):
+    """
+    Tenant activity, newest first, keyset-paginated.
+    ?division= / ?board= / ?user= narrow it; see core_api/activity.py.
+    """
+    role_context = get_role_context(request)
+    queryset = activity_queryset(
+        request.user.tenant_id,
+        filters=parse_activity_filters(request.query_params),
+        user=request.user,
+        active_role=role_context.active_role,
+    )
+    if not role_context.has_valid_active_role:
+        queryset = queryset.none()
+
+    paginator = ActivityCursorPagination()
+    rows = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response([serialize_activity(row) for row in rows])
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def notifications_unread_count(request):
+    return Response({"unread_count": unread_count(request.user)})
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def notification_mark_read(request, notification_id):
-    notification = get_object_or_404(
-        Notification.objects.filter(
-            tenant=request.user.tenant,
-            user=request.user,
-        ),
-        id=notification_id,
+    notifications = Notification.objects.filter(
+        tenant_id=request.user.tenant_id,
+        user=request.user,
     )
+    notification = get_object_or_404(notifications, id=notification_id)
     if not notification.is_read:
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save(update_fields=["is_read", "read_at"])
+        with transaction.atomic():
+            # Conditional so two concurrent requests only count it once.
+            flipped = notifications.filter(id=notification.id, is_read=False).update(
+                is_read=True,
+                read_at=timezone.now(),
+            )
+            decrement_unread(request.user.id, flipped)
     return Response({"detail": "Notification marked as read."}, status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def notifications_mark_all_read(request):
-    Notification.objects.filter(
-        tenant=request.user.tenant,
-        user=request.user,
-        is_read=False,
-    ).update(is_read=True, read_at=timezone.now())
+    with transaction.atomic():
+        flipped = Notification.objects.filter(
+            tenant_id=request.user.tenant_id,
+            user=request.user,
+            is_read=False,
+        ).update(is_read=True, read_at=timezone.now())
+        decrement_unread(request.user.id, flipped)
     return Response({"detail": "All notifications marked as read."}, status=status.HTTP_200_OK)
 
 
-def _get_tenant_for_org_slug(user, org_slug):
+def _get_tenant_id_for_org_slug(user, org_slug):
     """
     Enforce org slug scoping against the authenticated user's tenant.
     """
     if not user or not user.is_authenticated:
         raise PermissionDenied("Authentication required.")
-    tenant = user.tenant
+    tenant = tenant_state(user.tenant_id)
     if tenant is None or tenant.slug != org_slug:
         raise PermissionDenied("Organisation slug does not match your active tenant.")
-    return tenant
+    return tenant.id
 
 
-def _task_queryset_for_active_role(request, tenant):
+def _task_queryset_for_active_role(request, tenant_id):
     """
     Role-scoped task queryset used by slug-based task lookup endpoints.
     Includes subtasks (no parent filter).
     """
     user = request.user
-    qs = (
-        Task.objects.for_tenant(tenant)
+    qs = TaskSerializer.setup_eager_loading(
+        Task.objects.for_tenant(tenant_id)
         .filter(is_deleted=False)
-        .select_related("status", "board", "division", "created_by", "workflow", "stage", "parent")
-        .prefetch_related("assignees", "attachments")
+        .select_related("board", "division", "parent")
     )
 
-    active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-    user_roles = get_normalized_user_roles(user, tenant)
-
-    if active_role not in user_roles:
+    role_context = get_role_context(request)
+    if not role_context.has_valid_active_role:
         return Task.objects.none()
+    active_role = role_context.active_role
 
-    if active_role == "TASK_RECEIVER":
-        has_assignees = Task.assignees.through.objects.filter(task_id=OuterRef("pk"))
-        qs = qs.annotate(_has_assignees=Exists(has_assignees)).filter(
-            Q(assignees=user) | Q(created_by__isnull=True, _has_assignees=False)
-        )
-    elif active_role == "TASK_CREATOR":
-        qs = qs.filter(Q(created_by=user) | Q(created_by__isnull=True))
-
-    return qs.distinct()
+    # Visibility rows are unique per (task, scope, user), so no distinct().
+    return scope_tasks_for_role(qs, user, active_role)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_divisions(request, org_slug):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
     divisions = (
-        Division.objects.for_tenant(tenant)
+        Division.objects.for_tenant(tenant_id)
         .active()
         .order_by("order", "name")
     )
@@ -389,9 +414,9 @@ def org_divisions(request, org_slug):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_division_detail(request, org_slug, division_slug):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
     division = get_object_or_404(
-        Division.objects.for_tenant(tenant).active(),
+        Division.objects.for_tenant(tenant_id).active(),
         slug=division_slug,
     )
     return Response(DivisionSerializer(division).data)
@@ -400,13 +425,13 @@ def org_division_detail(request, org_slug, division_slug):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_division_sections(request, org_slug, division_slug):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
     division = get_object_or_404(
-        Division.objects.for_tenant(tenant).active(),
+        Division.objects.for_tenant(tenant_id).active(),
         slug=division_slug,
     )
     sections = (
-        Section.objects.for_tenant(tenant)
+        Section.objects.for_tenant(tenant_id)
         .active()
         .filter(division=division)
         .select_related("division")
@@ -418,9 +443,9 @@ def org_division_sections(request, org_slug, division_slug):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_division_members(request, org_slug, division_slug):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
     division = get_object_or_404(
-        Division.objects.for_tenant(tenant).active(),
+        Division.objects.for_tenant(tenant_id).active(),
         slug=division_slug,
     )
     members = (
@@ -443,13 +468,13 @@ def org_division_members(request, org_slug, division_slug):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_division_boards(request, org_slug, division_slug):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
     division = get_object_or_404(
-        Division.objects.for_tenant(tenant).active(),
+        Division.objects.for_tenant(tenant_id).active(),
         slug=division_slug,
     )
     boards = (
-        Board.objects.for_tenant(tenant)
+        Board.objects.for_tenant(tenant_id)
         .active()
         .filter(division=division, section__isnull=True)
         .select_related("division", "section")
@@ -462,18 +487,18 @@ def org_division_boards(request, org_slug, division_slug):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_section_boards(request, org_slug, division_slug, section_slug):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
     division = get_object_or_404(
-        Division.objects.for_tenant(tenant).active(),
+        Division.objects.for_tenant(tenant_id).active(),
         slug=division_slug,
     )
     section = get_object_or_404(
-        Section.objects.for_tenant(tenant).active(),
+        Section.objects.for_tenant(tenant_id).active(),
         division=division,
         slug=section_slug,
     )
     boards = (
-        Board.objects.for_tenant(tenant)
+        Board.objects.for_tenant(tenant_id)
         .active()
         .filter(section=section)
         .select_related("division", "section")
@@ -486,8 +511,8 @@ def org_section_boards(request, org_slug, division_slug, section_slug):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_task_by_ref(request, org_slug, task_ref):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
-    qs = _task_queryset_for_active_role(request, tenant)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
+    qs = _task_queryset_for_active_role(request, tenant_id)
     task = get_object_or_404(qs, ref_id__iexact=task_ref)
     return Response(TaskSerializer(task, context={"request": request}).data)
 
@@ -495,8 +520,8 @@ def org_task_by_ref(request, org_slug, task_ref):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def org_subtask_by_ref(request, org_slug, task_ref, sub_ref):
-    tenant = _get_tenant_for_org_slug(request.user, org_slug)
-    qs = _task_queryset_for_active_role(request, tenant)
+    tenant_id = _get_tenant_id_for_org_slug(request.user, org_slug)
+    qs = _task_queryset_for_active_role(request, tenant_id)
     subtask = get_object_or_404(
         qs,
         parent__ref_id__iexact=task_ref,
@@ -505,50 +530,87 @@ def org_subtask_by_ref(request, org_slug, task_ref, sub_ref):
     return Response(TaskSerializer(subtask, context={"request": request}).data)
 
 
-class TaskViewSet(ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, TaskPermission]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     pagination_class = TaskPagination
+    cursor_pagination_class = TaskCursorPagination
+
+    # Status names come from the board (BoardStatus changes touch it) and
+    # stage names from the workflow (the builder bumps its version).
+    etag_aggregates = {
+        **DEFAULT_ETAG_AGGREGATES,
+        "boards": Max("board__updated_at"),
+        "workflows": Sum("workflow__version"),
+    }
+
+    @property
+    def paginator(self):
+        """
+        Page-number pagination by default so existing clients keep working.
+        List requests opt into keyset pagination with ?pagination=cursor
+        (or by passing a cursor from a previous cursor page). Search results
+        are ordered by rank, which the keyset cursor cannot encode, so
+        ?search= always uses page numbers.
+        """
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            wants_cursor = (
+                str(params.get("pagination", "")).strip().lower() == "cursor"
+                or "cursor" in params
+            )
+            if self.action == "list" and wants_cursor and not self._search_query():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def _search_query(self):
+        return str(self.request.query_params.get("search", "")).strip()
+
+    # Actions that honour the list query params (include_terminal, search).
+    list_actions = {"list", "export"}
 
     def get_queryset(self):
+        return TaskSerializer.setup_eager_loading(
+            self.get_filtered_queryset().select_related("board", "division")
+        )
+
+    def get_etag_queryset(self):
+        return self.get_filtered_queryset()
+
+    def get_filtered_queryset(self, include_deleted=False, include_subtasks=False):
+        """
+        Tenant- and role-scoped tasks with the request's filters applied,
+        without serializer eager loading. Shared by list/detail, export
+        (which also includes subtasks) and the changes feed (which also
+        needs soft-deleted rows).
+        """
         user = self.request.user
 
         if not user or not user.is_authenticated:
             return Task.objects.none()
 
-        tenant = user.tenant
-
-        qs = Task.objects.for_tenant(tenant).filter(
-            is_deleted=False,
-            parent=None,  # top-level tasks only by default; subtasks fetched separately
-        ).select_related(
-            "status", "board", "division", "created_by", "workflow", "stage"
-        ).prefetch_related(
-            "assignees", "attachments"
-        )
+        tenant_id = user.tenant_id
 
-        active_role = normalize_role_value(self.request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(user, tenant)
+        qs = Task.objects.for_tenant(tenant_id)
+        if not include_subtasks:
+            qs = qs.filter(parent=None)  # top-level tasks only by default; subtasks fetched separately
+        if not include_deleted:
+            qs = qs.filter(is_deleted=False)
 
-        if active_role not in user_roles:
+        role_context = get_role_context(self.request)
+        if not role_context.has_valid_active_role:
             return qs.none()
+        active_role = role_context.active_role
 
-        # Role-scoped filtering
-        if active_role == "TASK_RECEIVER":
-            # Include explicitly assigned tasks and legacy orphaned tasks
-            # (no creator + no assignees) to avoid hiding pre-migration data.
-            has_assignees = Task.assignees.through.objects.filter(task_id=OuterRef("pk"))
-            qs = qs.annotate(_has_assignees=Exists(has_assignees)).filter(
-                Q(assignees=user) |
-                Q(created_by__isnull=True, _has_assignees=False)
-            ).distinct()
-        elif active_role == "TASK_CREATOR":
-            qs = qs.filter(
-                Q(created_by=user) |
-                Q(created_by__isnull=True)
-            )
-        # ADMIN sees all
+        # Role-scoped filtering via the materialized TaskVisibility table.
+        # TASK_RECEIVER: assigned tasks + legacy orphaned tasks
+        # (no creator + no assignees) to avoid hiding pre-migration data.
+        # TASK_CREATOR: own tasks + tasks with no creator.
+        # ADMIN sees all.
+        qs = scope_tasks_for_role(qs, user, active_role, include_deleted=include_deleted)
 
         # Filter by board if provided
         board_id = self.request.query_params.get("board")
@@ -581,30 +643,33 @@ class TaskViewSet(ModelViewSet):
             str(self.request.query_params.get("include_terminal", "")).lower()
             in {"1", "true", "yes"}
         )
-        if self.action != "list":
+        if self.action not in self.list_actions:
             include_terminal = True
         if not include_terminal:
             qs = qs.exclude(
                 Q(status__is_terminal=True) | Q(stage__is_terminal=True)
             )
 
+        # Full-text search over ref_id / title / description, best match first.
+        search = self._search_query()
+        if self.action in self.list_actions and search:
+            qs = search_tasks(qs, search, tenant_id).order_by(
+                "-search_rank", *TASK_KEYSET_ORDERING
+            )
+
         return qs
 
     def perform_create(self, serializer):
         user = self.request.user
-        tenant = user.tenant
-
-        active_role = normalize_role_value(self.request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(user, tenant)
+        tenant_id = user.tenant_id
 
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(self.request).require_active_role()
 
         if active_role not in ["TASK_CREATOR", "ADMIN"]:
             raise PermissionDenied("You do not have permission to create tasks.")
 
         save_kwargs = {
-            "tenant": tenant,
+            "tenant_id": tenant_id,
             "created_by": user,
         }
 
@@ -613,7 +678,7 @@ class TaskViewSet(ModelViewSet):
             save_kwargs["workflow"] = selected_workflow
             save_kwargs["stage"] = get_first_stage(selected_workflow)
         else:
-            default_workflow = get_default_workflow_for_tenant(tenant)
+            default_workflow = get_default_workflow_for_tenant(tenant_id)
             if default_workflow:
                 save_kwargs["workflow"] = default_workflow
                 save_kwargs["stage"] = get_first_stage(default_workflow)
@@ -621,7 +686,7 @@ class TaskViewSet(ModelViewSet):
         task = serializer.save(**save_kwargs)
 
         TaskHistory.objects.create(
-            tenant=task.tenant,
+            tenant_id=task.tenant_id,
             task=task,
             action=TaskHistory.Action.CREATED,
             performed_by=user,
@@ -639,6 +704,7 @@ class TaskViewSet(ModelViewSet):
                 actor=user,
                 recipients=assigned_users,
             )
+        publish_task_event(task, "created", assignee_ids=[u.id for u in assigned_users])
 
     def update(self, request, *args, **kwargs):
         with transaction.atomic():
@@ -648,11 +714,7 @@ class TaskViewSet(ModelViewSet):
             if instance.tenant_id != request.user.tenant_id:
                 raise PermissionDenied("Cross-tenant modification forbidden.")
 
-            active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-            user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-
-            if active_role not in user_roles:
-                raise PermissionDenied("Invalid active role.")
+            active_role = get_role_context(request).require_active_role()
 
             if instance.is_deleted:
                 raise PermissionDenied("Cannot modify deleted task.")
@@ -700,7 +762,9 @@ class TaskViewSet(ModelViewSet):
                     raise ValidationError({"workflow_id": "workflow_id must be a valid integer."})
 
                 if new_workflow_id != (instance.workflow_id or 0):
-                    target_workflow = instance.tenant.workflows.filter(id=new_workflow_id).first()
+                    target_workflow = Workflow.objects.filter(
+                        tenant_id=instance.tenant_id, id=new_workflow_id
+                    ).first()
                     if target_workflow is None:
                         raise ValidationError({"workflow_id": "Workflow does not belong to this tenant."})
                     target_stage = get_first_non_terminal_stage(target_workflow)
@@ -750,15 +814,7 @@ class TaskViewSet(ModelViewSet):
 
             # History action classification
             new_status_name = task.status.name if task.status else ""
-            history_action = TaskHistory.Action.UPDATED
-
-            if old_status_name != new_status_name:
-                if old_status_name == "In Progress" and new_status_name == "In Review":
-                    history_action = TaskHistory.Action.SUBMITTED
-                elif old_status_name == "In Review" and new_status_name == "Done":
-                    history_action = TaskHistory.Action.APPROVED
-                elif old_status_name == "In Review" and new_status_name == "In Progress":
-                    history_action = TaskHistory.Action.REJECTED
+            history_action = TaskHistory.action_for_status_change(old_status_name, new_status_name)
 
             # Build changes diff
             changes = {}
@@ -766,7 +822,7 @@ class TaskViewSet(ModelViewSet):
                 changes["status"] = {"from": old_status_name, "to": new_status_name}
 
             TaskHistory.objects.create(
-                tenant=task.tenant,
+                tenant_id=task.tenant_id,
                 task=task,
                 action=history_action,
                 performed_by=request.user,
@@ -779,17 +835,12 @@ class TaskViewSet(ModelViewSet):
             )
 
             if old_status_name != new_status_name:
-                recipients_by_id = {}
-                if task.created_by_id:
-                    recipients_by_id[task.created_by_id] = task.created_by
-                for assignee in new_assignees:
-                    recipients_by_id[assignee.id] = assignee
                 notify_status_changed(
                     task=task,
                     actor=request.user,
                     from_status=old_status_name,
                     to_status=new_status_name,
-                    recipients=list(recipients_by_id.values()),
+                    recipients=task_recipients(task, new_assignees),
                 )
 
                 became_terminal_done = bool(task.status and task.status.is_terminal and not task.status.is_cancelled)
@@ -809,14 +860,16 @@ class TaskViewSet(ModelViewSet):
                     recipients=recipients,
                 )
 
+            publish_task_event(
+                task,
+                "updated",
+                assignee_ids=new_assignee_ids,
+                extra_user_ids=old_assignee_ids - new_assignee_ids,
+            )
             return Response(self.get_serializer(task).data)
 
     def perform_destroy(self, instance):
-        active_role = normalize_role_value(self.request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(self.request.user, self.request.user.tenant)
-
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(self.request).require_active_role()
 
         if active_role == "TASK_RECEIVER":
             raise PermissionDenied("Task receivers cannot delete tasks.")
@@ -836,7 +889,7 @@ class TaskViewSet(ModelViewSet):
         instance.save()
 
         TaskHistory.objects.create(
-            tenant=instance.tenant,
+            tenant_id=instance.tenant_id,
             task=instance,
             action=TaskHistory.Action.SOFT_DELETED,
             performed_by=self.request.user,
@@ -846,6 +899,98 @@ class TaskViewSet(ModelViewSet):
             priority=instance.priority,
             due_date=instance.due_date,
         )
+        publish_task_event(instance, "deleted")
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Streams every task matching the list filters, subtasks included
+        (see the parent_id column), as CSV (default) or NDJSON:
+        ?output=csv|ndjson. No pagination and no COUNT.
+        """
+        output = str(request.query_params.get("output", "csv")).strip().lower()
+        if output not in EXPORT_OUTPUTS:
+            raise ValidationError({"output": "output must be one of: csv, ndjson."})
+
+        queryset = self.get_filtered_queryset(include_subtasks=True)
+        if not self._search_query():
+            queryset = queryset.order_by(*TASK_KEYSET_ORDERING)
+
+        exporter = TaskExporter(queryset, tenant_id=request.user.tenant_id)
+        response = StreamingHttpResponse(
+            exporter.stream(output),
+            content_type=EXPORT_OUTPUTS[output],
+        )
+        filename = f"{tenant_state(request.user.tenant_id).slug}-tasks.{output}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        Tasks created, updated or soft-deleted since ?since=<cursor>, oldest
+        first, with tombstones for deletions and the cursor for the next
+        poll. Omit since for a full sync; page on while has_more is true.
+        """
+        feed = TaskChangeFeed(self.get_filtered_queryset(include_deleted=True), request)
+        return Response(feed.page(request.query_params.get("since")))
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_tasks(self, request):
+        """
+        Imports tasks from an uploaded CSV / JSON / NDJSON `file`, or from a
+        JSON body {"rows": [...]}. ?dry_run=true validates without writing.
+        Column reference: core_api/importer.py.
+        """
+        active_role = get_role_context(request).require_active_role()
+        if active_role not in ["TASK_CREATOR", "ADMIN"]:
+            raise PermissionDenied("You do not have permission to create tasks.")
+
+        dry_run = str(
+            request.query_params.get("dry_run", request.data.get("dry_run", ""))
+        ).lower() in {"1", "true", "yes"}
+
+        upload = request.FILES.get("file")
+        if upload is not None:
+            input_format = str(
+                request.query_params.get("input") or detect_input_format(upload.name)
+            ).lower()
+            if input_format not in IMPORT_INPUTS:
+                raise ValidationError({"input": "input must be one of: csv, json, ndjson."})
+            rows = read_rows(text_stream(upload.file), input_format)
+        else:
+            rows = request.data.get("rows")
+            if not isinstance(rows, list):
+                raise ValidationError({"file": "Upload a file or send a JSON list in 'rows'."})
+
+        importer = TaskImporter(tenant=request.user.tenant, user=request.user, dry_run=dry_run)
+        report = importer.run(rows)
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if report["imported"] else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Applies many {id, version, changes} items in one transaction.
+        Items fail independently; see core_api/bulk.py for the format.
+        """
+        active_role = get_role_context(request).require_active_role()
+
+        items = request.data.get("items") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"items": "items must be a non-empty list."})
+        if len(items) > BULK_MAX_ITEMS:
+            raise ValidationError({"items": f"At most {BULK_MAX_ITEMS} items per request."})
+
+        results = BulkTaskMutation(user=request.user, active_role=active_role).run(items)
+        failed = sum(1 for result in results if result["status"] != status.HTTP_200_OK)
+        return Response({
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        })
 
     @action(detail=True, methods=["get"], url_path="history")
     def history(self, request, pk=None):
@@ -856,7 +1001,7 @@ class TaskViewSet(ModelViewSet):
 
         queryset = TaskHistory.objects.filter(
             task=task,
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
         ).order_by("-timestamp")
 
         page = self.paginate_queryset(queryset)
@@ -875,10 +1020,12 @@ class TaskViewSet(ModelViewSet):
         if task.tenant_id != request.user.tenant_id:
             raise PermissionDenied("Cross-tenant access forbidden.")
 
-        qs = Task.objects.filter(
-            parent=task,
-            is_deleted=False,
-        ).select_related("status", "created_by").prefetch_related("assignees")
+        qs = TaskSerializer.setup_eager_loading(
+            Task.objects.filter(
+                parent=task,
+                is_deleted=False,
+            )
+        )
 
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
@@ -895,11 +1042,7 @@ class TaskViewSet(ModelViewSet):
         if task.tenant_id != request.user.tenant_id:
             raise PermissionDenied("Cross-tenant upload forbidden.")
 
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(request).require_active_role()
 
         attachment_type = (
             TaskAttachment.Type.SUBMISSION
@@ -922,7 +1065,7 @@ class TaskViewSet(ModelViewSet):
         uploaded_file = request.FILES["file"]
 
         attachment = TaskAttachment.objects.create(
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
             task=task,
             uploaded_by=request.user,
             file=uploaded_file,
@@ -949,17 +1092,13 @@ class TaskViewSet(ModelViewSet):
         if task.tenant_id != request.user.tenant_id:
             raise PermissionDenied("Cross-tenant deletion forbidden.")
 
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(request).require_active_role()
 
         try:
             attachment = TaskAttachment.objects.get(
                 id=attachment_id,
                 task=task,
-                tenant=request.user.tenant,
+                tenant_id=request.user.tenant_id,
             )
         except TaskAttachment.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -992,13 +1131,10 @@ class TaskViewSet(ModelViewSet):
         if task.tenant_id != request.user.tenant_id:
             raise PermissionDenied("Cross-tenant access forbidden.")
 
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(request).require_active_role()
 
         if request.method.lower() == "get":
-            proofs = TaskProof.objects.filter(task=task, tenant=request.user.tenant)
+            proofs = TaskProof.objects.filter(task=task, tenant_id=request.user.tenant_id)
             serializer = TaskProofSerializer(proofs, many=True, context={"request": request})
             return Response(serializer.data)
 
@@ -1010,18 +1146,13 @@ class TaskViewSet(ModelViewSet):
         serializer.is_valid(raise_exception=True)
         proof = serializer.save(
             task=task,
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
             submitted_by=request.user,
         )
-        recipients_by_id = {}
-        if task.created_by_id:
-            recipients_by_id[task.created_by_id] = task.created_by
-        for assignee in task.assignees.all():
-            recipients_by_id[assignee.id] = assignee
         notify_proof_submitted(
             task=task,
             actor=request.user,
-            recipients=list(recipients_by_id.values()),
+            recipients=task_recipients(task, task.assignees.all()),
         )
         return Response(TaskProofSerializer(proof, context={"request": request}).data, status=status.HTTP_201_CREATED)
 
@@ -1038,15 +1169,12 @@ class TaskViewSet(ModelViewSet):
         proof = TaskProof.objects.filter(
             id=proof_id,
             task=task,
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
         ).first()
         if not proof:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(request).require_active_role()
         if active_role not in {"ADMIN", "TASK_CREATOR"} and proof.submitted_by_id != request.user.id:
             raise PermissionDenied("You can only delete proofs you submitted.")
 
@@ -1059,10 +1187,7 @@ class TaskViewSet(ModelViewSet):
         if task.tenant_id != request.user.tenant_id:
             raise PermissionDenied("Cross-tenant update forbidden.")
 
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(request).require_active_role()
         if active_role not in {"ADMIN", "TASK_CREATOR"}:
             raise PermissionDenied("Only admin or task creator can add assignees.")
 
@@ -1072,7 +1197,7 @@ class TaskViewSet(ModelViewSet):
         except (TypeError, ValueError):
             raise ValidationError({"user_id": "user_id must be a valid integer."})
 
-        assignee = request.user.tenant.users.filter(id=user_id).first()
+        assignee = User.objects.filter(tenant_id=request.user.tenant_id, id=user_id).first()
         if not assignee:
             raise ValidationError({"user_id": "User does not belong to this tenant."})
 
@@ -1088,6 +1213,7 @@ class TaskViewSet(ModelViewSet):
                 actor=request.user,
                 recipients=[assignee],
             )
+            publish_task_event(task, "updated")
         return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["delete"], url_path=r"assignees/(?P<user_id>[^/.]+)")
@@ -1096,15 +1222,14 @@ class TaskViewSet(ModelViewSet):
         if task.tenant_id != request.user.tenant_id:
             raise PermissionDenied("Cross-tenant update forbidden.")
 
-        active_role = normalize_role_value(request.headers.get("X-Active-Role"))
-        user_roles = get_normalized_user_roles(request.user, request.user.tenant)
-        if active_role not in user_roles:
-            raise PermissionDenied("Invalid active role.")
+        active_role = get_role_context(request).require_active_role()
         if active_role not in {"ADMIN", "TASK_CREATOR"}:
             raise PermissionDenied("Only admin or task creator can remove assignees.")
 
-        TaskAssignee.objects.filter(task=task, user_id=user_id).delete()
+        removed, _ = TaskAssignee.objects.filter(task=task, user_id=user_id).delete()
         task.refresh_from_db()
+        if removed:
+            publish_task_event(task, "updated", extra_user_ids=[int(user_id)])
         return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
 
 
@@ -1122,10 +1247,10 @@ class DivisionViewSet(TenantHierarchyViewSet):
     queryset = Division.objects.none()
 
     def get_queryset(self):
-        return Division.objects.for_tenant(self.request.user.tenant).active().order_by("order", "name")
+        return Division.objects.for_tenant(self.request.user.tenant_id).active().order_by("order", "name")
 
     def perform_create(self, serializer):
-        serializer.save(tenant=self.request.user.tenant, created_by=self.request.user)
+        serializer.save(tenant_id=self.request.user.tenant_id, created_by=self.request.user)
 
 
 class SectionViewSet(TenantHierarchyViewSet):
@@ -1134,7 +1259,7 @@ class SectionViewSet(TenantHierarchyViewSet):
 
     def get_queryset(self):
         return (
-            Section.objects.for_tenant(self.request.user.tenant)
+            Section.objects.for_tenant(self.request.user.tenant_id)
             .active()
             .select_related("division")
             .order_by("order", "name")
@@ -1144,16 +1269,16 @@ class SectionViewSet(TenantHierarchyViewSet):
         division = serializer.validated_data["division"]
         if division.tenant_id != self.request.user.tenant_id:
             raise ValidationError({"division": "Division must belong to your tenant."})
-        serializer.save(tenant=self.request.user.tenant, created_by=self.request.user)
+        serializer.save(tenant_id=self.request.user.tenant_id, created_by=self.request.user)
 
 
-class BoardViewSet(TenantHierarchyViewSet):
+class BoardViewSet(ConditionalGetMixin, TenantHierarchyViewSet):
     serializer_class = BoardSerializer
     queryset = Board.objects.none()
 
     def get_queryset(self):
         return (
-            Board.objects.for_tenant(self.request.user.tenant)
+            Board.objects.for_tenant(self.request.user.tenant_id)
             .active()
             .select_related("division", "section")
             .prefetch_related("statuses")
@@ -1170,12 +1295,46 @@ class BoardViewSet(TenantHierarchyViewSet):
 
     def perform_create(self, serializer):
         self._validate_parent_scope(serializer)
-        serializer.save(tenant=self.request.user.tenant, created_by=self.request.user)
+        serializer.save(tenant_id=self.request.user.tenant_id, created_by=self.request.user)
 
     def perform_update(self, serializer):
         self._validate_parent_scope(serializer)
         serializer.save()
 
+    @action(detail=True, methods=["get"], url_path="kanban")
+    def kanban(self, request, pk=None):
+        """
+        Every status column of the board with its task count and first
+        ?limit= tasks. ?status=<id>&cursor=<cursor> pages a single column.
+        """
+        board = self.get_object()
+
+        tasks = Task.objects.for_tenant(request.user.tenant_id).filter(
+            board=board,
+            is_deleted=False,
+            parent=None,
+        )
+        role_context = get_role_context(request)
+        if role_context.has_valid_active_role:
+            tasks = scope_tasks_for_role(tasks, request.user, role_context.active_role)
+        else:
+            tasks = tasks.none()
+
+        kanban = KanbanBoard(board, tasks, request)
+        status_id = request.query_params.get("status")
+        if status_id:
+            if not str(status_id).isdigit():
+                raise ValidationError({"status": "status must be a valid integer."})
+            columns = kanban.column_page(int(status_id), request.query_params.get("cursor"))
+        else:
+            columns = kanban.columns()
+
+        return Response({
+            "board": {"id": board.id, "name": board.name, "slug": board.slug},
+            "limit": kanban.limit,
+            "columns": columns,
+        })
+
 
 class TaskStatusViewSet(TenantHierarchyViewSet):
     serializer_class = BoardStatusSerializer
@@ -1183,7 +1342,7 @@ class TaskStatusViewSet(TenantHierarchyViewSet):
 
     def get_queryset(self):
         return (
-            BoardStatus.objects.filter(board__tenant=self.request.user.tenant)
+            BoardStatus.objects.filter(board__tenant_id=self.request.user.tenant_id)
             .select_related("board")
             .order_by("board_id", "order")
         )
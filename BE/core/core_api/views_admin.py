@@ -1,13 +1,26 @@
-from django.db.models import Count
+from django.db.models import Count, Max, Q
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from rest_framework import status
 
-from users.models import User, UserRole, Role
+from users.directory import user_counts
+from users.roles import get_role_context
+from core_api.activity import recent_activity
+from core_api.kpis import status_breakdown, summarize
 from core_api.models import Task, TaskHistory
 from core_api.permissions import IsAdminRole
+from core_api.conditional import (
+    DEFAULT_ETAG_AGGREGATES,
+    compute_etag,
+    etag_matches,
+    not_modified,
+    queryset_fingerprint,
+    request_etag_parts,
+    set_etag,
+)
+from core_api.widget_cache import cache_stats, data_version, get_or_compute
 from workflows.models import TenantModule, DashboardConfig
 
 
@@ -20,82 +33,35 @@ class AdminDashboardView(APIView):
 
     def get(self, request):
         # JWT auth guarantees request.user; tenant hangs off user model.
-        tenant = request.user.tenant
+        tenant_id = request.user.tenant_id
 
-        tasks = Task.objects.filter(tenant=tenant, is_deleted=False)
-        users = User.objects.filter(tenant=tenant)
-
-        total_users = users.count()
-        active_tasks = tasks.filter(status__name__iexact="In Progress").count()
-        blocked_tasks = tasks.filter(status__name__iexact="Blocked").count()
-        done_tasks = tasks.filter(status__is_terminal=True, status__is_cancelled=False).count()
-
-        total_tasks = tasks.count()
-        completion_rate = (
-            round((done_tasks / total_tasks) * 100, 1)
-            if total_tasks > 0 else 0
-        )
+        users = user_counts(tenant_id)
+        kpis = summarize(status_breakdown(tenant_id))
 
         # Status Overview
-        status_counts = (
-            tasks.values("status__name")
-            .annotate(count=Count("id"))
-        )
-
         status_overview = [
             {
-                "name": item["status__name"] or "Unassigned",
-                "count": item["count"],
+                "name": name or "Unassigned",
+                "count": count,
             }
-            for item in status_counts
+            for name, count in kpis["by_name"].items()
         ]
 
         # Recent Activity
-        recent_history = (
-            TaskHistory.objects
-            .filter(task__tenant=tenant)
-            .order_by("-timestamp")[:10]
-        )
-
-        recent_activity = [
-            {
-                "id": h.id,
-                "message": f"{h.action} on '{h.task.title}'"
-            }
-            for h in recent_history
-        ]
-
-        user_ids = list(users.values_list("id", flat=True))
-        roles_by_user = {}
-        for user_id, role_name in UserRole.objects.filter(
-            tenant=tenant,
-            user_id__in=user_ids,
-        ).values_list("user_id", "role__name"):
-            roles_by_user.setdefault(user_id, []).append(role_name)
-
-        # Users list (basic)
-        users_data = []
-        for u in users:
-            roles = roles_by_user.get(u.id, [])
-            users_data.append({
-                "id": u.id,
-                "email": u.email,
-                # Keep singular field for compatibility with old clients.
-                "role": roles[0] if roles else None,
-                "roles": roles,
-                "is_active": u.is_active,
-            })
+        activity = recent_activity(tenant_id)
 
         return Response({
             "kpis": {
-                "total_users": total_users,
-                "active_tasks": active_tasks,
-                "blocked_tasks": blocked_tasks,
-                "completion_rate": completion_rate,
+                "total_users": users["total"],
+                "active_users": users["active"],
+                "active_tasks": kpis["active"],
+                "blocked_tasks": kpis["blocked"],
+                "completion_rate": kpis["completion_rate"],
             },
             "status_overview": status_overview,
-            "recent_activity": recent_activity,
-            "users": users_data,
+            "recent_activity": activity,
+            # The list itself is paged at GET /api/users/directory/.
+            "users_by_role": users["by_role"],
         })
 
 
@@ -103,59 +69,56 @@ class DashboardWidgetsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        tenant = request.user.tenant
-        tasks = Task.objects.filter(tenant=tenant, is_deleted=False)
+        tenant_id = request.user.tenant_id
+        tasks = Task.objects.filter(tenant_id=tenant_id, is_deleted=False)
 
         now = timezone.now()
-        overdue_count = tasks.filter(
-            due_date__isnull=False,
-            due_date__lt=now,
-        ).exclude(status__is_terminal=True, status__is_cancelled=False).count()
-        active_count = tasks.filter(status__name__iexact="In Progress").count()
-        done_count = tasks.filter(status__is_terminal=True, status__is_cancelled=False).count()
-        total_count = tasks.count()
-        completion_rate = round((done_count / total_count) * 100, 1) if total_count else 0
-
-        stage_distribution = list(
-            tasks.values("status__name").annotate(count=Count("id")).order_by("status__name")
+        not_done = (
+            Q(status__isnull=True)
+            | Q(status__is_terminal=False)
+            | Q(status__is_cancelled=True)
         )
-
-        recent_activity = [
-            {
-                "id": h.id,
-                "message": f"{h.action} on '{h.task.title}'",
-                "timestamp": h.timestamp,
-            }
-            for h in TaskHistory.objects.filter(task__tenant=tenant).order_by("-timestamp")[:10]
-        ]
-
-        my_tasks = [
-            {
-                "id": t.id,
-                "title": t.title,
-                "status": _status_name(t),
-                "priority": t.priority,
-                "due_date": t.due_date,
-            }
-            for t in tasks.filter(assignees=request.user).distinct().order_by("due_date")[:10]
-        ]
-
-        approval_queue = [
-            {
-                "id": t.id,
-                "title": t.title,
-                "status": _status_name(t),
-            }
-            for t in tasks.filter(status__name__iexact="In Review").order_by("-updated_at")[:10]
-        ]
-
         enabled_module_keys = set(
             TenantModule.objects.filter(
-                tenant=tenant,
+                tenant_id=tenant_id,
                 is_enabled=True,
             ).values_list("module__key", flat=True)
         )
 
+        # The overdue count is part of the tag because it changes with the
+        # clock alone, without any row being written. It rides along in the
+        # fingerprint query.
+        fingerprint = queryset_fingerprint(
+            tasks,
+            {
+                **DEFAULT_ETAG_AGGREGATES,
+                "boards": Max("board__updated_at"),
+                "overdue": Count("id", filter=Q(due_date__lt=now) & not_done),
+            },
+        )
+        overdue_count = dict(fingerprint)["overdue"]
+        etag = compute_etag(
+            "dashboard-widgets",
+            *request_etag_parts(request),
+            fingerprint,
+            TaskHistory.objects.filter(tenant_id=tenant_id).aggregate(latest=Max("id"))["latest"],
+            sorted(enabled_module_keys),
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        # Everything below is shared by all tabs of the tenant (my_tasks by
+        # all tabs of the user) until the next write bumps the data version.
+        version = data_version(tenant_id)
+        shared = get_or_compute(tenant_id, version, "shared", lambda: self._shared_widgets(tenant_id, tasks))
+        my_tasks = get_or_compute(
+            tenant_id,
+            version,
+            f"user:{request.user.id}",
+            lambda: self._my_tasks(tasks, request.user),
+        )
+        kpis = shared["kpis"]
+
         widget_payload = [
             {
                 "key": "tasks_overdue",
@@ -165,17 +128,17 @@ class DashboardWidgetsView(APIView):
             {
                 "key": "active_tasks",
                 "title": "Active Tasks",
-                "value": active_count,
+                "value": kpis["active"],
             },
             {
                 "key": "completion_rate",
                 "title": "Completion Rate",
-                "value": completion_rate,
+                "value": kpis["completion_rate"],
             },
             {
                 "key": "workflow_stage_distribution",
                 "title": "Workflow Stage Distribution",
-                "data": stage_distribution,
+                "data": shared["stage_distribution"],
             },
             {
                 "key": "my_tasks",
@@ -185,7 +148,7 @@ class DashboardWidgetsView(APIView):
             {
                 "key": "recent_activity",
                 "title": "Recent Activity",
-                "data": recent_activity,
+                "data": shared["recent_activity"],
             },
         ]
 
@@ -194,16 +157,61 @@ class DashboardWidgetsView(APIView):
                 {
                     "key": "approval_queue",
                     "title": "Approval Queue",
-                    "data": approval_queue,
+                    "data": shared["approval_queue"],
                 }
             )
 
-        return Response(
+        return set_etag(
+            Response(
+                {
+                    "widgets": widget_payload,
+                    "modules_enabled": list(enabled_module_keys),
+                }
+            ),
+            etag,
+        )
+
+    def _shared_widgets(self, tenant_id, tasks):
+        kpis = summarize(status_breakdown(tenant_id))
+        stage_distribution = [
+            {"status__name": name, "count": count}
+            for name, count in sorted(kpis.pop("by_name").items(), key=lambda item: item[0] or "")
+        ]
+
+        approval_queue = [
             {
-                "widgets": widget_payload,
-                "modules_enabled": list(enabled_module_keys),
+                "id": t.id,
+                "title": t.title,
+                "status": _status_name(t),
             }
-        )
+            for t in tasks.filter(status__name__iexact="In Review").select_related("status").order_by("-updated_at")[:10]
+        ]
+
+        return {
+            "kpis": kpis,
+            "stage_distribution": stage_distribution,
+            "recent_activity": recent_activity(tenant_id),
+            "approval_queue": approval_queue,
+        }
+
+    def _my_tasks(self, tasks, user):
+        return [
+            {
+                "id": t.id,
+                "title": t.title,
+                "status": _status_name(t),
+                "priority": t.priority,
+                "due_date": t.due_date,
+            }
+            for t in tasks.filter(assignees=user).select_related("status").distinct().order_by("due_date")[:10]
+        ]
+
+
+class DashboardWidgetCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response(cache_stats(request.user.tenant_id))
 
 
 class DashboardConfigView(APIView):
@@ -218,11 +226,8 @@ class DashboardConfigView(APIView):
         {"id": "w-overdue", "key": "overdue_tasks", "size": "m", "settings": {}},
     ]
 
-    def _is_admin(self, user):
-        return user.user_roles.filter(
-            tenant=user.tenant,
-            role__name__iexact=Role.ADMIN,
-        ).exists()
+    def _is_admin(self, request):
+        return get_role_context(request).is_admin
 
     def _parse_scope_key(self, request):
         scope_key = request.query_params.get("scope_key") or request.data.get("scope_key")
@@ -252,13 +257,13 @@ class DashboardConfigView(APIView):
 
     def _get_or_create_default(self, user):
         dashboard = DashboardConfig.objects.filter(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             is_default=True,
         ).first()
         if dashboard:
             return dashboard
         return DashboardConfig.objects.create(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             owner=user,
             name="Dashboard",
             visibility=DashboardConfig.Visibility.INTERNAL,
@@ -271,13 +276,13 @@ class DashboardConfigView(APIView):
     def _get_or_create_scoped(self, user, scope_key):
         name = self._scope_dashboard_name(scope_key)
         dashboard = DashboardConfig.objects.filter(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             name=name,
         ).first()
         if dashboard:
             return dashboard
         return DashboardConfig.objects.create(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             owner=user,
             name=name,
             visibility=DashboardConfig.Visibility.INTERNAL,
@@ -305,14 +310,25 @@ class DashboardConfigView(APIView):
             "updated_at": dashboard.updated_at,
         }
 
+    def _etag(self, request, is_admin):
+        return compute_etag(
+            "dashboard-config",
+            *request_etag_parts(request),
+            is_admin,
+            queryset_fingerprint(DashboardConfig.objects.filter(tenant_id=request.user.tenant_id)),
+        )
+
     def get(self, request):
         user = request.user
-        is_admin = self._is_admin(user)
+        is_admin = self._is_admin(request)
         scope_key = self._parse_scope_key(request)
 
         if scope_key:
             scoped_dashboard = self._get_or_create_scoped(user, scope_key)
-            return Response(
+            etag = self._etag(request, is_admin)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return set_etag(Response(
                 {
                     "dashboard": self._serialize_dashboard(scoped_dashboard, user, is_admin),
                     "dashboards": [
@@ -326,12 +342,15 @@ class DashboardConfigView(APIView):
                         }
                     ],
                 }
-            )
+            ), etag)
 
         self._get_or_create_default(user)
+        etag = self._etag(request, is_admin)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
         dashboards = list(
-            DashboardConfig.objects.filter(tenant=user.tenant).order_by("name", "-updated_at")
+            DashboardConfig.objects.filter(tenant_id=user.tenant_id).order_by("name", "-updated_at")
         )
         visible = [d for d in dashboards if self._can_view(d, user, is_admin)]
         if not visible:
@@ -349,7 +368,7 @@ class DashboardConfigView(APIView):
         if selected is None:
             selected = next((d for d in visible if d.is_default), None) or visible[0]
 
-        return Response(
+        return set_etag(Response(
             {
                 "dashboard": self._serialize_dashboard(selected, user, is_admin),
                 "dashboards": [
@@ -363,11 +382,11 @@ class DashboardConfigView(APIView):
                     for d in visible
                 ],
             }
-        )
+        ), etag)
 
     def post(self, request):
         user = request.user
-        if not self._is_admin(user):
+        if not self._is_admin(request):
             return Response(
                 {"detail": "Only admin can create dashboards."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -393,11 +412,11 @@ class DashboardConfigView(APIView):
         name = str(request.data.get("name", "")).strip() or "Dashboard"
         base_name = name
         idx = 2
-        while DashboardConfig.objects.filter(tenant=user.tenant, name=name).exists():
+        while DashboardConfig.objects.filter(tenant_id=user.tenant_id, name=name).exists():
             name = f"{base_name} {idx}"
             idx += 1
         dashboard = DashboardConfig.objects.create(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             owner=user,
             name=name,
             visibility=str(request.data.get("visibility", DashboardConfig.Visibility.INTERNAL)).upper(),
@@ -413,7 +432,7 @@ class DashboardConfigView(APIView):
 
     def patch(self, request):
         user = request.user
-        is_admin = self._is_admin(user)
+        is_admin = self._is_admin(request)
         scope_key = self._parse_scope_key(request)
 
         if scope_key:
@@ -448,7 +467,7 @@ class DashboardConfigView(APIView):
             return Response({"detail": "dashboard_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
 
         dashboard = DashboardConfig.objects.filter(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             id=dashboard_id,
         ).first()
         if not dashboard:
@@ -489,7 +508,7 @@ class DashboardConfigView(APIView):
 
     def delete(self, request):
         user = request.user
-        is_admin = self._is_admin(user)
+        is_admin = self._is_admin(request)
         dashboard_id = request.query_params.get("dashboard_id")
         if not dashboard_id:
             return Response({"detail": "dashboard_id is required."}, status=status.HTTP_400_BAD_REQUEST)
@@ -498,7 +517,7 @@ class DashboardConfigView(APIView):
         except (TypeError, ValueError):
             return Response({"detail": "dashboard_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
         dashboard = DashboardConfig.objects.filter(
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
             id=dashboard_id,
         ).first()
         if not dashboard:
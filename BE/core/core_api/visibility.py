@@ -0,0 +1,154 @@
+"""
+core_api/visibility.py
+
+Maintenance and querying of the TaskVisibility table.
+
+Role scoping rules (unchanged from the original Exists/M2M filters):
+    TASK_RECEIVER  assigned tasks, plus legacy orphaned tasks
+                   (no creator and no assignees)
+    TASK_CREATOR   tasks the user created, plus tasks with no creator
+    ADMIN          every task in the tenant
+
+Rows are rebuilt per task by sync_task_visibility(). Signal handlers in
+core_api/signals.py call it when assignees, the creator or soft deletion
+change; code that bypasses signals (QuerySet.update, bulk_create) must
+call it explicitly. Code that touches many tasks can wrap its writes in
+deferred_visibility_sync() to collapse per-row signal syncs into one.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Q
+
+from core_api.models import Task, TaskAssignee, TaskVisibility
+
+SYNC_BATCH_SIZE = 500
+
+ROLE_SCOPES = {
+    "TASK_RECEIVER": TaskVisibility.Scope.RECEIVER,
+    "TASK_CREATOR": TaskVisibility.Scope.CREATOR,
+}
+
+
+def scope_tasks_for_role(queryset, user, active_role, include_deleted=False):
+    """
+    Restricts a Task queryset to what `active_role` may see.
+    All conditions go into one filter() call so Django uses a single join.
+    """
+    scope = ROLE_SCOPES.get(active_role)
+    if scope is None:
+        return queryset
+
+    conditions = {
+        "visibility__tenant_id": user.tenant_id,
+        "visibility__scope": scope,
+    }
+    if not include_deleted:
+        conditions["visibility__is_deleted"] = False
+    return queryset.filter(
+        Q(visibility__user_id=user.id) | Q(visibility__user__isnull=True),
+        **conditions,
+    )
+
+
+def build_visibility_rows(task_id, tenant_id, created_by_id, is_deleted, assignee_ids):
+    rows = []
+
+    def row(scope, user_id):
+        return TaskVisibility(
+            tenant_id=tenant_id,
+            task_id=task_id,
+            user_id=user_id,
+            scope=scope,
+            is_deleted=is_deleted,
+        )
+
+    for user_id in sorted(set(assignee_ids)):
+        rows.append(row(TaskVisibility.Scope.RECEIVER, user_id))
+    if not assignee_ids and created_by_id is None:
+        rows.append(row(TaskVisibility.Scope.RECEIVER, None))
+
+    rows.append(row(TaskVisibility.Scope.CREATOR, created_by_id))
+    return rows
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_visibility_sync():
+    """
+    Queues sync_task_visibility() calls made inside the block and runs a
+    single batched sync on exit. Nested blocks join the outermost one.
+    """
+    if getattr(_deferred, "task_ids", None) is not None:
+        yield
+        return
+
+    pending = _deferred.task_ids = set()
+    try:
+        yield
+    finally:
+        _deferred.task_ids = None
+    sync_task_visibility(pending)
+
+
+def sync_task_visibility(task_ids):
+    """Recomputes visibility rows for the given tasks from Task + TaskAssignee."""
+    task_ids = {task_id for task_id in task_ids if task_id is not None}
+    pending = getattr(_deferred, "task_ids", None)
+    if pending is not None:
+        pending.update(task_ids)
+        return
+    task_ids = sorted(task_ids)
+    for start in range(0, len(task_ids), SYNC_BATCH_SIZE):
+        _sync_batch(task_ids[start:start + SYNC_BATCH_SIZE])
+
+
+def _sync_batch(task_ids):
+    tasks = list(
+        Task.objects.filter(id__in=task_ids)
+        .values_list("id", "tenant_id", "created_by_id", "is_deleted")
+    )
+    assignees_by_task = {}
+    for task_id, user_id in TaskAssignee.objects.filter(task_id__in=task_ids).values_list("task_id", "user_id"):
+        assignees_by_task.setdefault(task_id, []).append(user_id)
+
+    rows = []
+    for task_id, tenant_id, created_by_id, is_deleted in tasks:
+        rows.extend(
+            build_visibility_rows(
+                task_id,
+                tenant_id,
+                created_by_id,
+                is_deleted,
+                assignees_by_task.get(task_id, []),
+            )
+        )
+
+    with transaction.atomic():
+        TaskVisibility.objects.filter(task_id__in=task_ids).delete()
+        TaskVisibility.objects.bulk_create(rows, batch_size=SYNC_BATCH_SIZE)
+
+
+def rebuild_tenant_visibility(tenant_id, batch_size=SYNC_BATCH_SIZE):
+    """Rebuilds every visibility row for a tenant. Returns the number of tasks processed."""
+    processed = 0
+    last_id = 0
+    while True:
+        task_ids = list(
+            Task.objects.filter(tenant_id=tenant_id, id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not task_ids:
+            break
+        _sync_batch(task_ids)
+        processed += len(task_ids)
+        last_id = task_ids[-1]
+
+    # Rows whose task moved tenant or disappeared outside the ORM.
+    TaskVisibility.objects.filter(tenant_id=tenant_id).exclude(task__tenant_id=tenant_id).delete()
+    return processed
@@ -0,0 +1,133 @@
+"""
+core_api/widget_cache.py
+
+Shared cache for DashboardWidgetsView payloads.
+
+Every open dashboard tab polls the widgets every auto_refresh_seconds.
+With DASHBOARD_WIDGET_CACHE_SECONDS > 0 the computed parts are stored in
+the "widgets" cache (settings.DASHBOARD_WIDGET_CACHE) under the tenant's
+current data version:
+
+    widgets:<tenant>:<version>:shared       KPIs, stage distribution,
+                                            recent activity, approval queue
+    widgets:<tenant>:<version>:user:<id>    my_tasks
+
+so all tabs of a tenant share one computation until something changes.
+Writes that feed the widgets move the tenant to a new version once their
+transaction commits:
+
+    Task / TaskAssignee / TaskHistory / BoardStatus saves and deletes
+                           SIGNAL 5 in core_api/signals.py
+    bulk task mutations    core_api/bulk.py
+    imports                core_api/importer.py
+
+Entries under older versions are never read again and simply expire.
+The version is read before the payload is computed, so a payload built
+from pre-commit data can only ever land under the version it replaces.
+A missing (evicted) version restarts from the clock rather than from 0,
+so it cannot collide with keys that are still cached.
+
+The cache must be shared by all workers serving the API (file or
+database backend; LocMemCache only for tests and single-process
+development), otherwise other workers keep serving their own copy until
+it expires. Hit/miss counters are kept per tenant in the same cache and
+served by GET /api/dashboard/widgets/cache-stats/; with backends whose
+incr() is not atomic (file, database) they are approximate.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def _cache():
+    return caches[getattr(settings, "DASHBOARD_WIDGET_CACHE", "default")]
+
+
+def cache_seconds():
+    return int(getattr(settings, "DASHBOARD_WIDGET_CACHE_SECONDS", 0))
+
+
+def widget_cache_enabled():
+    return cache_seconds() > 0
+
+
+def _version_key(tenant_id):
+    return f"widgets:version:{tenant_id}"
+
+
+def _stats_key(tenant_id, name):
+    return f"widgets:stats:{tenant_id}:{name}"
+
+
+def _incr(cache, key, amount=1):
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        if cache.add(key, amount, None):
+            return amount
+        return cache.incr(key, amount)
+
+
+def data_version(tenant_id):
+    """The tenant's current data version (an int), or None with the cache off."""
+    if not widget_cache_enabled():
+        return None
+    cache = _cache()
+    version = cache.get(_version_key(tenant_id))
+    if version is None:
+        cache.add(_version_key(tenant_id), time.time_ns(), None)
+        version = cache.get(_version_key(tenant_id))
+    return version
+
+
+def _bump(tenant_id):
+    cache = _cache()
+    try:
+        cache.incr(_version_key(tenant_id))
+    except ValueError:
+        cache.set(_version_key(tenant_id), time.time_ns(), None)
+
+
+def bump_data_version(tenant_id):
+    """Moves the tenant to a new data version after the current transaction."""
+    if tenant_id is None or not widget_cache_enabled():
+        return
+    transaction.on_commit(lambda: _bump(tenant_id), robust=True)
+
+
+def get_or_compute(tenant_id, version, part, compute):
+    """Cached value of one payload part, computing and storing it on a miss."""
+    if not widget_cache_enabled():
+        return compute()
+
+    cache = _cache()
+    key = f"widgets:{tenant_id}:{version}:{part}"
+    value = cache.get(key)
+    if value is not None:
+        _incr(cache, _stats_key(tenant_id, "hits"))
+        return value
+
+    _incr(cache, _stats_key(tenant_id, "misses"))
+    value = compute()
+    cache.set(key, value, cache_seconds())
+    return value
+
+
+def cache_stats(tenant_id):
+    cache = _cache()
+    counts = cache.get_many([_stats_key(tenant_id, "hits"), _stats_key(tenant_id, "misses")])
+    hits = counts.get(_stats_key(tenant_id, "hits"), 0)
+    misses = counts.get(_stats_key(tenant_id, "misses"), 0)
+    lookups = hits + misses
+    return {
+        "enabled": widget_cache_enabled(),
+        "backend": f"{type(cache).__module__}.{type(cache).__name__}",
+        "ttl_seconds": cache_seconds(),
+        "data_version": cache.get(_version_key(tenant_id)),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups * 100, 1) if lookups else 0,
+    }
@@ -0,0 +1,160 @@
+"""
+users/authentication.py
+
+CachedJWTAuthentication: simplejwt's JWTAuthentication without the
+users-table query on every request.
+
+The authenticated user is rebuilt from a slim snapshot (SNAPSHOT_FIELDS
+plus the user's role names in their tenant) kept in the
+settings.USER_AUTH_CACHE cache for USER_AUTH_CACHE_SECONDS. A miss reads
+the user row and roles once and stores them. Fields outside the snapshot
+(password, last_login, profile text...) are deferred: reading one loads
+it from the database, and save() only writes loaded fields, so views can
+use request.user as before. Cached snapshots carry the roles to
+RoleContext (users/roles.py), which would otherwise query UserRole per
+request.
+
+Saving or deleting a User or UserRole drops that user's snapshot after
+commit (SIGNAL 8 in core_api/signals.py). Those deletes only reach other
+workers through a shared cache. With the default per-process LocMemCache,
+another worker can keep serving a stale snapshot (e.g. a deactivated
+user or a removed role) for up to USER_AUTH_CACHE_SECONDS, so caching is
+off by default (0): the user row is then read on every request, and the
+roles only when RoleContext needs them.
+QuerySet.update() on users bypasses the signals; call invalidate_user()
+after one.
+
+authenticate() also refuses users of a missing or suspended tenant (403,
+as TenantMiddleware does for session users) and sets request.tenant_id,
+so views can filter by tenant without loading request.user.tenant.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import PermissionDenied
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.middleware import activate_tenant
+from users.models import User, UserRole
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "display_name",
+    "tenant_id",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "notify_task_assigned",
+    "notify_task_status_changed",
+    "notify_due_reminder",
+    "notify_proof_submitted",
+    "notification_digest",
+)
+
+
+def _cache():
+    return caches[getattr(settings, "USER_AUTH_CACHE", "default")]
+
+
+def _cache_seconds():
+    return int(getattr(settings, "USER_AUTH_CACHE_SECONDS", 0))
+
+
+def _cache_key(user_id):
+    return f"users:auth:{user_id}"
+
+
+def _load_snapshot(user_id, with_roles=True):
+    fields = SNAPSHOT_FIELDS + (("password",) if api_settings.CHECK_REVOKE_TOKEN else ())
+    row = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values(*fields).first()
+    if row is None:
+        return None
+    if api_settings.CHECK_REVOKE_TOKEN:
+        row["password_hash"] = get_md5_hash_password(row.pop("password"))
+    if not with_roles:
+        return row
+    row["roles"] = list(
+        UserRole.objects.filter(user_id=row["id"], tenant_id=row["tenant_id"])
+        .values_list("role__name", flat=True)
+    )
+    return row
+
+
+def user_snapshot(user_id):
+    """The cached snapshot dict for `user_id`, or None if there is no such user."""
+    seconds = _cache_seconds()
+    if seconds <= 0:
+        # Nothing to save later requests; leave the roles to RoleContext,
+        # which only loads them when a view asks.
+        return _load_snapshot(user_id, with_roles=False)
+    cache = _cache()
+    snapshot = cache.get(_cache_key(user_id))
+    if snapshot is None:
+        snapshot = _load_snapshot(user_id)
+        if snapshot is not None:
+            cache.set(_cache_key(user_id), snapshot, seconds)
+    return snapshot
+
+
+def invalidate_user(user_id):
+    """Drops a user's snapshot after the current transaction."""
+    if _cache_seconds() <= 0:
+        return
+    key = _cache_key(user_id)
+    transaction.on_commit(lambda: _cache().delete(key), robust=True)
+
+
+def user_from_snapshot(snapshot):
+    # from_db() wants the loaded values in concrete field order; every
+    # other field is left deferred.
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in snapshot]
+    user = User.from_db(
+        router.db_for_read(User),
+        fields,
+        [snapshot[name] for name in fields],
+    )
+    if "roles" in snapshot:
+        user.cached_role_names = list(snapshot["roles"])
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Drop-in for JWTAuthentication in DEFAULT_AUTHENTICATION_CLASSES."""
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            error = activate_tenant(request._request, result[0].tenant_id)
+            if error:
+                raise PermissionDenied({"error": error})
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        snapshot = user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not snapshot["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != snapshot.get("password_hash"):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user_from_snapshot(snapshot)
@@ -0,0 +1,88 @@
+"""
+users/directory.py
+
+The tenant user directory behind GET /api/users/directory/ and the user
+counts on the admin dashboard.
+
+Each user's tenant roles are folded into one comma-separated column by
+StringAgg in the same query that reads the users, so a page of the
+directory is a single SELECT ... GROUP BY. Role and active filters are
+EXISTS / plain WHERE clauses, so they never narrow the aggregated roles.
+Pages are keyset-paginated on id (UserDirectoryCursorPagination in
+core_api/pagination.py).
+"""
+
+from django.db.models import Count, Exists, OuterRef, Q, StringAgg, Value
+from rest_framework.exceptions import ValidationError
+
+from users.models import Role, User, UserRole
+from users.roles import normalize_role_value
+
+DIRECTORY_FIELDS = ("id", "email", "first_name", "last_name", "is_active", "role_names")
+
+ROLE_NAMES = {name for name, _ in Role.ROLE_CHOICES}
+
+
+def parse_directory_filters(params):
+    """{"role": str | None, "is_active": bool | None} from ?role= / ?is_active=."""
+    role = normalize_role_value(params.get("role")) or None
+    if role is not None and role not in ROLE_NAMES:
+        raise ValidationError({"role": "Invalid role."})
+
+    is_active = params.get("is_active")
+    if is_active in (None, ""):
+        is_active = None
+    else:
+        value = str(is_active).strip().lower()
+        if value not in {"1", "true", "yes", "0", "false", "no"}:
+            raise ValidationError({"is_active": "Must be true or false."})
+        is_active = value in {"1", "true", "yes"}
+    return {"role": role, "is_active": is_active}
+
+
+def directory_queryset(tenant, *, role=None, is_active=None):
+    """Tenant users as DIRECTORY_FIELDS dicts, unordered."""
+    queryset = User.objects.filter(tenant=tenant)
+    if is_active is not None:
+        queryset = queryset.filter(is_active=is_active)
+    if role is not None:
+        queryset = queryset.filter(
+            Exists(UserRole.objects.filter(user=OuterRef("pk"), tenant=tenant, role__name=role))
+        )
+    return queryset.annotate(
+        role_names=StringAgg(
+            "user_roles__role__name",
+            Value(","),
+            filter=Q(user_roles__tenant=tenant),
+        ),
+    ).values(*DIRECTORY_FIELDS)
+
+
+def serialize_directory_user(row):
+    roles = sorted(row["role_names"].split(",")) if row["role_names"] else []
+    return {
+        "id": row["id"],
+        "email": row["email"],
+        "first_name": row["first_name"],
+        "last_name": row["last_name"],
+        # Keep singular field for compatibility with old clients.
+        "role": roles[0] if roles else None,
+        "roles": roles,
+        "is_active": row["is_active"],
+    }
+
+
+def user_counts(tenant):
+    """{"total": n, "active": n, "by_role": {role_name: n}} in two queries."""
+    counts = User.objects.filter(tenant=tenant).aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+    )
+    by_role = dict.fromkeys(sorted(ROLE_NAMES), 0)
+    by_role.update(
+        UserRole.objects.filter(tenant=tenant)
+        .order_by()
+        .values_list("role__name")
+        .annotate(n=Count("user_id", distinct=True))
+    )
+    return {"total": counts["total"], "active": counts["active"], "by_role": by_role}
@@ -0,0 +1,75 @@
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core_api.benchmarks import (
+    benchmark_environment,
+    latency_ms,
+    measure,
+    scratch_tenant,
+    seed_board,
+    seed_tasks,
+    seed_users,
+)
+from core_api.tests.helpers import api_client
+from users.authentication import CachedJWTAuthentication
+from users.models import Role
+
+PATHS = ("/api/notifications/unread-count/", "/api/tasks/")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries and latency per request with simplejwt's "
+        "JWTAuthentication and CachedJWTAuthentication (cache off and warm) "
+        "on a seeded scratch tenant (rolled back afterwards)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=500, help="Requests per path and setup.")
+        parser.add_argument("--tasks", type=int, default=200)
+        parser.add_argument("--cache-seconds", type=int, default=30)
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        setups = [
+            ("JWTAuthentication", True, 0),
+            ("CachedJWTAuthentication, cache off", False, 0),
+            ("CachedJWTAuthentication, warm cache", False, options["cache_seconds"]),
+        ]
+
+        with benchmark_environment(), scratch_tenant() as tenant:
+            users = seed_users(tenant, 20)
+            admin = seed_users(tenant, 1, role_name=Role.ADMIN, prefix="admin")[0]
+            seed_tasks(tenant, seed_board(tenant), max(1, options["tasks"]), users)
+            client = api_client(admin, Role.ADMIN)
+
+            self.stdout.write(f"{'authentication':<38}  {'path':<33}  queries  p50/p95 ms")
+            for label, plain, seconds in setups:
+                with self._authentication(plain, seconds):
+                    for path in PATHS:
+                        client.get(path)  # warm caches and connections
+                        _, stats = measure(lambda: client.get(path))
+                        latency = latency_ms(lambda: client.get(path), repeat)
+                        self.stdout.write(
+                            f"{label:<38}  {path:<33}  {stats['queries']:>7}  "
+                            f"{latency['p50']:.2f}/{latency['p95']:.2f}"
+                        )
+
+        self.stdout.write(self.style.SUCCESS("Done; scratch tenant rolled back."))
+
+    def _authentication(self, plain, seconds):
+        # Views bind their authentication classes at import, so the plain
+        # setup swaps in simplejwt's user lookup (a User query, then a
+        # UserRole query from RoleContext) rather than the class itself.
+        # The tenant check in authenticate() runs in every setup.
+        stack = ExitStack()
+        stack.enter_context(override_settings(USER_AUTH_CACHE_SECONDS=seconds))
+        if plain:
+            stack.enter_context(
+                mock.patch.object(CachedJWTAuthentication, "get_user", JWTAuthentication.get_user)
+            )
+        return stack
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core_api.benchmarks import benchmark_environment, latency_ms, scratch_tenant, seed_users
+from users.models import User
+from users.search import SEARCH_LIMIT, rebuild_tenant_tokens, search_users
+
+# One-letter, prefix, substring, accented / unaccented and multi-term input.
+QUERIES = ("a", "jo", "mül", "muller", "hns", "ohnson", "lopez", "léa gar", "user123", "zzz")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare search_users() with the icontains scan TenantUserListView "
+        "runs for ?search= on a seeded scratch tenant (rolled back afterwards)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50000)
+        parser.add_argument("--repeat", type=int, default=50, help="Calls per query and path.")
+        parser.add_argument("--limit", type=int, default=SEARCH_LIMIT)
+        parser.add_argument("--query", action="append", help="Query to time; repeatable.")
+
+    def handle(self, *args, **options):
+        queries = options["query"] or QUERIES
+        limit = options["limit"]
+        repeat = max(1, options["repeat"])
+
+        with benchmark_environment(), scratch_tenant() as tenant:
+            self.stdout.write(f"Seeding {options['users']} user(s) and their search tokens...")
+            seed_users(tenant, max(1, options["users"]))
+            rebuild_tenant_tokens(tenant.id)
+
+            self.stdout.write(
+                f"{'query':<10}  {'tokens p50/p95 ms':>17}  {'hits':>4}  "
+                f"{'icontains p50/p95 ms':>20}  {'hits':>4}"
+            )
+            for query in queries:
+                tokens = latency_ms(lambda: search_users(tenant, query, limit), repeat)
+                scan = latency_ms(lambda: self._icontains(tenant, query, limit), repeat)
+                self.stdout.write(
+                    f"{query:<10}  {tokens['p50']:8.2f}/{tokens['p95']:<8.2f}  "
+                    f"{len(search_users(tenant, query, limit)):>4}  "
+                    f"{scan['p50']:11.2f}/{scan['p95']:<8.2f}  "
+                    f"{len(self._icontains(tenant, query, limit)):>4}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done; scratch tenant rolled back."))
+
+    def _icontains(self, tenant, query, limit):
+        # The directory filter search_users() replaces for type-ahead.
+        return list(
+            User.objects.filter(tenant=tenant)
+            .filter(
+                Q(first_name__icontains=query)
+                | Q(last_name__icontains=query)
+                | Q(email__icontains=query)
+            )
+            .order_by("first_name", "last_name", "email")[:limit]
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from context.models import Tenant
+from users.search import rebuild_tenant_tokens
+
+
+class Command(BaseCommand):
+    help = "Rewrite the UserSearchToken rows behind the type-ahead user search."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            help="Tenant slug to rebuild. Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all().order_by("id")
+        if options["tenant"]:
+            tenants = tenants.filter(slug=options["tenant"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found.")
+
+        processed = 0
+        for tenant in tenants:
+            processed += rebuild_tenant_tokens(tenant.id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search tokens for {processed} user(s).")
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_notification_preferences'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notification_digest',
+            field=models.BooleanField(default=False),
+        ),
+    ]
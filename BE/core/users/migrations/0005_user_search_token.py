@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:12
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokens_for(first_name, last_name, display_name, email):
+    # Frozen copy of users.search.user_tokens() as of this migration.
+    text = " ".join([first_name or "", last_name or "", display_name or "", (email or "").split("@")[0]])
+    text = "".join(
+        ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch)
+    ).casefold()
+    tokens = set()
+    for word in WORD_RE.findall(text):
+        word = word[:64]
+        tokens.add(("WORD", word))
+        for start in range(1, len(word) - 1):
+            tokens.add(("SUFFIX", word[start:]))
+    return tokens
+
+
+def backfill_user_search_tokens(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserSearchToken = apps.get_model("users", "UserSearchToken")
+    rows = []
+    for user_id, tenant_id, first_name, last_name, display_name, email in (
+        User.objects.filter(is_active=True)
+        .values_list("id", "tenant_id", "first_name", "last_name", "display_name", "email")
+        .iterator(chunk_size=1000)
+    ):
+        for kind, token in tokens_for(first_name, last_name, display_name, email):
+            rows.append(UserSearchToken(tenant_id=tenant_id, user_id=user_id, kind=kind, token=token))
+        if len(rows) >= 5000:
+            UserSearchToken.objects.bulk_create(rows)
+            rows = []
+    UserSearchToken.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+        ('users', '0004_user_notification_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('WORD', 'Word'), ('SUFFIX', 'Suffix')], max_length=8)),
+                ('token', models.CharField(max_length=64)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_search_tokens', to='context.tenant')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tenant', 'kind', 'token', 'user'], name='user_search_token_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_user_search_tokens, migrations.RunPython.noop),
+    ]
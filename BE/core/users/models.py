@@ -16,6 +16,8 @@ class User(AbstractUser):
     notify_task_status_changed = models.BooleanField(default=True)
     notify_due_reminder = models.BooleanField(default=True)
     notify_proof_submitted = models.BooleanField(default=True)
+    # Fold unread notifications into a periodic DIGEST (send_notification_digests).
+    notification_digest = models.BooleanField(default=False)
 
     tenant = models.ForeignKey(
         Tenant,
@@ -71,3 +73,39 @@ class UserRole(models.Model):
 
     def __str__(self):
         return f"{self.user} → {self.role.name} ({self.tenant})"
+
+
+# ---------- TYPE-AHEAD SEARCH ----------
+
+class UserSearchToken(models.Model):
+    """
+    Normalized name/email tokens of active users for the assignee picker
+    (users/search.py). Every word is stored as a WORD and its inner
+    suffixes as SUFFIX rows, so both prefix and substring matches are
+    B-tree range scans on (tenant, kind, token).
+    """
+
+    class Kind(models.TextChoices):
+        WORD   = "WORD",   "Word"
+        SUFFIX = "SUFFIX", "Suffix"
+
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="user_search_tokens",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+    )
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tenant", "kind", "token", "user"], name="user_search_token_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.token} → {self.user_id}"
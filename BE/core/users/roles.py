@@ -0,0 +1,111 @@
+"""
+users/roles.py
+
+Request-scoped role resolution.
+
+RoleContext holds the authenticated user's tenant roles and the validated
+X-Active-Role header. Roles are loaded from UserRole at most once per
+request, on first use, so permission classes, views and serializers can
+all ask for them without repeating the query.
+
+core.middleware.RoleContextMiddleware attaches one to every request as
+request.role_context. Users authenticated by CachedJWTAuthentication
+(users/authentication.py) from a cached snapshot arrive with their role
+names, in which case no query runs at all. Always go through get_role_context(), which also
+works for requests that never passed through the middleware (e.g. views
+called directly with APIRequestFactory).
+"""
+
+from rest_framework.exceptions import PermissionDenied
+
+from users.models import Role, UserRole
+
+
+def user_role_names(user):
+    """
+    Role.name values `user` holds in their tenant: the names cached by
+    CachedJWTAuthentication if present, otherwise one UserRole query.
+    """
+    cached = getattr(user, "cached_role_names", None)
+    if cached is not None:
+        return list(cached)
+    return list(
+        UserRole.objects.filter(user=user, tenant_id=user.tenant_id)
+        .values_list("role__name", flat=True)
+    )
+
+
+def normalize_role_value(value):
+    if value is None:
+        return None
+    return str(value).strip().upper().replace(" ", "_")
+
+
+class RoleContext:
+
+    def __init__(self, request):
+        # Plain Django HttpRequest. DRF copies the authenticated user back
+        # onto it, so JWT users are visible here once authentication ran.
+        self._request = request
+        self._user_id = None
+        self._role_names = None
+
+    @property
+    def user(self):
+        return getattr(self._request, "user", None)
+
+    @property
+    def role_names(self):
+        """Raw Role.name values for the user's current tenant."""
+        user = self.user
+        if not user or not user.is_authenticated or not getattr(user, "tenant_id", None):
+            return []
+        if self._role_names is None or self._user_id != user.id:
+            self._role_names = user_role_names(user)
+            self._user_id = user.id
+        return self._role_names
+
+    @property
+    def roles(self):
+        return {
+            normalized
+            for normalized in (normalize_role_value(role) for role in self.role_names)
+            if normalized
+        }
+
+    @property
+    def active_role(self):
+        return normalize_role_value(self._request.headers.get("X-Active-Role"))
+
+    @property
+    def has_valid_active_role(self):
+        active_role = self.active_role
+        return active_role is not None and active_role in self.roles
+
+    @property
+    def is_admin(self):
+        return Role.ADMIN in self.roles
+
+    def has_role(self, role_name):
+        return normalize_role_value(role_name) in self.roles
+
+    def require_active_role(self):
+        """Returns the normalized active role, or raises if the user does not hold it."""
+        if not self.has_valid_active_role:
+            raise PermissionDenied("Invalid active role.")
+        return self.active_role
+
+    def invalidate(self):
+        self._role_names = None
+        user = self.user
+        if user is not None and getattr(user, "cached_role_names", None) is not None:
+            user.cached_role_names = None
+
+
+def get_role_context(request):
+    http_request = getattr(request, "_request", request)
+    context = getattr(http_request, "role_context", None)
+    if context is None:
+        context = RoleContext(http_request)
+        http_request.role_context = context
+    return context
@@ -0,0 +1,154 @@
+"""
+users/search.py
+
+Type-ahead user search for assignee pickers (GET /api/users/search/).
+
+Matching runs on UserSearchToken instead of icontains scans over the user
+table. Every word of an active user's first, last and display name and
+of the local part of their email is normalized (lowercased, accents
+stripped) and stored twice over:
+
+    WORD      the word itself           "johnson"
+    SUFFIX    its inner suffixes        "ohnson", "hnson", ... "on"
+
+so "jo" (prefix) and "hns" (substring) are both range scans
+`token >= term AND token < next(term)` on the (tenant, kind, token, user)
+index, the same plain B-tree on PostgreSQL and SQLite. Prefix matches are
+returned first, then substring matches, each in token order. With
+several terms the longest one drives the index scan; the others must
+match some token of the same user, checked through the user_id index.
+
+Tokens are rewritten by index_users(), called from the User post_save
+signal (SIGNAL 6 in core_api/signals.py) when a searchable field
+changes; bulk_create() callers and raw SQL need
+`manage.py rebuild_user_search_tokens`.
+"""
+
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+from users.models import User, UserSearchToken
+
+SEARCH_LIMIT = 10
+SEARCH_MAX_LIMIT = 25
+SEARCH_MAX_TERMS = 4
+# Shortest inner suffix stored; one-letter suffixes would match everyone.
+MIN_SUFFIX_LENGTH = 2
+TOKEN_MAX_LENGTH = UserSearchToken._meta.get_field("token").max_length
+INDEX_BATCH_SIZE = 500
+
+# A change to any of these rewrites the user's tokens.
+SEARCH_FIELDS = ("first_name", "last_name", "display_name", "email", "is_active", "tenant")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def search_terms(query):
+    terms = [term[:TOKEN_MAX_LENGTH] for term in _WORD_RE.findall(normalize(query))]
+    return terms[:SEARCH_MAX_TERMS]
+
+
+def user_tokens(first_name, last_name, display_name, email):
+    """{(kind, token)} for one user's searchable fields."""
+    text = " ".join([first_name or "", last_name or "", display_name or "", (email or "").split("@")[0]])
+    tokens = set()
+    for word in _WORD_RE.findall(normalize(text)):
+        word = word[:TOKEN_MAX_LENGTH]
+        tokens.add((UserSearchToken.Kind.WORD, word))
+        for start in range(1, len(word) - MIN_SUFFIX_LENGTH + 1):
+            tokens.add((UserSearchToken.Kind.SUFFIX, word[start:]))
+    return tokens
+
+
+def _token_range(term):
+    # Every string starting with `term` sorts in [term, term with its last
+    # character bumped), so this is an index range scan on every backend.
+    return {"token__gte": term, "token__lt": term[:-1] + chr(ord(term[-1]) + 1)}
+
+
+# =============================================================================
+# INDEX MAINTENANCE
+# =============================================================================
+
+def index_users(user_ids):
+    """Rewrites the tokens of the given users. Inactive users get none."""
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    for start in range(0, len(user_ids), INDEX_BATCH_SIZE):
+        batch = user_ids[start:start + INDEX_BATCH_SIZE]
+        rows = [
+            UserSearchToken(tenant_id=tenant_id, user_id=user_id, kind=kind, token=token)
+            for user_id, tenant_id, first_name, last_name, display_name, email in
+            User.objects.filter(id__in=batch, is_active=True)
+            .values_list("id", "tenant_id", "first_name", "last_name", "display_name", "email")
+            for kind, token in user_tokens(first_name, last_name, display_name, email)
+        ]
+        with transaction.atomic():
+            UserSearchToken.objects.filter(user_id__in=batch).delete()
+            UserSearchToken.objects.bulk_create(rows, batch_size=2000)
+
+
+def rebuild_tenant_tokens(tenant_id):
+    """Rewrites every token of a tenant. Returns the number of users processed."""
+    UserSearchToken.objects.filter(tenant_id=tenant_id).exclude(user__tenant_id=tenant_id).delete()
+    processed = 0
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.filter(tenant_id=tenant_id, id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:INDEX_BATCH_SIZE]
+        )
+        if not user_ids:
+            return processed
+        index_users(user_ids)
+        processed += len(user_ids)
+        last_id = user_ids[-1]
+
+
+# =============================================================================
+# QUERYING
+# =============================================================================
+
+def search_users(tenant, query, limit=SEARCH_LIMIT):
+    """Active users of `tenant` matching `query`, best first, at most `limit`."""
+    terms = sorted(search_terms(query), key=len, reverse=True)
+    if not terms or limit <= 0:
+        return []
+
+    matches = UserSearchToken.objects.filter(tenant=tenant, **_token_range(terms[0]))
+    for term in terms[1:]:
+        matches = matches.filter(
+            Exists(UserSearchToken.objects.filter(user_id=OuterRef("user_id"), **_token_range(term)))
+        )
+
+    found = []
+    for kind in (UserSearchToken.Kind.WORD, UserSearchToken.Kind.SUFFIX):
+        tier = matches.filter(kind=kind).order_by("token", "user_id")
+        last = None
+        # A user can match through several tokens; read past duplicates
+        # in small keyset steps instead of fetching the whole range.
+        while len(found) < limit:
+            page = tier
+            if last is not None:
+                page = tier.filter(Q(token__gt=last[0]) | Q(token=last[0], user_id__gt=last[1]))
+            rows = list(page.values_list("token", "user_id")[: limit * 2])
+            for _, user_id in rows:
+                if user_id not in found:
+                    found.append(user_id)
+            if len(rows) < limit * 2:
+                break
+            last = rows[-1]
+        if len(found) >= limit:
+            break
+
+    found = found[:limit]
+    users = User.objects.in_bulk(found)
+    return [users[user_id] for user_id in found if user_id in users]
@@ -0,0 +1,45 @@
+"""
+CachedJWTAuthentication (users/authentication.py): queries per request
+with the snapshot cache off (the default) and warm.
+"""
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from core_api.tests.helpers import api_client, count_queries, make_tenant, make_user
+from users.models import Role, User, UserRole
+
+UNREAD_COUNT = "/api/notifications/unread-count/"
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        caches["default"].clear()
+        self.user = make_user(make_tenant(), "ada", Role.TASK_RECEIVER)
+        self.client = api_client(self.user)
+
+    def queries(self, table, path=UNREAD_COUNT):
+        response, count = count_queries(table, lambda: self.client.get(path))
+        self.assertEqual(response.status_code, 200)
+        return count
+
+    @override_settings(USER_AUTH_CACHE_SECONDS=0)
+    def test_cache_off_reads_roles_only_when_needed(self):
+        self.assertEqual(self.queries(User._meta.db_table), 1)
+        self.assertEqual(self.queries(UserRole._meta.db_table), 0)
+        self.assertEqual(self.queries(UserRole._meta.db_table, "/api/tasks/"), 1)
+
+    @override_settings(USER_AUTH_CACHE_SECONDS=30)
+    def test_warm_cache_skips_user_and_roles(self):
+        self.client.get("/api/tasks/")
+        self.assertEqual(self.queries(User._meta.db_table, "/api/tasks/"), 0)
+        self.assertEqual(self.queries(UserRole._meta.db_table, "/api/tasks/"), 0)
+
+    @override_settings(USER_AUTH_CACHE_SECONDS=30)
+    def test_deactivated_user_is_refused(self):
+        self.client.get(UNREAD_COUNT)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get(UNREAD_COUNT).status_code, 401)
@@ -0,0 +1,97 @@
+"""
+User directory (users/directory.py): roles aggregated per user in the
+same query, filters that never narrow those roles, keyset pages on id,
+and the users_by_role counts on the admin dashboard.
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core_api.pagination import encode_cursor
+from core_api.tests.helpers import api_client, make_tenant, make_user
+from users.directory import directory_queryset, serialize_directory_user
+from users.models import Role, UserRole
+
+DIRECTORY = "/api/users/directory/"
+
+
+class UserDirectoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.acme = make_tenant()
+        cls.globex = make_tenant("globex")
+        cls.admin = make_user(cls.acme, "admin", Role.ADMIN, Role.TASK_CREATOR)
+        cls.creator = make_user(cls.acme, "creator", Role.TASK_CREATOR, Role.TASK_RECEIVER)
+        cls.receiver = make_user(cls.acme, "receiver", Role.TASK_RECEIVER)
+        cls.former = make_user(cls.acme, "former", Role.TASK_RECEIVER, is_active=False)
+        cls.guest = make_user(cls.acme, "guest")
+        # A role held in another tenant is not one of acme's roles.
+        UserRole.objects.create(user=cls.receiver, tenant=cls.globex, role=Role.objects.get(name=Role.ADMIN))
+        make_user(cls.globex, "globex-admin", Role.ADMIN)
+
+    def roles(self, **filters):
+        rows = directory_queryset(self.acme, **filters).order_by("id")
+        return {row["email"].split("@")[0]: serialize_directory_user(row)["roles"] for row in rows}
+
+    def test_roles_are_aggregated_per_user(self):
+        self.assertEqual(self.roles(), {
+            "admin": [Role.ADMIN, Role.TASK_CREATOR],
+            "creator": [Role.TASK_CREATOR, Role.TASK_RECEIVER],
+            "receiver": [Role.TASK_RECEIVER],
+            "former": [Role.TASK_RECEIVER],
+            "guest": [],
+        })
+
+    def test_filters_keep_every_role(self):
+        self.assertEqual(self.roles(role=Role.TASK_CREATOR), {
+            "admin": [Role.ADMIN, Role.TASK_CREATOR],
+            "creator": [Role.TASK_CREATOR, Role.TASK_RECEIVER],
+        })
+        self.assertEqual(list(self.roles(role=Role.TASK_RECEIVER, is_active=False)), ["former"])
+        self.assertEqual(self.roles(role=Role.ADMIN), {"admin": [Role.ADMIN, Role.TASK_CREATOR]})
+
+    def test_endpoint_pages_on_id(self):
+        client = api_client(self.admin, Role.ADMIN)
+        response = client.get(DIRECTORY, {"page_size": 2})
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            body = response.json()
+            self.assertLessEqual(len(body["results"]), 2)
+            ids += [row["id"] for row in body["results"]]
+            if not body["next"]:
+                break
+            response = client.get(body["next"])
+
+        expected = [self.admin.id, self.creator.id, self.receiver.id, self.former.id, self.guest.id]
+        self.assertEqual(ids, sorted(expected))
+        row = client.get(DIRECTORY, {"role": "task_creator"}).json()["results"][0]
+        self.assertEqual((row["role"], row["roles"]), (Role.ADMIN, [Role.ADMIN, Role.TASK_CREATOR]))
+
+    def test_one_query_per_page(self):
+        client = api_client(self.admin, Role.ADMIN)
+
+        def queries(page_size):
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(client.get(DIRECTORY, {"page_size": page_size}).status_code, 200)
+            return len(captured.captured_queries)
+
+        queries(1)  # warm per-process caches
+        self.assertEqual(queries(1), queries(5))
+
+    def test_bad_requests(self):
+        client = api_client(self.admin, Role.ADMIN)
+        self.assertEqual(client.get(DIRECTORY, {"role": "OWNER"}).status_code, 400)
+        self.assertEqual(client.get(DIRECTORY, {"is_active": "maybe"}).status_code, 400)
+        self.assertEqual(client.get(DIRECTORY, {"cursor": "garbage"}).status_code, 400)
+        self.assertEqual(client.get(DIRECTORY, {"cursor": encode_cursor({"i": "x"})}).status_code, 400)
+        self.assertEqual(api_client(self.creator, Role.TASK_CREATOR).get(DIRECTORY).status_code, 403)
+
+    def test_users_by_role_on_admin_dashboard(self):
+        response = api_client(self.admin, Role.ADMIN).get("/api/admin/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["users_by_role"], {Role.ADMIN: 1, Role.TASK_CREATOR: 2, Role.TASK_RECEIVER: 3})
+        self.assertEqual((body["kpis"]["total_users"], body["kpis"]["active_users"]), (5, 4))
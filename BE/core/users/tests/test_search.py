@@ -0,0 +1,80 @@
+"""
+Type-ahead user search (users/search.py): prefix matches before substring
+matches, accent-insensitive terms, and multi-term queries.
+"""
+
+from django.test import TestCase
+
+from core_api.tests.helpers import api_client, make_tenant, make_user
+from users.models import UserSearchToken
+from users.search import search_users
+
+
+class SearchUsersTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = make_tenant()
+        cls.people = {}
+        for number, (username, first_name, last_name) in enumerate([
+            ("johnson", "Mary", "Johnson"),
+            ("bjohnke", "Ana", "Bjohnke"),
+            ("chloe", "Chloé", "Müller"),
+            ("lea-garcia", "Léa", "García"),
+            ("lea-dubois", "Léa", "Dubois"),
+            ("ana-garcia", "Ana", "Garcia"),
+            ("annick", "Annick", "Annan"),
+        ]):
+            # Email local parts are indexed too; keep them out of the way.
+            cls.people[username] = make_user(
+                cls.tenant, username, first_name=first_name, last_name=last_name, email=f"u{number}@acme.test"
+            )
+
+    def search(self, query, limit=10):
+        return [user.username for user in search_users(self.tenant, query, limit)]
+
+    def test_prefix_matches_come_before_substring_matches(self):
+        self.assertEqual(self.search("john"), ["johnson", "bjohnke"])
+        self.assertEqual(self.search("ohn"), ["bjohnke", "johnson"])
+
+    def test_accents_and_case_are_folded(self):
+        self.assertEqual(self.search("MULLER"), ["chloe"])
+        self.assertEqual(self.search("chloe"), ["chloe"])
+        self.assertEqual(self.search("Müll"), ["chloe"])
+        self.assertEqual(sorted(self.search("garcía")), ["ana-garcia", "lea-garcia"])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search("lea gar"), ["lea-garcia"])
+        self.assertEqual(self.search("gar léa"), ["lea-garcia"])
+        self.assertEqual(self.search("lea johnson"), [])
+
+    def test_limit_and_one_row_per_user(self):
+        # Both of Annick Annan's names start with "ann".
+        self.assertEqual(self.search("ann"), ["annick"])
+        # Equal prefix matches come in user order.
+        self.assertEqual(self.search("ana"), ["bjohnke", "ana-garcia"])
+        self.assertEqual(len(self.search("a", limit=3)), 3)
+
+    def test_blank_query_matches_nobody(self):
+        self.assertEqual(self.search("  ?! "), [])
+
+    def test_tokens_follow_profile_changes(self):
+        user = self.people["lea-dubois"]
+        user.last_name = "Martin"
+        user.save()
+        self.assertEqual(self.search("dubois"), [])
+        self.assertEqual(self.search("martin"), ["lea-dubois"])
+
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.search("martin"), [])
+        self.assertFalse(UserSearchToken.objects.filter(user=user).exists())
+
+    def test_other_tenants_are_not_searched(self):
+        make_user(make_tenant("globex"), "johnny", first_name="Johnny")
+        self.assertEqual(self.search("john"), ["johnson", "bjohnke"])
+
+    def test_endpoint(self):
+        response = api_client(self.people["johnson"]).get("/api/users/search/", {"q": "lea", "limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([user["id"] for user in response.json()["results"]], [self.people["lea-garcia"].id])
@@ -22,7 +22,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data = super().validate(attrs)
 
         roles = list(
-            UserRole.objects.filter(user=self.user, tenant=self.user.tenant)
+            UserRole.objects.filter(user=self.user, tenant_id=self.user.tenant_id)
             .values_list("role__name", flat=True)
         )
         data["roles"] = roles
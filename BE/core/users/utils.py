@@ -7,7 +7,7 @@ def user_has_role(user, role_name: str) -> bool:
         return False
 
     return user.user_roles.filter(
-        tenant=user.tenant,
+        tenant_id=user.tenant_id,
         role__name=role_name,
     ).exists()
 
@@ -17,6 +17,6 @@ def is_admin(user):
         return False
 
     return user.user_roles.filter(
-        tenant=user.tenant,
+        tenant_id=user.tenant_id,
         role__name__iexact="ADMIN"
     ).exists()
@@ -14,8 +14,11 @@ from users.throttling import LoginRateThrottle
 from .token_serializer import CustomTokenObtainPairSerializer
 from .models import User, Role, UserRole
 
+from core_api.pagination import UserDirectoryCursorPagination
 from core_api.serializers import TaskUserSerializer
-from users.utils import is_admin
+from users.directory import directory_queryset, parse_directory_filters, serialize_directory_user
+from users.roles import get_role_context
+from users.search import SEARCH_LIMIT, SEARCH_MAX_LIMIT, search_users
 
 UserModel = get_user_model()
 
@@ -44,9 +47,9 @@ class TenantUserListView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        tenant = user.tenant
+        tenant_id = user.tenant_id
         # Read-only org directory: any authenticated user in the tenant can list/search users.
-        queryset = User.objects.filter(tenant=tenant)
+        queryset = User.objects.filter(tenant_id=tenant_id)
         search = (self.request.query_params.get("search") or "").strip()
         if search:
             queryset = queryset.filter(
@@ -57,7 +60,7 @@ class TenantUserListView(generics.ListCreateAPIView):
         return queryset.order_by("first_name", "last_name", "email")
 
     def create(self, request, *args, **kwargs):
-        if not is_admin(request.user):
+        if not get_role_context(request).is_admin:
             raise PermissionDenied("Only admins can create users.")
 
         first_name = str(request.data.get("first_name", "")).strip()
@@ -85,7 +88,7 @@ class TenantUserListView(generics.ListCreateAPIView):
             email=email,
             first_name=first_name,
             last_name=last_name,
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
         )
         try:
             validate_password(password, user=temp_user)
@@ -101,7 +104,7 @@ class TenantUserListView(generics.ListCreateAPIView):
         role_obj, _ = Role.objects.get_or_create(name=role_name)
         UserRole.objects.get_or_create(
             user=temp_user,
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
             role=role_obj,
         )
 
@@ -111,16 +114,54 @@ class TenantUserListView(generics.ListCreateAPIView):
         )
 
 
+class TenantUserSearchView(generics.GenericAPIView):
+    """
+    Type-ahead for assignee pickers: ?q=<text>&limit=<n>.
+    Prefix matches first, then substring matches; see users/search.py.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_LIMIT))
+        except (TypeError, ValueError):
+            limit = SEARCH_LIMIT
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        users = search_users(request.user.tenant_id, request.query_params.get("q", ""), limit)
+        return Response({"results": TaskUserSerializer(users, many=True).data})
+
+
+class TenantUserDirectoryView(generics.GenericAPIView):
+    """
+    Admin user directory with roles, keyset-paginated.
+    ?role=<ROLE> / ?is_active=true|false narrow it; see users/directory.py.
+    """
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = UserDirectoryCursorPagination
+
+    def get(self, request):
+        if not get_role_context(request).is_admin:
+            raise PermissionDenied("Only admins can browse the user directory.")
+        queryset = directory_queryset(
+            request.user.tenant_id,
+            **parse_directory_filters(request.query_params),
+        )
+        rows = self.paginate_queryset(queryset)
+        return self.get_paginated_response([serialize_directory_user(row) for row in rows])
+
+
 class TenantUserDetailView(generics.DestroyAPIView):
     serializer_class = TaskUserSerializer
     permission_classes = [IsAuthenticated]
     lookup_url_kwarg = "user_id"
 
     def get_queryset(self):
-        return User.objects.filter(tenant=self.request.user.tenant)
+        return User.objects.filter(tenant_id=self.request.user.tenant_id)
 
     def destroy(self, request, *args, **kwargs):
-        if not is_admin(request.user):
+        if not get_role_context(request).is_admin:
             raise PermissionDenied("Only admins can remove users.")
         instance = self.get_object()
         if instance.id == request.user.id:
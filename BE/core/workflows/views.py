@@ -3,8 +3,8 @@ from collections import Counter
 
 from django.db import transaction
 from django.db import IntegrityError
-from django.db.models import F
-from django.db.models import Count
+from django.db.models import F, Q
+from django.db.models import Count, Max, Sum
 from django.utils import timezone
 
 from rest_framework.permissions import IsAuthenticated
@@ -30,8 +30,10 @@ from .serializers import (
     TenantModuleSerializer,
     TenantModuleUpdateSerializer,
 )
+from core_api.conditional import ConditionalGetMixin
 from core_api.permissions import IsAdminRole
 from users.models import Role
+from users.roles import get_role_context
 from core_api.models import Task
 
 DEFAULT_STAGE_COLORS = [
@@ -52,15 +54,24 @@ def normalize_color(value, fallback):
     return fallback
 
 
-class WorkflowViewSet(ModelViewSet):
+class WorkflowViewSet(ConditionalGetMixin, ModelViewSet):
     serializer_class = WorkflowSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ["get", "post", "patch", "delete"]
 
+    # Workflows have no updated_at: the builder and publish bump `version`,
+    # set-default only flips is_default.
+    etag_aggregates = {
+        "count": Count("id"),
+        "ids": Sum("id"),
+        "versions": Sum("version"),
+        "default": Max("id", filter=Q(is_default=True)),
+    }
+
     def get_queryset(self):
-        tenant = self.request.user.tenant
+        tenant_id = self.request.user.tenant_id
         return (
-            Workflow.objects.filter(tenant=tenant)
+            Workflow.objects.filter(tenant_id=tenant_id)
             .prefetch_related(
                 "stages",
                 "statuses",
@@ -107,11 +118,7 @@ class WorkflowViewSet(ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def create(self, request, *args, **kwargs):
-        is_admin = request.user.user_roles.filter(
-            tenant=request.user.tenant,
-            role__name__iexact=Role.ADMIN,
-        ).exists()
-        if not is_admin:
+        if not get_role_context(request).is_admin:
             return Response(
                 {"detail": "Only admin can create workflows."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -120,17 +127,17 @@ class WorkflowViewSet(ModelViewSet):
         base_name = str(request.data.get("name", "")).strip() or "New Workflow"
         name = base_name
         idx = 2
-        while Workflow.objects.filter(tenant=request.user.tenant, name=name).exists():
+        while Workflow.objects.filter(tenant_id=request.user.tenant_id, name=name).exists():
             name = f"{base_name} {idx}"
             idx += 1
 
         has_default = Workflow.objects.filter(
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
             is_default=True,
         ).exists()
 
         workflow = Workflow.objects.create(
-            tenant=request.user.tenant,
+            tenant_id=request.user.tenant_id,
             name=name,
             is_default=not has_default,
         )
@@ -183,6 +190,10 @@ class WorkflowViewSet(ModelViewSet):
 
         stages_data = request.data.get("stages")
         if not isinstance(stages_data, list):
+            if dirty:
+                workflow.version = F("version") + 1
+                workflow.save(update_fields=["version"])
+                workflow.refresh_from_db(fields=["version"])
             serializer = self.get_serializer(workflow)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -640,7 +651,7 @@ class WorkflowViewSet(ModelViewSet):
         workflow.is_published = True
         workflow.published_at = timezone.now()
         if not Workflow.objects.filter(
-            tenant=workflow.tenant,
+            tenant_id=workflow.tenant_id,
             is_default=True,
         ).exclude(id=workflow.id).exists():
             workflow.is_default = True
@@ -661,7 +672,7 @@ class WorkflowViewSet(ModelViewSet):
     def set_default(self, request, pk=None):
         workflow = self.get_object()
         Workflow.objects.filter(
-            tenant=workflow.tenant,
+            tenant_id=workflow.tenant_id,
             is_default=True,
         ).exclude(id=workflow.id).update(is_default=False)
         if not workflow.is_default:
@@ -698,22 +709,22 @@ class WorkflowPresetViewSet(ModelViewSet):
     @transaction.atomic
     def apply(self, request, pk=None):
         preset = self.get_object()
-        tenant = request.user.tenant
+        tenant_id = request.user.tenant_id
 
         base_name = preset.title
         name = base_name
         idx = 2
-        while Workflow.objects.filter(tenant=tenant, name=name).exists():
+        while Workflow.objects.filter(tenant_id=tenant_id, name=name).exists():
             name = f"{base_name} {idx}"
             idx += 1
 
         is_default = not Workflow.objects.filter(
-            tenant=tenant,
+            tenant_id=tenant_id,
             is_default=True,
         ).exists()
 
         workflow = Workflow.objects.create(
-            tenant=tenant,
+            tenant_id=tenant_id,
             name=name,
             is_default=is_default,
         )
@@ -753,19 +764,19 @@ class TenantModuleViewSet(ModelViewSet):
     http_method_names = ["get", "patch"]
 
     def get_queryset(self):
-        tenant = self.request.user.tenant
+        tenant_id = self.request.user.tenant_id
         modules = ModuleDefinition.objects.filter(is_active=True)
 
         # Ensure tenant module state rows exist for all active modules.
         for module in modules:
             TenantModule.objects.get_or_create(
-                tenant=tenant,
+                tenant_id=tenant_id,
                 module=module,
                 defaults={"is_enabled": False},
             )
 
         return (
-            TenantModule.objects.filter(tenant=tenant, module__is_active=True)
+            TenantModule.objects.filter(tenant_id=tenant_id, module__is_active=True)
             .select_related("module")
             .order_by("module__name")
         )
@@ -776,11 +787,7 @@ class TenantModuleViewSet(ModelViewSet):
         return Response(serializer.data)
 
     def partial_update(self, request, *args, **kwargs):
-        is_admin = request.user.user_roles.filter(
-            tenant=request.user.tenant,
-            role__name__iexact=Role.ADMIN,
-        ).exists()
-        if not is_admin:
+        if not get_role_context(request).is_admin:
             return Response(
                 {"detail": "Only admin can update modules."},
                 status=status.HTTP_403_FORBIDDEN,